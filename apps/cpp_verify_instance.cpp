@@ -16,6 +16,9 @@ int main(int argc, char **argv) {
   bool vres = verifier.verify();
   std::cout << " done!" << std::endl;
   if (!vres) {
+    for (const auto &msg : verifier.diagnostics()) {
+      std::cerr << msg << '\n';
+    }
     std::cerr << "Invalid instance!\n";
   } else {
     std::cout << "Instance valid." << std::endl;
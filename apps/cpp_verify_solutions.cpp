@@ -0,0 +1,309 @@
+//
+// Verifies all solutions of a folder or zip archive against the instances of
+// another folder or zip archive, using multiple threads. The results are
+// written as JSON lines, one line per solution file.
+//
+// Usage: verify_solutions INSTANCES SOLUTIONS [--threads N] [--output FILE]
+//
+// The binary format (.cgbin) is not supported natively, only json files.
+//
+#include "cgshop2023_core/cpp_instance.hpp"
+#include "cgshop2023_core/verify.hpp"
+#include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <cstdlib>
+#include <filesystem>
+#include <fstream>
+#include <functional>
+#include <iostream>
+#include <map>
+#include <mutex>
+#include <nlohmann/json.hpp>
+#include <sstream>
+#include <string>
+#include <thread>
+#include <unordered_map>
+#include <vector>
+#include <zip.h>
+
+namespace fs = std::filesystem;
+using namespace cgshop2023;
+
+// Same limits as the defaults of the Python `ZipSolutionIterator`.
+constexpr std::size_t file_size_limit = 250'000'000;
+constexpr std::size_t zip_size_limit = 2'000'000'000;
+
+static bool is_hidden(const fs::path &path) {
+  for (const auto &part : path) {
+    const std::string name = part.string();
+    if (name.size() > 1 && name[0] == '.' && name != "..") {
+      return true; // classic hidden unix files.
+    }
+    if (name.size() > 1 && name.substr(0, 2) == "__") {
+      return true; // OS X does that.
+    }
+  }
+  return false;
+}
+
+static bool ends_with(const std::string &str, const std::string &suffix) {
+  return str.size() >= suffix.size() &&
+         str.compare(str.size() - suffix.size(), suffix.size(), suffix) == 0;
+}
+
+static bool is_instance_file(const std::string &filename) {
+  return ends_with(filename, ".instance.json");
+}
+
+static bool is_solution_file(const std::string &filename) {
+  return !is_instance_file(filename) &&
+         (ends_with(filename, ".json") || ends_with(filename, ".solution"));
+}
+
+// The files of a folder or a zip archive that pass a filter, sorted by name.
+// The contents are read on demand; reading is thread-safe.
+class InputFiles {
+public:
+  InputFiles(const fs::path &path,
+             const std::function<bool(const std::string &)> &filter) {
+    if (fs::is_directory(path)) {
+      for (const auto &entry : fs::recursive_directory_iterator(path)) {
+        const auto relative = fs::relative(entry.path(), path);
+        if (entry.is_regular_file() && !is_hidden(relative) &&
+            filter(entry.path().filename().string())) {
+          m_files.push_back({relative.generic_string(), 0, entry.path()});
+        }
+      }
+    } else {
+      open_zip(path, filter);
+    }
+    std::sort(m_files.begin(), m_files.end(),
+              [](const auto &a, const auto &b) { return a.name < b.name; });
+  }
+  InputFiles(const InputFiles &) = delete;
+  InputFiles &operator=(const InputFiles &) = delete;
+  ~InputFiles() {
+    if (m_zip != nullptr) {
+      zip_close(m_zip);
+    }
+  }
+
+  [[nodiscard]] std::size_t size() const noexcept { return m_files.size(); }
+  [[nodiscard]] const std::string &name(std::size_t i) const {
+    return m_files.at(i).name;
+  }
+
+  [[nodiscard]] std::string read(std::size_t i) {
+    const File &file = m_files.at(i);
+    if (m_zip == nullptr) {
+      std::ifstream input(file.path, std::ios::in | std::ios::binary);
+      std::ostringstream content;
+      content << input.rdbuf();
+      return content.str();
+    }
+    // a zip handle must not be used by multiple threads at once.
+    std::lock_guard<std::mutex> lock(m_mutex);
+    if (zip_entry_openbyindex(m_zip, file.zip_index) < 0) {
+      throw std::runtime_error("Could not open " + file.name + " in the zip.");
+    }
+    if (zip_entry_size(m_zip) > file_size_limit) {
+      zip_entry_close(m_zip);
+      throw std::runtime_error("The file " + file.name + " is too large.");
+    }
+    void *buffer = nullptr;
+    size_t buffer_size = 0;
+    const auto read = zip_entry_read(m_zip, &buffer, &buffer_size);
+    zip_entry_close(m_zip);
+    if (read < 0) {
+      std::free(buffer);
+      throw std::runtime_error("Could not decompress " + file.name + ".");
+    }
+    std::string content(static_cast<const char *>(buffer), buffer_size);
+    std::free(buffer);
+    return content;
+  }
+
+private:
+  struct File {
+    std::string name;
+    std::size_t zip_index;
+    fs::path path;
+  };
+
+  void open_zip(const fs::path &path,
+                const std::function<bool(const std::string &)> &filter) {
+    m_zip = zip_open(path.string().c_str(), 0, 'r');
+    if (m_zip == nullptr) {
+      throw std::runtime_error(path.string() +
+                               " is neither a folder nor a zip archive.");
+    }
+    std::size_t total_size = 0;
+    const auto num_entries = zip_entries_total(m_zip);
+    for (std::size_t i = 0; num_entries > 0 && i < std::size_t(num_entries);
+         ++i) {
+      if (zip_entry_openbyindex(m_zip, i) < 0) {
+        continue;
+      }
+      const std::string name = zip_entry_name(m_zip);
+      const bool is_dir = zip_entry_isdir(m_zip);
+      total_size += zip_entry_size(m_zip);
+      zip_entry_close(m_zip);
+      const fs::path entry_path(name);
+      if (!is_dir && !is_hidden(entry_path) &&
+          filter(entry_path.filename().string())) {
+        m_files.push_back({name, i, {}});
+      }
+    }
+    if (total_size > zip_size_limit) {
+      throw std::runtime_error("The zip archive " + path.string() +
+                               " is too large when decompressed.");
+    }
+  }
+
+  std::vector<File> m_files;
+  struct zip_t *m_zip = nullptr;
+  std::mutex m_mutex;
+};
+
+static double milliseconds_since(std::chrono::steady_clock::time_point start) {
+  return std::chrono::duration<double, std::milli>(
+             std::chrono::steady_clock::now() - start)
+      .count();
+}
+
+// Each worker thread has its own instances, as the lazy exact numbers of CGAL
+// must not be shared between threads.
+class VerificationWorker {
+public:
+  VerificationWorker(InputFiles *instance_files,
+                     const std::map<std::string, std::size_t> *instances)
+      : m_instance_files(instance_files), m_instance_indices(instances) {}
+
+  nlohmann::json operator()(const std::string &file_name,
+                            const std::string &content) {
+    nlohmann::json result;
+    result["solution"] = file_name;
+    auto start = std::chrono::steady_clock::now();
+    try {
+      std::string instance_name;
+      std::istringstream input(content);
+      ReadStatistics statistics;
+      Solution solution = Solution::read(input, instance_name, &statistics);
+      result["instance"] = instance_name;
+      result["num_polygons"] = solution.size();
+      result["num_vertices"] = statistics.vertices;
+      result["num_distinct_vertices"] = statistics.distinct_vertices;
+      const Instance &instance = get_instance(instance_name);
+      result["read_ms"] = milliseconds_since(start);
+      start = std::chrono::steady_clock::now();
+      SolutionVerifier verifier(&instance, &solution);
+      const bool valid = verifier.verify();
+      result["verify_ms"] = milliseconds_since(start);
+      result["valid"] = valid;
+      result["error"] = valid ? "" : verifier.error_message().value_or("");
+    } catch (const NotASolutionFile &) {
+      result["skipped"] = true; // like the Python iterator.
+    } catch (const std::exception &e) {
+      result["valid"] = false;
+      result["error"] = std::string("Could not verify solution: ") + e.what();
+    }
+    return result;
+  }
+
+private:
+  const Instance &get_instance(const std::string &name) {
+    auto cached = m_instances.find(name);
+    if (cached != m_instances.end()) {
+      return cached->second;
+    }
+    auto index = m_instance_indices->find(name);
+    if (index == m_instance_indices->end()) {
+      throw std::runtime_error("Unknown instance '" + name + "'");
+    }
+    std::istringstream input(m_instance_files->read(index->second));
+    std::string instance_name;
+    Instance instance = Instance::read(input, instance_name);
+    return m_instances.emplace(name, std::move(instance)).first->second;
+  }
+
+  InputFiles *m_instance_files;
+  const std::map<std::string, std::size_t> *m_instance_indices;
+  std::unordered_map<std::string, Instance> m_instances;
+};
+
+int main(int argc, char **argv) {
+  std::vector<std::string> positional;
+  unsigned num_threads = std::max(1u, std::thread::hardware_concurrency());
+  std::string output_path;
+  for (int i = 1; i < argc; ++i) {
+    const std::string arg = argv[i];
+    if (arg == "--threads" && i + 1 < argc) {
+      num_threads = std::max(1, std::stoi(argv[++i]));
+    } else if (arg == "--output" && i + 1 < argc) {
+      output_path = argv[++i];
+    } else {
+      positional.push_back(arg);
+    }
+  }
+  if (positional.size() != 2 || !fs::exists(positional[0]) ||
+      !fs::exists(positional[1])) {
+    std::cerr << "Usage: " << argv[0]
+              << " INSTANCES SOLUTIONS [--threads N] [--output FILE]\n"
+              << "INSTANCES and SOLUTIONS are folders or zip archives.\n";
+    return 1;
+  }
+  InputFiles instance_files(positional[0], is_instance_file);
+  InputFiles solutions(positional[1], is_solution_file);
+  std::map<std::string, std::size_t> instances;
+  for (std::size_t i = 0; i < instance_files.size(); ++i) {
+    const std::string file_name =
+        fs::path(instance_files.name(i)).filename().string();
+    instances.emplace(
+        file_name.substr(0, file_name.size() - std::string(".instance.json").size()),
+        i);
+  }
+
+  std::ofstream output_file;
+  if (!output_path.empty()) {
+    output_file.open(output_path, std::ios::out);
+  }
+  std::ostream &output = output_path.empty() ? std::cout : output_file;
+  std::mutex output_mutex;
+  std::atomic<std::size_t> next_job{0};
+  std::atomic<std::size_t> num_invalid{0};
+  std::atomic<std::size_t> num_skipped{0};
+
+  auto work = [&]() {
+    VerificationWorker worker(&instance_files, &instances);
+    for (std::size_t i = next_job++; i < solutions.size(); i = next_job++) {
+      nlohmann::json result;
+      try {
+        result = worker(solutions.name(i), solutions.read(i));
+      } catch (const std::exception &e) {
+        result["solution"] = solutions.name(i);
+        result["valid"] = false;
+        result["error"] = std::string("Could not read solution: ") + e.what();
+      }
+      if (result.contains("skipped")) {
+        ++num_skipped;
+        continue;
+      }
+      if (!result.at("valid").get<bool>()) {
+        ++num_invalid;
+      }
+      std::lock_guard<std::mutex> lock(output_mutex);
+      output << result.dump() << '\n' << std::flush;
+    }
+  };
+  std::vector<std::thread> threads;
+  for (unsigned t = 0; t < num_threads; ++t) {
+    threads.emplace_back(work);
+  }
+  for (auto &thread : threads) {
+    thread.join();
+  }
+  std::cerr << "Verified " << solutions.size() - num_skipped << " solutions, "
+            << num_invalid << " invalid.\n";
+  return num_invalid > 0;
+}
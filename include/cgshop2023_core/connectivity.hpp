@@ -0,0 +1,22 @@
+#ifndef CGSHOP2023_CONNECTIVITY_HPP_INCLUDED_
+#define CGSHOP2023_CONNECTIVITY_HPP_INCLUDED_
+
+#include "cpp_instance.hpp"
+#include <cstddef>
+#include <vector>
+
+namespace cgshop2023 {
+
+// Exact test if two closed convex polygons intersect (touching counts).
+bool convex_polygons_intersect(const SimplePolygon &a, const SimplePolygon &b);
+
+// Assigns every polygon the index of its connected component, where two
+// polygons are connected if they overlap or touch. The polygons have to be
+// convex. Candidate pairs are found via the intersection of their bounding
+// boxes and are then tested exactly. Returns the number of components.
+std::size_t connected_components(const std::vector<SimplePolygon> &polygons,
+                                 std::vector<std::size_t> &out_component);
+
+} // namespace cgshop2023
+
+#endif
@@ -0,0 +1,30 @@
+#ifndef CGSHOP2023_COVERAGE_DEFECTS_HPP_INCLUDED_
+#define CGSHOP2023_COVERAGE_DEFECTS_HPP_INCLUDED_
+
+#include "cpp_instance.hpp"
+#include <vector>
+
+namespace cgshop2023 {
+
+// All regions where a solution differs from its instance. In contrast to the
+// verifier, which stops at the first defect, this reports every region with
+// its exact area. Regions of zero area (touching boundaries) are left out.
+struct CoverageDefects {
+  // Parts of the instance that are not covered by any polygon.
+  std::vector<Polygon> uncovered;
+  // Parts of the union of the polygons that lie outside of the instance.
+  std::vector<Polygon> excess;
+  Kernel::FT uncovered_area = 0;
+  Kernel::FT excess_area = 0;
+};
+
+// Computes the union of the polygons once (and caches it in the solution, see
+// `Solution::coverage`, so further calls only compute the differences) and both
+// differences from it. The polygons have to be
+// simple and counterclockwise, otherwise std::invalid_argument is thrown.
+CoverageDefects coverage_defects(const Instance &instance,
+                                 const Solution &solution);
+
+} // namespace cgshop2023
+
+#endif
@@ -7,9 +7,15 @@
 #include <CGAL/Polygon_2.h>
 #include <CGAL/Polygon_with_holes_2.h>
 #include <algorithm>
+#include <atomic>
+#include <cstddef>
 #include <initializer_list>
 #include <iostream>
+#include <memory>
+#include <mutex>
+#include <stdexcept>
 #include <string>
+#include <unordered_set>
 #include <utility>
 #include <vector>
 
@@ -22,15 +28,85 @@ using SimplePolygon = CGAL::Polygon_2<Kernel>;
 
 Kernel::FT area(const Polygon &polygon);
 
+// Thrown by `Solution::read` for json files of another type (e.g., instances),
+// which are skipped when reading many files.
+class NotASolutionFile : public std::runtime_error {
+public:
+  NotASolutionFile() : std::runtime_error("Not a CGSHOP 2023 solution file!") {}
+};
+
+// Number of vertex occurrences and of distinct vertices while reading a file.
+// Identical coordinates share a single point.
+struct ReadStatistics {
+  std::size_t vertices = 0;
+  std::size_t distinct_vertices = 0;
+};
+
+// Json output with exact coordinates: integers are written as numbers (or
+// strings if they have more than 18 digits), other numbers as {"num", "den"}.
+void write_number(std::ostream &output, const Kernel::FT &x);
+void write_points(std::ostream &output, const SimplePolygon &polygon);
+// A list of {"outer_boundary": [...], "holes": [[...], ...]}.
+void write_coverage(std::ostream &output, const std::vector<Polygon> &coverage);
+
+// The lazy kernel keeps the construction history (a DAG of the operations)
+// of every number until its exact value is computed. These functions compute
+// the exact values and thereby prune the history, such that only the leaf
+// numbers are kept in memory.
+void compact(const SimplePolygon &polygon);
+void compact(const Polygon &polygon);
+
+// Estimated memory in bytes of the polygons, counting shared points once. The
+// estimate does not change the polygons: points whose exact value has not been
+// computed yet are counted without it (and without their construction history)
+// and reported by `lazy_points`. Call `compact` first for the compacted size.
+class MemoryEstimator {
+public:
+  void add(const SimplePolygon &polygon);
+  void add(const Polygon &polygon);
+  [[nodiscard]] std::size_t bytes() const noexcept { return m_bytes; }
+  [[nodiscard]] std::size_t lazy_points() const noexcept {
+    return m_lazy_points;
+  }
+
+private:
+  void add(const Point &point);
+  std::unordered_set<const void *> m_seen;
+  std::size_t m_bytes = 0;
+  std::size_t m_lazy_points = 0;
+};
+
 class Instance {
 public:
-  explicit Instance(const Polygon &poly) : m_polygon(poly) {}
-  explicit Instance(Polygon &&poly) : m_polygon(std::move(poly)) {}
+  // The instance-only data (exact area, bounding box) is computed once on
+  // construction, such that it can be reused for every solution.
+  explicit Instance(const Polygon &poly)
+      : m_polygon(poly), m_area(cgshop2023::area(m_polygon)),
+        m_bbox(compute_bbox(m_polygon)) {
+    CGAL::exact(m_area);
+  }
+  explicit Instance(Polygon &&poly)
+      : m_polygon(std::move(poly)), m_area(cgshop2023::area(m_polygon)),
+        m_bbox(compute_bbox(m_polygon)) {
+    CGAL::exact(m_area);
+  }
   [[nodiscard]] const Polygon &polygon() const noexcept { return m_polygon; }
+  [[nodiscard]] const Kernel::FT &area() const noexcept { return m_area; }
+  [[nodiscard]] const CGAL::Bbox_2 &bbox() const noexcept { return m_bbox; }
 
-  void write(std::ostream &output, const std::string &name);
+  // Writes the instance in the json format with exact coordinates.
+  void write(std::ostream &output, const std::string &name) const;
   static Instance read(std::istream &input, std::string &out_name);
 
+  // see `compact(const Polygon &)`. The instance is shared by the threads that
+  // verify solutions for it, so it is compacted only once and the other
+  // threads wait until it is done.
+  void compact() const {
+    std::call_once(*m_compacted, [this] { cgshop2023::compact(m_polygon); });
+  }
+  // Estimated memory in bytes, see `MemoryEstimator`.
+  [[nodiscard]] std::size_t memory_usage() const;
+
   [[nodiscard]] std::size_t num_vertices() const noexcept {
     return std::transform_reduce(
         m_polygon.holes_begin(), m_polygon.holes_end(),
@@ -39,7 +115,17 @@ public:
   }
 
 private:
+  static CGAL::Bbox_2 compute_bbox(const Polygon &poly) {
+    const auto &boundary = poly.outer_boundary();
+    return boundary.is_empty() ? CGAL::Bbox_2() : boundary.bbox();
+  }
+
   Polygon m_polygon;
+  Kernel::FT m_area;
+  CGAL::Bbox_2 m_bbox;
+  // Copies share the points of the polygon and thereby also this flag.
+  std::shared_ptr<std::once_flag> m_compacted =
+      std::make_shared<std::once_flag>();
 };
 
 class Solution {
@@ -64,17 +150,46 @@ public:
 
   [[nodiscard]] size_t size() const { return m_polygons.size(); }
 
+  // Writes the solution in the json format with exact coordinates.
+  void write(std::ostream &output, const std::string &instance_name) const;
+  static Solution read(std::istream &input, std::string &out_instance_name,
+                       ReadStatistics *out_statistics = nullptr);
+
+  // The union of the polygons, computed on the first call. The bindings call
+  // this without the GIL, so threads sharing a solution compute it only once
+  // and wait for each other.
   [[nodiscard]] const std::vector<Polygon> &coverage() const {
-    if (!m_polygons.empty() && m_coverage.empty()) {
-      CGAL::join(polygons().begin(), polygons().end(),
-                 std::back_inserter(m_coverage));
-    }
-    return m_coverage;
+    std::call_once(m_coverage->once, [this] {
+      if (!m_polygons.empty()) {
+        CGAL::join(polygons().begin(), polygons().end(),
+                   std::back_inserter(m_coverage->polygons));
+      }
+      m_coverage->computed.store(true, std::memory_order_release);
+    });
+    return m_coverage->polygons;
   }
 
+  // Compacts the polygons and the coverage (if computed).
+  void compact() const;
+  // Estimated memory in bytes of polygons and coverage, see `MemoryEstimator`.
+  [[nodiscard]] std::size_t memory_usage() const;
+
 private:
+  struct Coverage {
+    std::once_flag once;
+    std::atomic<bool> computed{false};
+    std::vector<Polygon> polygons;
+  };
+  // The coverage if it has already been computed, otherwise nullptr.
+  [[nodiscard]] const std::vector<Polygon> *computed_coverage() const {
+    return m_coverage->computed.load(std::memory_order_acquire)
+               ? &m_coverage->polygons
+               : nullptr;
+  }
+
   std::vector<SimplePolygon> m_polygons;
-  mutable std::vector<Polygon> m_coverage = {};
+  // The polygons never change, so copies share the coverage.
+  std::shared_ptr<Coverage> m_coverage = std::make_shared<Coverage>();
 };
 
 } // namespace cgshop2023
@@ -0,0 +1,21 @@
+#ifndef CGSHOP2023_REDUCTION_HPP_INCLUDED_
+#define CGSHOP2023_REDUCTION_HPP_INCLUDED_
+
+#include "cpp_instance.hpp"
+#include <vector>
+
+namespace cgshop2023 {
+
+// Exact test if `inner` is contained in the closed convex polygon `outer`.
+bool contained_in_convex(const SimplePolygon &inner, const SimplePolygon &outer);
+
+// Removes polygons that do not change the union: duplicates (up to rotation
+// and orientation of the vertex order) and polygons that are contained in a
+// single other polygon. The polygons have to be convex. The order of the
+// remaining polygons is kept.
+std::vector<SimplePolygon>
+remove_redundant_polygons(const std::vector<SimplePolygon> &polygons);
+
+} // namespace cgshop2023
+
+#endif
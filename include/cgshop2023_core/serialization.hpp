@@ -0,0 +1,87 @@
+#ifndef CGSHOP2023_SERIALIZATION_HPP_INCLUDED_
+#define CGSHOP2023_SERIALIZATION_HPP_INCLUDED_
+
+#include "cpp_instance.hpp"
+#include <cstddef>
+#include <gmp.h>
+#include <string>
+#include <type_traits>
+#include <utility>
+#include <vector>
+
+namespace cgshop2023 {
+
+// The exact number type behind the lazy numbers of the kernel.
+using ExactNumber =
+    std::decay_t<decltype(CGAL::exact(std::declval<const Kernel::FT &>()))>;
+
+// The GMP rational behind an exact number, such that the binary encoding can
+// export and import the limbs directly instead of going through strings.
+mpq_srcptr as_mpq(const ExactNumber &x);
+
+// Decimal numerator and denominator of an exact number. The denominator is
+// always positive and the fraction is reduced.
+std::pair<std::string, std::string> to_rational_strings(const Kernel::FT &x);
+// Exact number from decimal numerator and denominator (optionally signed).
+Kernel::FT from_rational_strings(const std::string &num,
+                                 const std::string &den);
+
+// Compact and exact binary encoding. Every number is encoded as a sign byte
+// followed by the length-prefixed (varint) big-endian bytes of numerator and
+// denominator, exported from and imported into the GMP limbs directly. Points are two numbers and polygons are length-prefixed lists.
+void write_binary(std::string &out, const Kernel::FT &x);
+void write_binary(std::string &out, const Point &p);
+void write_binary(std::string &out, const SimplePolygon &polygon);
+void write_binary(std::string &out, const Polygon &polygon);
+void write_binary(std::string &out, const Instance &instance);
+void write_binary(std::string &out, const Solution &solution);
+
+// A point of the '.cgbin' exchange format of the Python package (see
+// `io/binary.py`), which is decoded to the json dicts instead of CGAL objects.
+using CgbinPoint = std::pair<ExactNumber, ExactNumber>;
+
+class BinaryReader {
+public:
+  BinaryReader(const char *data, std::size_t size)
+      : m_data(data), m_size(size) {}
+  explicit BinaryReader(const std::string &data)
+      : BinaryReader(data.data(), data.size()) {}
+
+  Kernel::FT read_number();
+  Point read_point();
+  SimplePolygon read_simple_polygon();
+  Polygon read_polygon();
+  Instance read_instance();
+  Solution read_solution();
+
+  // The '.cgbin' format stores the number of points of a polygon and the
+  // points, each coordinate as zigzag varint numerator (followed by a varint
+  // denominator if `with_denominators`). Varints of numbers are limited to
+  // `max_cgbin_varint_bytes`, as in the Python reader.
+  static constexpr std::size_t max_cgbin_varint_bytes = 1024;
+  std::vector<CgbinPoint> read_cgbin_polygon(bool with_denominators);
+
+  // Continues reading at `pos`, e.g., at an entry of an offset table.
+  void seek(std::size_t pos);
+  [[nodiscard]] bool at_end() const noexcept { return m_pos == m_size; }
+
+private:
+  std::size_t read_varint();
+  void read_magnitude(mpz_ptr out);
+  void read_long_varint(mpz_ptr out);
+  ExactNumber read_cgbin_number(bool with_denominators);
+
+  const char *m_data;
+  std::size_t m_size;
+  std::size_t m_pos = 0;
+};
+
+template <typename T> std::string to_binary(const T &object) {
+  std::string out;
+  write_binary(out, object);
+  return out;
+}
+
+} // namespace cgshop2023
+
+#endif
@@ -2,15 +2,47 @@
 #define CGSHOP2023_VERIFIER_VERIFY_HPP_INCLUDED_
 
 #include "cpp_instance.hpp"
+#include <atomic>
+#include <cstddef>
 #include <optional>
+#include <stdexcept>
 #include <string>
 
 namespace cgshop2023 {
 
+// Can be set from another thread to stop a running verification. The verifier
+// checks it between its stages and throws `VerificationCancelled`.
+class CancellationToken {
+public:
+  void cancel() noexcept { m_cancelled = true; }
+  [[nodiscard]] bool cancelled() const noexcept { return m_cancelled; }
+
+private:
+  std::atomic<bool> m_cancelled{false};
+};
+
+class VerificationCancelled : public std::runtime_error {
+public:
+  VerificationCancelled() : std::runtime_error("verification cancelled") {}
+};
+
+struct VerificationOptions {
+  // Remove duplicate polygons and polygons contained in another polygon
+  // before computing the union. Does not change the verdict.
+  bool reduce = false;
+  // Compute the exact values of the inputs and of the union right away, such
+  // that the lazy kernel does not keep their construction history in memory.
+  bool compact = false;
+  // Optional token to cancel the verification from another thread.
+  const CancellationToken *cancellation = nullptr;
+};
+
 class SolutionVerifier {
 public:
-  SolutionVerifier(const Instance *instance, const Solution *solution) noexcept
-      : m_error(std::nullopt), m_instance(instance), m_solution(solution) {}
+  SolutionVerifier(const Instance *instance, const Solution *solution,
+                   VerificationOptions options = {}) noexcept
+      : m_error(std::nullopt), m_instance(instance), m_solution(solution),
+        m_options(options) {}
 
   const Solution &solution() const noexcept { return *m_solution; }
   const Instance &instance() const noexcept { return *m_instance; }
@@ -20,15 +52,35 @@ public:
 
   bool verify();
 
+  // Number of polygons removed by the reduction (if enabled).
+  std::size_t num_removed_polygons() const noexcept { return m_num_removed; }
+
 private:
+  bool p_verify_positive_area();
   bool p_verify_convexity();
+  bool p_verify_connectivity();
   bool p_verify_coverage(const Polygon &coverage);
   std::optional<Polygon> compute_coverage();
   bool check_coverage_area_size(const Polygon &coverage);
 
+  void p_reduce();
+  void p_check_cancelled() const {
+    if (m_options.cancellation != nullptr &&
+        m_options.cancellation->cancelled()) {
+      throw VerificationCancelled();
+    }
+  }
+  // The solution whose polygons are used for the union.
+  const Solution &union_input() const noexcept {
+    return m_reduced ? *m_reduced : *m_solution;
+  }
+
   std::optional<std::string> m_error;
   const Instance *m_instance;
   const Solution *m_solution;
+  VerificationOptions m_options;
+  std::optional<Solution> m_reduced;
+  std::size_t m_num_removed = 0;
 };
 
 } // namespace cgshop2023
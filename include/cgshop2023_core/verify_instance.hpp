@@ -4,6 +4,9 @@
 #include "../../src/arrangement_util.hpp"
 #include "cpp_instance.hpp"
 #include <CGAL/Polygon_2_algorithms.h>
+#include <sstream>
+#include <string>
+#include <vector>
 
 namespace cgshop2023 {
 class InstanceVerifier {
@@ -17,7 +20,7 @@ public:
     }
     if (!p_add_and_check(instance->polygon().outer_boundary(),
                          arrangement.unbounded_face())) {
-      std::cerr << "Outer boundary invalid!\n";
+      report("Outer boundary invalid!");
       return false;
     }
     FaceHandle unbounded = arrangement.unbounded_face();
@@ -30,23 +33,34 @@ public:
       }
     }
     if (arrangement.unbounded_face()->number_of_holes() != 1) {
-      std::cerr << "Unbounded face must have exactly 1 hole, but has "
-                << arrangement.unbounded_face()->number_of_holes() << "!\n";
+      std::ostringstream msg;
+      msg << "Unbounded face must have exactly 1 hole, but has "
+          << arrangement.unbounded_face()->number_of_holes() << "!";
+      report(msg.str());
       return false;
     }
     return true;
   }
 
+  // Messages describing why the instance is invalid.
+  [[nodiscard]] const std::vector<std::string> &diagnostics() const noexcept {
+    return m_diagnostics;
+  }
+
 private:
+  void report(std::string message) {
+    m_diagnostics.emplace_back(std::move(message));
+  }
+
   bool p_check_simplicity() {
     if (!p_check_simplicity(instance->polygon().outer_boundary())) {
-      std::cerr << "Outer boundary is self-intersecting!\n";
+      report("Outer boundary is self-intersecting!");
       return false;
     }
     std::size_t i = 0;
     for (const auto &h : instance->polygon().holes()) {
       if (!p_check_simplicity(h)) {
-        std::cerr << "Hole #" << i << " is self-intersecting!\n";
+        report("Hole #" + std::to_string(i) + " is self-intersecting!");
         return false;
       }
       ++i;
@@ -71,12 +85,16 @@ private:
           const Arrangement::Vertex_const_handle *vh;
           const Arrangement::Halfedge_const_handle *eh;
           if ((vh = boost::get<Arrangement::Vertex_const_handle>(&lr))) {
-            std::cerr << "Segment (" << next_seg << ") contains vertex "
-                      << (*vh)->point() << "!\n";
+            std::ostringstream msg;
+            msg << "Segment (" << next_seg << ") contains vertex "
+                << (*vh)->point() << "!";
+            report(msg.str());
           } else if ((eh = boost::get<Arrangement::Halfedge_const_handle>(
                           &lr))) {
-            std::cerr << "Segment (" << next_seg << ") intersects segment "
-                      << (*eh)->curve() << "!\n";
+            std::ostringstream msg;
+            msg << "Segment (" << next_seg << ") intersects segment "
+                << (*eh)->curve() << "!";
+            report(msg.str());
           }
         }
         return false;
@@ -84,14 +102,18 @@ private:
         const Arrangement::Face_const_handle *fh;
         if (!(fh =
                   boost::get<Arrangement::Face_const_handle>(&zones.front()))) {
-          std::cerr << "Segment (" << next_seg
-                    << ") in unexpected arrangement feature!\n";
+          std::ostringstream msg;
+          msg << "Segment (" << next_seg
+              << ") in unexpected arrangement feature!";
+          report(msg.str());
           return false;
         }
         if (*fh != expected_face) {
-          std::cerr << "Segment (" << next_seg
-                    << ") lies in unexpected face (either hole-in-hole or hole "
-                       "outside of boundary)!\n";
+          std::ostringstream msg;
+          msg << "Segment (" << next_seg
+              << ") lies in unexpected face (either hole-in-hole or hole "
+                 "outside of boundary)!";
+          report(msg.str());
           return false;
         }
       }
@@ -109,6 +131,7 @@ private:
   const Instance *instance;
   Arrangement arrangement;
   Location location;
+  std::vector<std::string> m_diagnostics;
 };
 } // namespace cgshop2023
 
@@ -10,13 +10,56 @@ by name/instance-id. It can also cache the instances.
 
 Use `verify(Instance, Solution)->str` to verify a solution.
 It will return an empty string if everything is ok, otherwise a message
-describing the problem.
+describing the problem. Pass a `VerificationCache` to `verify` to skip the
+verification of solutions that have already been verified before. Use a
+`PreparedInstance` to verify many solutions for the same instance without
+converting the instance every time.
+
+The functions are imported lazily on first access, so importing this package
+does not load the compiled core or any optional dependencies.
 
 This library uses a compiled C++-core. If you get segmentation faults, you
 may want remove and reinstall it, in order to trigger a recompilation.
 See the readme for further information.
 """
 # flake8: noqa F401
-from .io import read_solution, read_instance
-from .instance_database import InstanceDatabase
-from .verifier import verify
+import importlib
+import typing
+
+# The exports are imported on first access, such that `import cgshop2023_pyutils`
+# is cheap and the native core is only loaded if it is actually used.
+_LAZY_EXPORTS = {
+    "read_solution": ".io",
+    "read_instance": ".io",
+    "InstanceDatabase": ".instance_database",
+    "verify": ".verifier",
+    "VerificationCache": ".verifier",
+    "PreparedInstance": ".verifier",
+    "coverage_defects": ".verifier",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+if typing.TYPE_CHECKING:  # for IDEs and type checkers
+    from .io import read_solution, read_instance
+    from .instance_database import InstanceDatabase
+    from .verifier import (
+        verify,
+        VerificationCache,
+        PreparedInstance,
+        coverage_defects,
+    )
+
+
+def __getattr__(name: str):
+    try:
+        module_name = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # only resolve once
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,8 @@
+"""
+asyncio counterparts of the blocking API: awaitable instance lookup and
+verification, and `async for` over the solutions in a zip file.
+"""
+# flake8: noqa F401
+from .async_verifier import AsyncVerifier
+from .async_instance_database import AsyncInstanceDatabase
+from .async_zip import iterate_solutions
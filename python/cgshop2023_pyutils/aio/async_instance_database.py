@@ -0,0 +1,72 @@
+"""
+Awaitable access to an InstanceDatabase.
+"""
+import asyncio
+import typing
+from concurrent.futures import ThreadPoolExecutor
+
+from ..instance_database import InstanceDatabase
+
+
+class AsyncInstanceDatabase:
+    """
+    Wraps an `InstanceDatabase`, such that the files are read without blocking
+    the event loop. The accesses run one after another on a single thread, as
+    the underlying zip file and cache are not thread-safe.
+    e.g.,
+    ```
+    idb = AsyncInstanceDatabase("./instances.zip")
+    instance = await idb.get("instance_name")
+    async for instance in idb:
+        ...
+    ```
+    """
+
+    def __init__(self, path: str, enable_cache: bool = False):
+        """
+        :param path: Path to the folder/zipfile with the instances.
+        :param enable_cache: Should the loaded instances be cached?
+        """
+        self._executor = ThreadPoolExecutor(
+            1, thread_name_prefix="cgshop2023_instances"
+        )
+        self._path = path
+        self._enable_cache = enable_cache
+        self._db = None
+
+    def _database(self) -> InstanceDatabase:
+        if self._db is None:
+            self._db = InstanceDatabase(self._path, enable_cache=self._enable_cache)
+        return self._db
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def get(self, name: str) -> typing.Dict:
+        """
+        Returns the instance of a specific name or throws a KeyError.
+        """
+        return await self._run(lambda: self._database()[name])
+
+    async def __aiter__(self) -> typing.AsyncIterator[typing.Dict]:
+        """
+        Iterates over all instances, reading one instance at a time.
+        """
+        iterator = await self._run(lambda: iter(self._database()))
+        done = object()
+        while True:
+            instance = await self._run(next, iterator, done)
+            if instance is done:
+                return
+            yield instance
+
+    async def close(self):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
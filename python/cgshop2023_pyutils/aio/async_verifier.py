@@ -0,0 +1,117 @@
+"""
+Awaitable verification for asyncio applications. The verifications run on a
+managed thread pool; the native verifier releases the GIL, so the threads use
+multiple cores while the event loop stays responsive.
+"""
+import asyncio
+import functools
+import os
+import threading
+import typing
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncVerifier:
+    """
+    Verifies solutions on a thread pool with a limit on the concurrent
+    verifications. Cancelling the awaiting task also cancels the native
+    verification (between its stages).
+    e.g.,
+    ```
+    async with AsyncVerifier(max_workers=8) as verifier:
+        err_msg = await verifier.verify(instance, solution, cache=cache)
+    ```
+    A `VerificationCache` can be passed to `verify`, it is shared by the threads.
+    """
+
+    def __init__(
+        self,
+        max_workers: typing.Optional[int] = None,
+        max_concurrency: typing.Optional[int] = None,
+        executor: typing.Optional[ThreadPoolExecutor] = None,
+    ):
+        """
+        :param max_workers: Number of threads. Defaults to the number of CPUs.
+        :param max_concurrency: Maximal number of verifications that run or wait
+                    in the executor. Further calls wait in the event loop, which
+                    gives back-pressure. Defaults to the number of threads of the
+                    managed thread pool; required if you pass an `executor`.
+        :param executor: Use this executor instead of a managed thread pool.
+        """
+        if executor is not None and max_concurrency is None:
+            raise ValueError("Pass max_concurrency with your own executor.")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be positive.")
+        max_workers = max_workers or os.cpu_count() or 1
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers, thread_name_prefix="cgshop2023_verify"
+        )
+        self._max_concurrency = max_concurrency or max_workers
+        self._semaphore = None  # created in the running loop
+        self._compact_lock = threading.Lock()
+        self._compacted = weakref.WeakSet()
+
+    def _prepare_shared(self, instance):
+        # Instances shared between threads must not be evaluated lazily by
+        # several threads at once, so their exact values are computed first.
+        from ..verifier import PreparedInstance
+
+        if not isinstance(instance, PreparedInstance):
+            return
+        with self._compact_lock:
+            if instance not in self._compacted:
+                instance.native.compact()
+                self._compacted.add(instance)
+
+    def _verify(self, instance, solution, cancellation, kwargs):
+        from ..verifier import verify
+
+        self._prepare_shared(instance)
+        return verify(instance, solution, cancellation=cancellation, **kwargs)
+
+    async def verify(self, instance, solution: typing.Dict, **kwargs) -> str:
+        """
+        Awaitable version of `verify`.
+        :param instance: The instance (dict or `PreparedInstance`).
+        :param solution: The solution as parsed from the json.
+        :param kwargs: Further arguments of `verify`, e.g., `reduce=True` or
+                    `cache=VerificationCache(...)`.
+        :return: An empty string if the solution is valid. Otherwise, an error message.
+        """
+        from ..core import CancellationToken, VerificationCancelled
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            token = CancellationToken()
+            future = loop.run_in_executor(
+                self._executor,
+                functools.partial(self._verify, instance, solution, token, kwargs),
+            )
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                token.cancel()
+                # keep the slot until the thread has actually stopped.
+                try:
+                    await future
+                except VerificationCancelled:
+                    pass
+                raise
+
+    async def close(self):
+        """
+        Shuts down the managed thread pool (waiting for running verifications).
+        """
+        if self._owns_executor:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._executor.shutdown)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,66 @@
+"""
+Asynchronous iteration over the solutions in a zip file.
+"""
+import asyncio
+import threading
+import typing
+
+from ..zip import ZipSolutionIterator
+
+_DONE = object()
+
+
+async def iterate_solutions(
+    path_or_file,
+    zip_iterator: typing.Optional[ZipSolutionIterator] = None,
+    max_pending: int = 8,
+    executor=None,
+) -> typing.AsyncIterator[typing.Dict]:
+    """
+    Async version of `ZipSolutionIterator.__call__`. The zip is read on a thread,
+    which reads ahead at most `max_pending` solutions, so a slow consumer also
+    slows down the reading. The order of the solutions is kept.
+    e.g.,
+    ```
+    async for solution in iterate_solutions("./myzip.zip"):
+        err_msg = await verifier.verify(await idb.get(solution["instance"]), solution)
+    ```
+    :param path_or_file: Zip or file.
+    :param zip_iterator: A configured `ZipSolutionIterator` (e.g., with other limits).
+    :param max_pending: Maximal number of solutions that have been read but not
+                    consumed yet.
+    :param executor: Executor for the reading thread (default executor of the loop).
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(max_pending)
+    stop = threading.Event()
+    zip_iterator = zip_iterator or ZipSolutionIterator()
+
+    def put(item):
+        asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+    def produce():
+        try:
+            for solution in zip_iterator(path_or_file):
+                if stop.is_set():
+                    return
+                put((solution, None))
+            put((_DONE, None))
+        except Exception as e:
+            if not stop.is_set():
+                put((_DONE, e))
+
+    producer = loop.run_in_executor(executor, produce)
+    try:
+        while True:
+            solution, error = await queue.get()
+            if solution is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield solution
+    finally:
+        stop.set()
+        while not queue.empty():  # unblocks a waiting producer
+            queue.get_nowait()
+        await producer
@@ -12,5 +12,11 @@ from ._cgshop2023_core import (
     NativeSolution,
     area,
     verify,
+    verify_reduced,
+    coverage_defects,
+    CancellationToken,
+    VerificationCancelled,
     verify_instance,
+    instance_diagnostics,
+    decode_cgbin_polygons,
 )  # will only be available after building.
@@ -1,16 +1,22 @@
 //
 // Python-bindings for the C++-part.
 //
+#include "cgshop2023_core/coverage_defects.hpp"
 #include "cgshop2023_core/cpp_instance.hpp"
+#include "cgshop2023_core/serialization.hpp"
 #include "cgshop2023_core/verify.hpp"
 #include "cgshop2023_core/verify_instance.hpp"
 #include <CGAL/number_utils.h>
 #include <cmath>
 #include <fmt/core.h>
+#include <fstream>
 #include <pybind11/operators.h> // to define operator overloading
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h> // automatic conversion of vectors
+#include <sstream>
+#include <stdexcept>
 #include <string>
+#include <utility>
 
 namespace py = pybind11;
 using namespace cgshop2023;
@@ -49,17 +55,42 @@ Kernel::FT str_to_exact(std::string number) {
   return large_part + small_part;
 }
 
-std::string verify(const Instance &instance, Solution &solution) {
-  SolutionVerifier verifier(&instance, &solution);
+static std::string error_message(const SolutionVerifier &verifier) {
+  std::string msg = verifier.error_message().value();
+  if (msg.empty()) {
+    return "UNKNOWN ERROR WITHOUT MESSAGE!";
+  }
+  return msg;
+}
+
+std::string verify(const Instance &instance, Solution &solution,
+                   bool compact = false,
+                   const CancellationToken *cancellation = nullptr) {
+  VerificationOptions options;
+  options.compact = compact;
+  options.cancellation = cancellation;
+  SolutionVerifier verifier(&instance, &solution, options);
   if (verifier.verify()) {
     return {""};
   } else {
-    std::string msg = verifier.error_message().value();
-    if (msg.empty()) {
-      return "UNKNOWN ERROR WITHOUT MESSAGE!";
-    }
-    return msg;
+    return error_message(verifier);
+  }
+}
+
+// Verifies with the pre-reduction of the solution. Returns the error message
+// and the number of polygons that have been removed before the union.
+std::pair<std::string, std::size_t>
+verify_reduced(const Instance &instance, Solution &solution, bool compact,
+               const CancellationToken *cancellation) {
+  VerificationOptions options;
+  options.reduce = true;
+  options.compact = compact;
+  options.cancellation = cancellation;
+  SolutionVerifier verifier(&instance, &solution, options);
+  if (verifier.verify()) {
+    return {"", verifier.num_removed_polygons()};
   }
+  return {error_message(verifier), verifier.num_removed_polygons()};
 }
 
 std::string verify(const Polygon2WithHoles &instance,
@@ -74,6 +105,130 @@ bool verify_instance(const Instance &instance) {
   return iv.verify();
 }
 
+// Returns the reasons why an instance is invalid (empty if it is valid).
+std::vector<std::string> instance_diagnostics(const Instance &instance) {
+  auto iv = InstanceVerifier(&instance);
+  if (iv.verify()) {
+    return {};
+  }
+  if (iv.diagnostics().empty()) {
+    return {"UNKNOWN ERROR WITHOUT MESSAGE!"};
+  }
+  return iv.diagnostics();
+}
+
+// Adds `to_json` and `write_json` with the exact json writer of the class.
+template <typename T> void add_json_writer(py::class_<T> &cls, const char *arg) {
+  cls.def(
+         "to_json",
+         [](const T &object, const std::string &name) {
+           std::ostringstream output;
+           object.write(output, name);
+           return output.str();
+         },
+         py::arg(arg), "The json with exact coordinates as string.")
+      .def(
+          "write_json",
+          [](const T &object, const std::string &path, const std::string &name) {
+            std::ofstream output(path, std::ios::out | std::ios::trunc);
+            if (!output) {
+              throw std::runtime_error("Could not open '" + path + "'.");
+            }
+            object.write(output, name);
+          },
+          py::arg("path"), py::arg(arg),
+          "Write the json with exact coordinates to a file.");
+}
+
+// Decodes an object from the compact binary encoding without copying the data.
+template <typename T, T (BinaryReader::*read)()>
+T from_buffer(const py::buffer &data) {
+  const py::buffer_info info = data.request();
+  BinaryReader reader(static_cast<const char *>(info.ptr),
+                      static_cast<std::size_t>(info.size * info.itemsize));
+  T object = (reader.*read)();
+  if (!reader.at_end()) {
+    throw std::runtime_error("Unexpected trailing binary data!");
+  }
+  return object;
+}
+
+// Python int of a GMP integer.
+static py::object to_python_int(mpz_srcptr value) {
+  if (mpz_fits_slong_p(value)) {
+    return py::int_(mpz_get_si(value));
+  }
+  std::string digits(mpz_sizeinbase(value, 16) + 2, '\0');
+  mpz_get_str(digits.data(), 16, value);
+  PyObject *result = PyLong_FromString(digits.c_str(), nullptr, 16);
+  if (result == nullptr) {
+    throw py::error_already_set();
+  }
+  return py::reinterpret_steal<py::object>(result);
+}
+
+// A number as in the json files: an int or {"num": .., "den": ..}.
+static py::object to_json_number(const ExactNumber &x) {
+  mpq_srcptr q = as_mpq(x);
+  py::object num = to_python_int(mpq_numref(q));
+  if (mpz_cmp_ui(mpq_denref(q), 1) == 0) {
+    return num;
+  }
+  py::dict fraction;
+  fraction["num"] = std::move(num);
+  fraction["den"] = to_python_int(mpq_denref(q));
+  return std::move(fraction);
+}
+
+// Decodes `count` polygons of the '.cgbin' format into the lists of
+// {"x": .., "y": ..} dicts that the json parser returns.
+py::list decode_cgbin_polygons(const py::buffer &data, std::size_t start,
+                               std::size_t count, bool with_denominators) {
+  const py::buffer_info info = data.request();
+  std::vector<std::vector<CgbinPoint>> decoded;
+  try {
+    BinaryReader reader(static_cast<const char *>(info.ptr),
+                        static_cast<std::size_t>(info.size * info.itemsize));
+    reader.seek(start);
+    for (std::size_t i = 0; i < count; ++i) {
+      decoded.push_back(reader.read_cgbin_polygon(with_denominators));
+    }
+  } catch (const std::runtime_error &e) {
+    throw py::value_error(e.what()); // as the Python reader
+  }
+  const py::str x_key("x");
+  const py::str y_key("y");
+  py::list polygons;
+  for (const auto &points : decoded) {
+    py::list polygon;
+    for (const auto &[x, y] : points) {
+      py::dict point;
+      point[x_key] = to_json_number(x);
+      point[y_key] = to_json_number(y);
+      polygon.append(std::move(point));
+    }
+    polygons.append(std::move(polygon));
+  }
+  return polygons;
+}
+
+// Adds `to_bytes`, `from_bytes`, and pickle support using the exact binary
+// encoding.
+template <typename T, T (BinaryReader::*read)(), typename PyClass>
+void add_serialization(PyClass &cls) {
+  cls.def(
+         "to_bytes",
+         [](const T &object) { return py::bytes(to_binary(object)); },
+         "Exact and compact binary encoding.")
+      .def_static("from_bytes", &from_buffer<T, read>,
+                  "Decode the binary encoding of `to_bytes`.")
+      .def(py::pickle(
+          [](const T &object) { return py::bytes(to_binary(object)); },
+          [](const py::bytes &state) {
+            return from_buffer<T, read>(py::buffer(state));
+          }));
+}
+
 PYBIND11_MODULE(_cgshop2023_core, m) {
   // For copying: Note that the name _cgshop2023_core needs to fit the name in
   // the CMakeLists.txt.
@@ -82,10 +237,21 @@ PYBIND11_MODULE(_cgshop2023_core, m) {
                                                               // docstring
 
   // Exact numbers
-  py::class_<Kernel::FT>(m, "FieldNumber",
-                         "A container for exact numbers in CGAL.")
-      .def(py::init(&to_exact))
-      .def(py::init(&str_to_exact))
+  py::class_<Kernel::FT> field_number(m, "FieldNumber",
+                                      "A container for exact numbers in CGAL.");
+  // Computing the exact value right away drops the operations of the
+  // conversion, such that the number is stored as a leaf.
+  field_number
+      .def(py::init([](std::int64_t x) {
+        Kernel::FT value = to_exact(x);
+        CGAL::exact(value);
+        return value;
+      }))
+      .def(py::init([](const std::string &x) {
+        Kernel::FT value = str_to_exact(x);
+        CGAL::exact(value);
+        return value;
+      }))
       .def(py::self / Kernel::FT())
       .def(py::self + Kernel::FT())
       .def(py::self * Kernel::FT())
@@ -94,10 +260,11 @@ PYBIND11_MODULE(_cgshop2023_core, m) {
       .def("__str__", [](const Kernel::FT &x) {
         return std::to_string(CGAL::to_double(x));
       });
+  add_serialization<Kernel::FT, &BinaryReader::read_number>(field_number);
 
   // Points
-  py::class_<Point>(m, "Point", "A point in CGAL.")
-      .def(py::init<Kernel::FT, Kernel::FT>())
+  py::class_<Point> point(m, "Point", "A point in CGAL.");
+  point.def(py::init<Kernel::FT, Kernel::FT>())
       .def("x", [](const Point &p) { return p.x(); })
       .def("y", [](const Point &p) { return p.y(); })
       .def(py::self == Point())
@@ -105,10 +272,11 @@ PYBIND11_MODULE(_cgshop2023_core, m) {
         return fmt::format("({}, {})", CGAL::to_double(p.x()),
                            CGAL::to_double(p.y()));
       });
+  add_serialization<Point, &BinaryReader::read_point>(point);
 
   // Polygons
-  py::class_<Polygon2>(m, "Polygon", "A simple polygon in CGAL.")
-      .def(py::init<>())
+  py::class_<Polygon2> polygon(m, "Polygon", "A simple polygon in CGAL.");
+  polygon.def(py::init<>())
       .def(py::init([](const std::vector<Point> &vertices) {
         return std::make_unique<Polygon2>(vertices.begin(), vertices.end());
       }))
@@ -120,37 +288,118 @@ PYBIND11_MODULE(_cgshop2023_core, m) {
            })
       .def("is_simple", &Polygon2::is_simple)
       .def("area", [](const Polygon2 &poly) { return poly.area(); });
-  py::class_<Polygon2WithHoles>(m, "PolygonWithHoles",
-                                "A polygon with holes in CGAL.")
+  add_serialization<Polygon2, &BinaryReader::read_simple_polygon>(polygon);
+  py::class_<Polygon2WithHoles> polygon_with_holes(
+      m, "PolygonWithHoles", "A polygon with holes in CGAL.");
+  polygon_with_holes
       .def(py::init(
           [](const Polygon2 &outer, const std::vector<Polygon2> &holes) {
             return new Polygon2WithHoles(outer, holes.begin(), holes.end());
           }))
       .def("outer_boundary",
            [](const Polygon2WithHoles &poly) { return poly.outer_boundary(); })
-      .def("holes", [](const Polygon2WithHoles &poly) {
-        std::vector<Polygon2> holes;
-        std::copy(poly.holes_begin(), poly.holes_end(),
-                  std::back_inserter(holes));
-        return holes;
-      });
-  py::class_<Instance>(m, "NativeInstance",
-                       "A native C++ container for an instance.")
-      .def(py::init<Polygon2WithHoles>())
-      .def("polygon", &Instance::polygon);
-  py::class_<Solution>(m, "NativeSolution",
-                       "A native C++ container for a solution.")
-      .def(py::init<std::vector<SimplePolygon>>())
+      .def("holes",
+           [](const Polygon2WithHoles &poly) {
+             std::vector<Polygon2> holes;
+             std::copy(poly.holes_begin(), poly.holes_end(),
+                       std::back_inserter(holes));
+             return holes;
+           })
+      .def("area", [](const Polygon2WithHoles &poly) { return area(poly); });
+  add_serialization<Polygon2WithHoles, &BinaryReader::read_polygon>(
+      polygon_with_holes);
+  py::class_<Instance> native_instance(
+      m, "NativeInstance", "A native C++ container for an instance.");
+  native_instance.def(py::init<Polygon2WithHoles>())
+      .def("polygon", &Instance::polygon)
+      .def("area", &Instance::area)
+      .def("bbox", [](const Instance &instance) {
+        const auto &bbox = instance.bbox();
+        return py::make_tuple(bbox.xmin(), bbox.ymin(), bbox.xmax(),
+                              bbox.ymax());
+      })
+      .def("compact", &Instance::compact,
+           "Compute the exact values and drop the construction history. "
+           "Thread-safe, the instance is compacted only once.",
+           py::call_guard<py::gil_scoped_release>())
+      .def("memory_usage", &Instance::memory_usage,
+           "Estimated memory in bytes. Exact values that have not been computed "
+           "yet are not included; call `compact` first to include them.");
+  add_serialization<Instance, &BinaryReader::read_instance>(native_instance);
+  add_json_writer(native_instance, "name");
+  py::class_<Solution> native_solution(
+      m, "NativeSolution", "A native C++ container for a solution.");
+  native_solution.def(py::init<std::vector<SimplePolygon>>())
       .def("polygons", &Solution::polygons)
-      .def("coverage", &Solution::coverage);
+      .def("coverage", &Solution::coverage)
+      .def("compact", &Solution::compact,
+           "Compute the exact values and drop the construction history.")
+      .def("memory_usage", &Solution::memory_usage,
+           "Estimated memory in bytes of polygons and coverage. Exact values "
+           "that have not been computed yet are not included; call `compact` "
+           "first to include them.");
+  add_serialization<Solution, &BinaryReader::read_solution>(native_solution);
+  add_json_writer(native_solution, "instance");
+  native_solution.def(
+      "coverage_to_json",
+      [](const Solution &solution) {
+        std::ostringstream output;
+        write_coverage(output, solution.coverage());
+        return output.str();
+      },
+      "The union of the polygons as json list of polygons with holes.");
   m.def("area", &area);
 
   // verify
-  m.def("verify", py::overload_cast<const Instance &, Solution &>(&verify),
-        "Verify a solution.")
+  py::class_<CancellationToken>(
+      m, "CancellationToken",
+      "Cancels a running verification (from another thread).")
+      .def(py::init<>())
+      .def("cancel", &CancellationToken::cancel)
+      .def("cancelled", &CancellationToken::cancelled);
+  py::register_exception<VerificationCancelled>(m, "VerificationCancelled");
+  // The verification releases the GIL, such that multiple threads can verify
+  // in parallel. With `compact`, a shared instance is compacted only once.
+  m.def("verify",
+        py::overload_cast<const Instance &, Solution &, bool,
+                          const CancellationToken *>(&verify),
+        "Verify a solution. With `compact`, the exact values are computed "
+        "right away to keep the memory small.",
+        py::arg("instance"), py::arg("solution"), py::arg("compact") = false,
+        py::arg("cancellation") = nullptr,
+        py::call_guard<py::gil_scoped_release>())
       .def("verify",
            py::overload_cast<const Polygon2WithHoles &,
                              const std::vector<Polygon2> &>(&verify),
-           "Verify a solution.");
+           "Verify a solution.", py::call_guard<py::gil_scoped_release>());
+  m.def("verify_reduced", &verify_reduced, py::arg("instance"),
+        py::arg("solution"), py::arg("compact") = false,
+        py::arg("cancellation") = nullptr,
+        py::call_guard<py::gil_scoped_release>(),
+        "Verify a solution after removing duplicate and contained polygons. "
+        "Returns the error message and the number of removed polygons.");
+  m.def(
+      "coverage_defects",
+      [](const Instance &instance, const Solution &solution) {
+        CoverageDefects defects;
+        {
+          py::gil_scoped_release release;
+          defects = coverage_defects(instance, solution);
+        }
+        py::dict result;
+        result["uncovered"] = std::move(defects.uncovered);
+        result["excess"] = std::move(defects.excess);
+        result["uncovered_area"] = defects.uncovered_area;
+        result["excess_area"] = defects.excess_area;
+        return result;
+      },
+      py::arg("instance"), py::arg("solution"),
+      "All uncovered regions of the instance and all regions of the solution "
+      "outside of the instance, computed from a single union.");
+  m.def("decode_cgbin_polygons", &decode_cgbin_polygons, py::arg("data"),
+        py::arg("start"), py::arg("count"), py::arg("with_denominators"),
+        "Decode `count` polygons of the '.cgbin' format starting at `start`.");
   m.def("verify_instance", &verify_instance, "Verify an instance.");
+  m.def("instance_diagnostics", &instance_diagnostics,
+        "Verify an instance and return the reasons why it is invalid.");
 }
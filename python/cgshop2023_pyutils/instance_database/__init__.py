@@ -3,3 +3,5 @@ Instance database to easily query the instances from a zip or a folder.
 """
 # flake8: noqa F401
 from .instance_database import InstanceDatabase
+from .instance_catalog import InstanceCatalog
+from .shared_instance_store import SharedInstanceStore
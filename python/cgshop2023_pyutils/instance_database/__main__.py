@@ -0,0 +1,40 @@
+"""
+Validates all instances of a folder/zipfile and prints the results as JSON lines.
+e.g.,
+```
+python3 -m cgshop2023_pyutils.instance_database ./instances.zip --workers 8
+```
+"""
+import argparse
+import json
+import sys
+
+from .instance_database import InstanceDatabase
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate all instances of a folder or zipfile."
+    )
+    parser.add_argument("path", help="Folder or zipfile with the instances.")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Number of processes."
+    )
+    parser.add_argument(
+        "--cache", default=None, help="SQLite file for caching the verdicts."
+    )
+    args = parser.parse_args()
+
+    from ..verifier import VerificationCache
+
+    cache = VerificationCache(args.cache) if args.cache else None
+    results = InstanceDatabase(args.path).validate_all(
+        workers=args.workers, cache=cache
+    )
+    for result in results:
+        print(json.dumps(result))
+    return 0 if all(result["valid"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
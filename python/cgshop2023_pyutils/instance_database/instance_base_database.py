@@ -1,5 +1,6 @@
 import os
 import abc
+import hashlib
 import typing
 
 from ..io import read_instance
@@ -15,7 +16,8 @@ class InstanceBaseDatabase(abc.ABC):
         Create an InstanceDatabase that searches in a specified folder for instances.
         :param path: Path to the folder that contains the instance files (e.g. the folder
                         that contains the extracted zips). The instance files can be
-                        in subfolders but have the names have to be NAME.instance.json.
+                        in subfolders but have the names have to be NAME.instance.json
+                        (or NAME.instance.cgbin for the binary format).
         :param enable_cache: Should the loaded instances be cached? This can take quite
                         a lot of memory
         """
@@ -35,7 +37,7 @@ class InstanceBaseDatabase(abc.ABC):
         split = filename.split(".")
         if len(split) != 3:
             return False
-        return split[1] == "instance" and split[2] == "json"
+        return split[1] == "instance" and split[2] in ("json", "cgbin")
 
     def read(self, f):
         return read_instance(f)
@@ -59,6 +61,13 @@ class InstanceBaseDatabase(abc.ABC):
         filename = os.path.split(path)[1]
         return filename.split(".")[0]
 
+    def _fingerprint(self, files: typing.Iterable[typing.Tuple]) -> str:
+        # hash of cheap file properties (path, size, ...) of all instance files.
+        digest = hashlib.sha256()
+        for file in sorted(files):
+            digest.update(repr(file).encode("utf-8"))
+        return digest.hexdigest()
+
     @abc.abstractmethod
     def __iter__(self) -> typing.Dict:
         """
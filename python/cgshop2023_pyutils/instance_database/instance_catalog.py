@@ -0,0 +1,170 @@
+"""
+A catalog with the metadata of all instances of a database, such that instances
+can be selected by their size without reading the instance files. The catalog is
+stored next to the instances and is rebuilt if the files change.
+"""
+import bisect
+import hashlib
+import json
+import logging
+import os
+import typing
+
+from ..io.binary import BINARY_EXTENSION, binary_to_json, to_fraction
+
+logger = logging.getLogger(__name__)
+
+_VERSION = 1
+# Fields that can be filtered with `min_<field>` and `max_<field>`.
+NUMERIC_FIELDS = ("n", "holes", "outer_vertices", "magnitude")
+
+
+def instance_metadata(name: str, path: str, data: bytes) -> typing.Dict:
+    """
+    Extracts the metadata of an instance from the content of its file.
+    :param name: Name of the instance (as in the file name).
+    :param path: Path of the file in the database.
+    :param data: Content of the file (json or binary format).
+    :return: A dictionary with 'name', 'path', 'n' (number of vertices), 'holes'
+            (number of holes), 'outer_vertices', 'bbox' (xmin, ymin, xmax, ymax),
+            'magnitude' (largest absolute coordinate) and 'sha256' of the file.
+    """
+    if path.lower().endswith(BINARY_EXTENSION):
+        instance = binary_to_json(data)
+    else:
+        instance = json.loads(data.decode("utf-8"))
+    points = list(instance["outer_boundary"])
+    for hole in instance["holes"]:
+        points.extend(hole)
+    xs = [to_fraction(p["x"]) for p in points]
+    ys = [to_fraction(p["y"]) for p in points]
+    return {
+        "name": name,
+        "path": path,
+        "n": instance.get("n", len(points)),
+        "holes": len(instance["holes"]),
+        "outer_vertices": len(instance["outer_boundary"]),
+        "bbox": [float(min(xs)), float(min(ys)), float(max(xs)), float(max(ys))],
+        "magnitude": float(max(abs(c) for c in xs + ys)),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+
+
+class InstanceCatalog:
+    """
+    Metadata of all instances of a database, sorted by `n`.
+    e.g.,
+    ```
+    idb = InstanceDatabase("./instances.zip")
+    for entry in idb.select(min_n=1000, max_holes=5):
+        instance = idb[entry["name"]]
+    ```
+    """
+
+    def __init__(self, entries: typing.Iterable[typing.Dict], fingerprint: str):
+        self.fingerprint = fingerprint
+        self.entries = sorted(entries, key=lambda e: (e["n"], e["name"]))
+        self._n = [entry["n"] for entry in self.entries]
+        self._by_name = {entry["name"]: entry for entry in self.entries}
+
+    @classmethod
+    def build(cls, database) -> "InstanceCatalog":
+        """
+        Reads every instance of the (inner) database once.
+        """
+        entries = [
+            instance_metadata(name, path, database._read_bytes(path))
+            for name, path in database._iterate_files()
+        ]
+        return cls(entries, database.fingerprint())
+
+    @classmethod
+    def load(cls, path: str) -> typing.Optional["InstanceCatalog"]:
+        """
+        Loads a stored catalog. Returns None if it does not exist or is outdated.
+        """
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != _VERSION:
+            return None
+        return cls(data["entries"], data["fingerprint"])
+
+    def save(self, path: str):
+        data = {
+            "version": _VERSION,
+            "fingerprint": self.fingerprint,
+            "entries": self.entries,
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)  # atomic, readers never see a partial file
+
+    @classmethod
+    def for_database(
+        cls, database, path: typing.Optional[str] = None, rebuild: bool = False
+    ) -> "InstanceCatalog":
+        """
+        Loads the stored catalog of the database or builds (and stores) a new one
+        if there is none or the files of the database have changed.
+        :param database: The inner database (folder or zip).
+        :param path: Where to store the catalog. Defaults to the database's
+                    `default_catalog_path()`.
+        :param rebuild: Always build a new catalog.
+        """
+        if path is None:
+            path = database.default_catalog_path()
+        fingerprint = database.fingerprint()
+        catalog = None if rebuild else cls.load(path)
+        if catalog is not None and catalog.fingerprint == fingerprint:
+            return catalog
+        catalog = cls.build(database)
+        try:
+            catalog.save(path)
+        except OSError as e:
+            logger.warning("Could not store the instance catalog at %s: %s", path, e)
+        return catalog
+
+    def select(self, **criteria) -> typing.List[typing.Dict]:
+        """
+        Selects the entries that satisfy all criteria, sorted by `n`.
+        :param criteria: `min_<field>` or `max_<field>` (inclusive) for the fields
+                    'n', 'holes', 'outer_vertices' and 'magnitude'.
+        :return: The metadata of the selected instances.
+        """
+        bounds = []
+        for key, value in criteria.items():
+            bound, _, field = key.partition("_")
+            if bound not in ("min", "max") or field not in NUMERIC_FIELDS:
+                raise TypeError(f"Unknown criterion '{key}'.")
+            if value is not None:
+                bounds.append((field, bound == "min", value))
+        # `n` is the index, the other fields are filtered.
+        begin, end = 0, len(self.entries)
+        if criteria.get("min_n") is not None:
+            begin = bisect.bisect_left(self._n, criteria["min_n"])
+        if criteria.get("max_n") is not None:
+            end = bisect.bisect_right(self._n, criteria["max_n"])
+        return [
+            entry
+            for entry in self.entries[begin:end]
+            if all(
+                entry[field] >= value if is_min else entry[field] <= value
+                for field, is_min, value in bounds
+            )
+        ]
+
+    def __getitem__(self, name: str) -> typing.Dict:
+        return self._by_name[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def __iter__(self) -> typing.Iterator[typing.Dict]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
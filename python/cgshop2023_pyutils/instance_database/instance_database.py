@@ -4,12 +4,16 @@ import typing
 
 from .instance_file_database import InstanceFileDatabase
 from .instance_zip_database import InstanceZipDatabase
+from .instance_catalog import InstanceCatalog
+from .shared_instance_store import SharedInstanceStore
+from ..tracing import span
 
 
 class InstanceDatabase:
     """
     This class allows to easily read instances from a folder/zipfile if the instance files
-    follow the naming convention 'instance-name.instance.json'. It allows subfolder
+    follow the naming convention 'instance-name.instance.json' (or
+    'instance-name.instance.cgbin' for the binary format). It allows subfolder
     but no symbolic links.
     """
 
@@ -23,6 +27,7 @@ class InstanceDatabase:
                         a lot of memory
         """
         self._inner_database = self._guess_database_class(path, enable_cache)
+        self._catalog = None
 
     def _guess_database_class(self, path: str, enable_cache):
         """
@@ -58,4 +63,67 @@ class InstanceDatabase:
         extension = ".instance"
         if len(name) > len(extension) and name[-len(extension) :] == extension:
             name = name[: -len(extension)]
-        return self._inner_database[name]
+        with span("instance.lookup", instance=name):
+            return self._inner_database[name]
+
+    def catalog(
+        self, path: typing.Optional[str] = None, rebuild: bool = False
+    ) -> InstanceCatalog:
+        """
+        The metadata of all instances. The catalog is built on first use by
+        reading every instance once and stored on disk (next to the zip or in the
+        folder). It is rebuilt automatically if the instance files change.
+        :param path: Where to store the catalog (if the default is not writable).
+        :param rebuild: Build a new catalog even if the stored one is up to date.
+        :return: The catalog.
+        """
+        if self._catalog is None or path is not None or rebuild:
+            self._catalog = InstanceCatalog.for_database(
+                self._inner_database, path, rebuild
+            )
+        return self._catalog
+
+    def select(self, **criteria) -> typing.List[typing.Dict]:
+        """
+        Selects instances by their metadata without reading the instance files
+        (except for building the catalog once).
+        e.g.,
+        ```
+        for entry in idb.select(min_n=1000, max_n=5000, max_holes=0):
+            instance = idb[entry["name"]]
+        ```
+        :param criteria: `min_<field>` or `max_<field>` (inclusive) for the fields
+                    'n', 'holes', 'outer_vertices' and 'magnitude'.
+        :return: The metadata of the selected instances (name, path, n, holes,
+                    outer_vertices, bbox, magnitude, sha256), sorted by n.
+        """
+        return self.catalog().select(**criteria)
+
+    def validate_all(
+        self, workers: typing.Optional[int] = None, cache=None
+    ) -> typing.List[typing.Dict]:
+        """
+        Validates all instances in the database in parallel.
+        :param workers: Number of processes. Defaults to the number of CPUs.
+        :param cache: Optional `VerificationCache` to remember the verdicts by the
+                        hash of the instance geometry.
+        :return: A dictionary with the `name`, the verdict `valid`, the
+                    `diagnostics`, and if the result was `cached` for every instance.
+        """
+        from ..verifier import validate_instances  # imports the native core
+
+        return list(validate_instances(self, workers=workers, cache=cache))
+
+    def publish_shared(
+        self, path: typing.Optional[str] = None, max_cached: int = 8
+    ) -> SharedInstanceStore:
+        """
+        Converts all instances once and publishes them in a read-only memory mapped
+        file that can be shared by many worker processes. Workers can attach via
+        `SharedInstanceStore.attach(store.path)` or get the store pickled.
+        :param path: Path of the file. Defaults to a temporary file in memory-backed
+                        storage, which is deleted when the store is closed.
+        :param max_cached: Number of decoded instances kept per process.
+        :return: The store with the instances as `PreparedInstance`.
+        """
+        return SharedInstanceStore.create(self, path, max_cached=max_cached)
@@ -7,7 +7,8 @@ from .instance_base_database import InstanceBaseDatabase
 class InstanceFileDatabase(InstanceBaseDatabase):
     """
     This class allows to easily read instances from a folder if the instance files
-    follow the naming convention 'instance-name.instance.json'. It allows subfolder
+    follow the naming convention 'instance-name.instance.json' (or
+    'instance-name.instance.cgbin' for the binary format). It allows subfolder
     but no symbolic links.
     """
 
@@ -32,6 +33,31 @@ class InstanceFileDatabase(InstanceBaseDatabase):
                     path = os.path.join(root, file)
                     yield path
 
+    def _iterate_files(self) -> typing.Iterator[typing.Tuple[str, str]]:
+        """
+        Names and paths (relative to the folder) of all instance files.
+        """
+        for instance_path in self._iterate_paths():
+            name = self._extract_instance_name_from_path(instance_path)
+            yield name, os.path.relpath(instance_path, self._path)
+
+    def _read_bytes(self, path: str) -> bytes:
+        with open(os.path.join(self._path, path), "rb") as f:
+            return f.read()
+
+    def fingerprint(self) -> str:
+        """
+        Changes if an instance file is added, removed or modified.
+        """
+        files = []
+        for _, path in self._iterate_files():
+            stat = os.stat(os.path.join(self._path, path))
+            files.append((path, stat.st_size, stat.st_mtime_ns))
+        return self._fingerprint(files)
+
+    def default_catalog_path(self) -> str:
+        return os.path.join(self._path, ".instance_catalog.json")
+
     def _find_path(self, name):
         for instance_path in self._iterate_paths():
             if self._filename_fits_name(os.path.split(instance_path)[-1], name):
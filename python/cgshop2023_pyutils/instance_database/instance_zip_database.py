@@ -8,7 +8,8 @@ from .instance_base_database import InstanceBaseDatabase
 class InstanceZipDatabase(InstanceBaseDatabase):
     """
     This class allows to easily read instances from a zipfile if the instance files
-    follow the naming convention 'instance-name.instance.json'. It allows subfolder
+    follow the naming convention 'instance-name.instance.json' (or
+    'instance-name.instance.cgbin' for the binary format). It allows subfolder
     but no symbolic links.
     """
 
@@ -33,6 +34,33 @@ class InstanceZipDatabase(InstanceBaseDatabase):
                 return instance_path
         raise KeyError(f"Did not find a suitable file for {name} in {self._path}")
 
+    def _iterate_files(self) -> typing.Iterator[typing.Tuple[str, str]]:
+        """
+        Names and paths (in the zip) of all instance files.
+        """
+        for file_data in self._zipfile.filelist:
+            if self._filename_fits_instance_convention(
+                os.path.split(file_data.filename)[-1]
+            ) and not self._is_hidden_folder(file_data.filename):
+                name = self._extract_instance_name_from_path(file_data.filename)
+                yield name, file_data.filename
+
+    def _read_bytes(self, path: str) -> bytes:
+        return self._zipfile.read(path)
+
+    def fingerprint(self) -> str:
+        """
+        Changes if an instance file is added, removed or modified.
+        """
+        files = []
+        for _, path in self._iterate_files():
+            info = self._zipfile.getinfo(path)
+            files.append((path, info.file_size, info.CRC))
+        return self._fingerprint(files)
+
+    def default_catalog_path(self) -> str:
+        return self._path + ".catalog.json"
+
     def __iter__(self) -> typing.Dict:
         """
         Iterate over all instance files.
@@ -0,0 +1,172 @@
+"""
+Publishes the instance geometry in a read-only memory mapped file, such that many
+worker processes can share it without loading and converting the instances on
+their own.
+"""
+import collections
+import json
+import mmap
+import os
+import struct
+import tempfile
+import typing
+
+_MAGIC = b"CGSHOPIS"
+_HEADER = struct.Struct("<8sQQ")  # magic, offset and length of the index
+
+
+def _default_folder():
+    # /dev/shm is backed by memory on Linux.
+    if os.path.isdir("/dev/shm"):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+class SharedInstanceStore:
+    """
+    Read-only store of native instances in a memory mapped file. The pages are
+    shared by all processes that attach to the same file, so the memory does not
+    grow with the number of workers. The instances are decoded lazily from the
+    exact binary encoding of the native core.
+    Decoding creates a private copy of the instance in the process, which costs
+    about as much as reading the instance from json, but without the parsing
+    (roughly a tenth of the time). Only the most recently used instances are
+    kept decoded, so a worker that sees many instances does not end up with a
+    private copy of the whole store.
+    e.g.,
+    ```
+    store = InstanceDatabase("./instances.zip").publish_shared()
+    # in the workers
+    instances = SharedInstanceStore.attach(store.path)
+    err_msg = verify(instances[solution["instance"]], solution)
+    ```
+    """
+
+    def __init__(self, path: str, owner: bool = False, max_cached: int = 8):
+        """
+        Use `create` or `attach` instead.
+        :param path: Path to the file with the instance data.
+        :param owner: Delete the file on `close`?
+        :param max_cached: Number of decoded instances kept in this process.
+                        Use 0 to decode the instance on every access.
+        """
+        if max_cached < 0:
+            raise ValueError("max_cached must not be negative.")
+        self.path = path
+        self._owner = owner
+        self.max_cached = max_cached
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset, index_size = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a shared instance store.")
+        index_data = self._mmap[index_offset : index_offset + index_size]
+        self._index = json.loads(index_data.decode("utf-8"))
+        self._instances = collections.OrderedDict()  # least recently used first
+
+    @classmethod
+    def create(
+        cls,
+        instances: typing.Iterable[typing.Dict],
+        path: typing.Optional[str] = None,
+        max_cached: int = 8,
+    ) -> "SharedInstanceStore":
+        """
+        Converts the instances and writes them into a new store.
+        :param instances: The instances as parsed from the json.
+        :param path: Path of the file to create. Defaults to a temporary file in
+                        memory-backed storage.
+        :param max_cached: Number of decoded instances kept in this process.
+        :return: The store, which deletes the file when it is closed.
+        """
+        from ..verifier import PreparedInstance  # imports the native core
+
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="cgshop2023_", dir=_default_folder())
+            os.close(fd)
+        index = {}
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, 0, 0))  # placeholder
+            for instance in instances:
+                prepared = PreparedInstance(instance)
+                payload = prepared.native.to_bytes()
+                index[instance["name"]] = [
+                    f.tell(),
+                    len(payload),
+                    prepared.key,
+                    *prepared.instance_size(),
+                ]
+                f.write(payload)
+            index_offset = f.tell()
+            index_data = json.dumps(index).encode("utf-8")
+            f.write(index_data)
+            f.seek(0)
+            f.write(_HEADER.pack(_MAGIC, index_offset, len(index_data)))
+        return cls(path, owner=True, max_cached=max_cached)
+
+    @classmethod
+    def attach(cls, path: str, max_cached: int = 8) -> "SharedInstanceStore":
+        """
+        Attach to a store created by another process.
+        """
+        return cls(path, owner=False, max_cached=max_cached)
+
+    def __getitem__(self, name: str):
+        """
+        Returns the instance as `PreparedInstance` or throws a KeyError.
+        """
+        if name in self._instances:
+            self._instances.move_to_end(name)
+            return self._instances[name]
+        from ..core import NativeInstance
+        from ..verifier import PreparedInstance
+
+        offset, size, key, vertices, holes = self._index[name]
+        native = NativeInstance.from_bytes(
+            memoryview(self._mmap)[offset : offset + size]
+        )
+        prepared = PreparedInstance.from_native(
+            native, name=name, key=key, size=(vertices, holes)
+        )
+        if self.max_cached > 0:
+            self._instances[name] = prepared
+            while len(self._instances) > self.max_cached:
+                self._instances.popitem(last=False)
+        return prepared
+
+    def instance_size(self, name: str) -> typing.Tuple[int, int]:
+        """
+        The number of vertices and holes of an instance, without decoding it.
+        """
+        return tuple(self._index[name][3:5])
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def close(self):
+        """
+        Closes the mapping. The owner also deletes the file.
+        """
+        self._instances.clear()
+        self._mmap.close()
+        if self._owner and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __getstate__(self):
+        # other processes only get the path and attach to the same file.
+        return {"path": self.path, "max_cached": self.max_cached}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"], owner=False, max_cached=state["max_cached"])
@@ -6,6 +6,15 @@ from .read import (
     read_instance,
     read_solution,
     parse_solution,
+    solution_instance_name,
     BadSolutionFile,
     NoSolution,
 )
+from .binary import (
+    BINARY_EXTENSION,
+    binary_to_json,
+    json_to_binary,
+    read_binary,
+    write_binary,
+    convert_file,
+)
@@ -0,0 +1,41 @@
+"""
+A small replacement for `networkx.utils.open_file`, such that reading a file
+does not need to import networkx.
+"""
+import functools
+import os
+
+
+def _open(path, mode: str):
+    path = os.fspath(path)
+    if path.endswith((".gz", ".gzip")):
+        import gzip
+
+        return gzip.open(path, mode + "t" if "b" not in mode else mode)
+    if path.endswith(".bz2"):
+        import bz2
+
+        return bz2.open(path, mode + "t" if "b" not in mode else mode)
+    return open(path, mode)
+
+
+def open_file(path_arg: int, mode: str = "r"):
+    """
+    Decorator that opens the argument at position `path_arg` if it is a path
+    (compressed files are detected by their extension) and closes it again
+    afterwards. File objects are passed through unchanged.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            path = args[path_arg]
+            if not isinstance(path, (str, bytes, os.PathLike)):
+                return func(*args, **kwargs)
+            with _open(path, mode) as file:
+                args = args[:path_arg] + (file,) + args[path_arg + 1 :]
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
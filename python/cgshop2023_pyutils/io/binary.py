@@ -0,0 +1,312 @@
+"""
+A compact binary format for instances and solutions, using the file extension
+'.cgbin'. It stores the same data as the json files, but the coordinates only
+take a few bytes each.
+
+Layout (all varints are unsigned LEB128):
+    magic           8 bytes, b"CGSHOPB\\x01"
+    kind            1 byte, 0 = instance, 1 = solution
+    flags           1 byte, bit 0: coordinates have denominators
+    name            varint length + utf-8 (instance name)
+    extra           varint length + utf-8 json object with all other entries
+    num_polygons    varint
+    offsets         num_polygons x uint64 (little endian), start of every
+                    polygon relative to the start of the polygon data
+    polygons        for every polygon: varint number of points, then for
+                    every point x and y, each as zigzag varint numerator
+                    (followed by a varint denominator if flag 0 is set)
+
+The polygons of an instance are the outer boundary followed by the holes.
+Numbers are stored as reduced fractions, so the conversion is lossless for the
+values, but e.g. "0.5" becomes {"num": 1, "den": 2}. Varints are limited to
+1024 bytes (numbers with up to 7168 bits).
+"""
+import json
+import os
+import re
+import struct
+import typing
+from fractions import Fraction
+
+BINARY_EXTENSION = ".cgbin"
+_MAGIC = b"CGSHOPB\x01"
+_INSTANCE = 0
+_SOLUTION = 1
+_HAS_DENOMINATORS = 1
+_OFFSET = struct.Struct("<Q")
+# Longer varints are rejected, as their decoding takes quadratic time.
+_MAX_VARINT_BYTES = 1024
+# A varint is any number of bytes with the continuation bit and a final byte.
+_VARINT = re.compile(rb"[\x80-\xff]*[\x00-\x7f]")
+
+
+def to_fraction(number_data) -> Fraction:
+    """
+    Converts any number representation of the json format (int, float, decimal
+    string, rational string, {"num": .., "den": ..}) to an exact fraction.
+    """
+    if isinstance(number_data, bool):
+        raise ValueError(f"Don't know how to convert '{number_data}'.")
+    if isinstance(number_data, float):
+        return Fraction(str(number_data))
+    if isinstance(number_data, int):
+        return Fraction(number_data)
+    if isinstance(number_data, str):
+        return Fraction(number_data.strip())
+    if isinstance(number_data, dict):
+        return to_fraction(number_data["num"]) / to_fraction(number_data.get("den", 1))
+    raise ValueError(f"Don't know how to convert '{number_data}'.")
+
+
+def _from_fraction(value: Fraction):
+    if value.denominator == 1:
+        return value.numerator
+    return {"num": value.numerator, "den": value.denominator}
+
+
+def _write_varint(out: bytearray, value: int):
+    if value.bit_length() > 7 * _MAX_VARINT_BYTES:
+        raise ValueError("Number too large for the binary format.")
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_bytes(out: bytearray, data: bytes):
+    _write_varint(out, len(data))
+    out += data
+
+
+def _zigzag(value: int) -> int:
+    return 2 * value if value >= 0 else -2 * value - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def _varint_value(token: bytes) -> int:
+    if len(token) > _MAX_VARINT_BYTES:
+        raise ValueError("Varint too long in binary data.")
+    value = 0
+    for byte in reversed(token):
+        value = (value << 7) | (byte & 0x7F)
+    return value
+
+
+class _Reader:
+    def __init__(self, data: bytes, pos: int = 0):
+        self._data = memoryview(data)
+        self.pos = pos
+
+    def byte(self) -> int:
+        if self.pos >= len(self._data):
+            raise ValueError("Unexpected end of binary data.")
+        self.pos += 1
+        return self._data[self.pos - 1]
+
+    def varint(self) -> int:
+        match = _VARINT.match(self._data, self.pos)
+        if match is None:
+            raise ValueError("Unexpected end of binary data.")
+        self.pos = match.end()
+        return _varint_value(match.group())
+
+    def bytes(self, size: int) -> bytes:
+        if self.pos + size > len(self._data):
+            raise ValueError("Unexpected end of binary data.")
+        self.pos += size
+        return bytes(self._data[self.pos - size : self.pos])
+
+
+def _encode_polygon(out: bytearray, points, with_denominators: bool):
+    _write_varint(out, len(points))
+    for point in points:
+        for value in point:
+            _write_varint(out, _zigzag(value.numerator))
+            if with_denominators:
+                _write_varint(out, value.denominator)
+
+
+def _decode_polygon(reader: _Reader, with_denominators: bool):
+    points = []
+    for _ in range(reader.varint()):
+        coords = []
+        for _ in range(2):
+            num = _unzigzag(reader.varint())
+            den = reader.varint() if with_denominators else 1
+            if den == 0:
+                raise ValueError("Denominator must not be zero.")
+            coords.append(_from_fraction(Fraction(num, den)))
+        points.append({"x": coords[0], "y": coords[1]})
+    return points
+
+
+def _decode_polygons(
+    data: bytes, start: int, count: int, with_denominators: bool
+) -> typing.List[typing.List[typing.Dict]]:
+    # The native core decodes the points much faster than Python, which is only
+    # used if the core is not available.
+    try:
+        from ..core import decode_cgbin_polygons
+    except ImportError:
+        reader = _Reader(data, start)
+        return [_decode_polygon(reader, with_denominators) for _ in range(count)]
+    return decode_cgbin_polygons(data, start, count, with_denominators)
+
+
+def json_to_binary(data: typing.Dict) -> bytes:
+    """
+    Encodes an instance or a solution (as parsed from the json) in the binary format.
+    """
+    if data.get("type") == "CGSHOP2023_Instance":
+        kind, name = _INSTANCE, data["name"]
+        polygons = [data["outer_boundary"], *data["holes"]]
+        encoded_keys = ("type", "name", "outer_boundary", "holes")
+    elif data.get("type") == "CGSHOP2023_Solution":
+        kind, name = _SOLUTION, data.get("instance", "")
+        polygons = data["polygons"]
+        encoded_keys = ("type", "instance", "polygons")
+    else:
+        raise ValueError("Neither a CGSHOP2023 instance nor a solution.")
+    extra = {key: value for key, value in data.items() if key not in encoded_keys}
+    points = [
+        [(to_fraction(p["x"]), to_fraction(p["y"])) for p in poly] for poly in polygons
+    ]
+    with_denominators = any(
+        value.denominator != 1 for poly in points for point in poly for value in point
+    )
+    polygon_data = bytearray()
+    offsets = []
+    for poly in points:
+        offsets.append(len(polygon_data))
+        _encode_polygon(polygon_data, poly, with_denominators)
+
+    out = bytearray(_MAGIC)
+    out.append(kind)
+    out.append(_HAS_DENOMINATORS if with_denominators else 0)
+    _write_bytes(out, name.encode("utf-8"))
+    _write_bytes(out, json.dumps(extra, separators=(",", ":")).encode("utf-8"))
+    _write_varint(out, len(points))
+    for offset in offsets:
+        out += _OFFSET.pack(offset)
+    out += polygon_data
+    return bytes(out)
+
+
+def _read_prefix(data: bytes):
+    if data[: len(_MAGIC)] != _MAGIC:
+        raise ValueError("Not a CGSHOP2023 binary file.")
+    reader = _Reader(data, len(_MAGIC))
+    kind = reader.byte()
+    if kind not in (_INSTANCE, _SOLUTION):
+        raise ValueError(f"Unknown kind {kind} of binary file.")
+    with_denominators = bool(reader.byte() & _HAS_DENOMINATORS)
+    name = reader.bytes(reader.varint()).decode("utf-8")
+    extra = json.loads(reader.bytes(reader.varint()).decode("utf-8"))
+    num_polygons = reader.varint()
+    return kind, with_denominators, name, extra, num_polygons, reader
+
+
+def binary_summary(data: bytes) -> typing.Dict:
+    """
+    The top-level fields of an instance or a solution and its number of
+    non-empty polygons (for instances including the outer boundary). Only the
+    header and the number of points of every polygon are read.
+    """
+    kind, _, name, extra, offsets, reader = _read_header(data)
+    if kind == _INSTANCE:
+        summary = {"type": "CGSHOP2023_Instance", "name": name}
+    else:
+        summary = {"type": "CGSHOP2023_Solution", "instance": name}
+    summary.update(extra)
+    start = reader.pos
+    summary["num_polygons"] = sum(
+        1 for offset in offsets if _Reader(data, start + offset).varint() > 0
+    )
+    return summary
+
+
+def _read_header(data: bytes):
+    kind, with_denominators, name, extra, num_polygons, reader = _read_prefix(data)
+    table = reader.bytes(num_polygons * _OFFSET.size)
+    offsets = [offset for (offset,) in _OFFSET.iter_unpack(table)]
+    return kind, with_denominators, name, extra, offsets, reader
+
+
+def binary_to_json(data: bytes) -> typing.Dict:
+    """
+    Decodes an instance or a solution to the same dict as parsed from the json.
+    """
+    kind, with_denominators, name, extra, offsets, reader = _read_header(data)
+    polygons = _decode_polygons(data, reader.pos, len(offsets), with_denominators)
+    if kind == _INSTANCE:
+        if not polygons:
+            raise ValueError("Missing outer boundary.")
+        result = {"type": "CGSHOP2023_Instance", "name": name}
+        result.update(extra)
+        result["outer_boundary"] = polygons[0]
+        result["holes"] = polygons[1:]
+    else:
+        result = {"type": "CGSHOP2023_Solution", "instance": name}
+        result.update(extra)
+        result["polygons"] = polygons
+    return result
+
+
+def read_polygon(data: bytes, index: int) -> typing.List[typing.Dict]:
+    """
+    Decodes a single polygon via the offset table, without decoding the others.
+    For instances, index 0 is the outer boundary and the holes follow.
+    """
+    _, with_denominators, _, _, offsets, reader = _read_header(data)
+    start = reader.pos + offsets[index]
+    return _decode_polygons(data, start, 1, with_denominators)[0]
+
+
+def is_binary_file(path_or_file) -> bool:
+    """
+    Binary files are recognized by their extension (also for opened files).
+    """
+    if not isinstance(path_or_file, (str, bytes, os.PathLike)):
+        path_or_file = getattr(path_or_file, "name", "")
+    if isinstance(path_or_file, int):  # file descriptor
+        return False
+    path = os.fsdecode(path_or_file)
+    return path.lower().endswith(BINARY_EXTENSION)
+
+
+def read_binary(path_or_file) -> typing.Dict:
+    """
+    Reads a binary file into the same dict as parsed from the json.
+    """
+    if isinstance(path_or_file, (str, bytes, os.PathLike)):
+        with open(path_or_file, "rb") as file:
+            return binary_to_json(file.read())
+    return binary_to_json(path_or_file.read())
+
+
+def write_binary(data: typing.Dict, path: typing.Union[str, os.PathLike]):
+    """
+    Writes an instance or a solution (as parsed from the json) in the binary format.
+    """
+    encoded = json_to_binary(data)
+    with open(path, "wb") as file:
+        file.write(encoded)
+
+
+def convert_file(source, target):
+    """
+    Converts between json and the binary format, as given by the extensions.
+    """
+    if is_binary_file(source):
+        data = read_binary(source)
+    else:
+        with open(source, "r") as file:
+            data = json.load(file)
+    if is_binary_file(target):
+        write_binary(data, target)
+    else:
+        with open(target, "w") as file:
+            json.dump(data, file)
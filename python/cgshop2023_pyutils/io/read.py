@@ -1,12 +1,27 @@
 import typing
 
-from networkx.utils import open_file
 import json
 
+from ._open_file import open_file
+from .binary import is_binary_file, read_binary
+
 
 @open_file(0, mode="r")
+def _read_json(path) -> typing.Dict:
+    return json.load(path)
+
+
+def _read_data(path) -> typing.Dict:
+    if is_binary_file(path):
+        return read_binary(path)
+    return _read_json(path)
+
+
 def read_instance(path) -> typing.Dict:
-    data = json.load(path)
+    """
+    Reads an instance from a json file or a binary file (extension '.cgbin').
+    """
+    data = _read_data(path)
     if data["type"] != "CGSHOP2023_Instance":
         raise ValueError("Not a CGSHOP2023 instance file")
     if not data["name"] or not isinstance(data["name"], str):
@@ -16,9 +31,11 @@ def read_instance(path) -> typing.Dict:
     return data
 
 
-@open_file(0, mode="r")
 def read_solution(path) -> typing.Dict:
-    data = json.load(path)
+    """
+    Reads a solution from a json file or a binary file (extension '.cgbin').
+    """
+    data = _read_data(path)
     return parse_solution(data)
 
 
@@ -38,20 +55,25 @@ class BadSolutionFile(Exception):
         return self.msg
 
 
-def parse_solution(data):
-    if data["type"] != "CGSHOP2023_Solution":
+def solution_instance_name(data) -> str:
+    """
+    The name of the instance of a solution, also if it is given as 'id' or 'name'.
+    Only the top-level fields of the solution are needed, not the polygons.
+    """
+    if data.get("type") != "CGSHOP2023_Solution":
         raise NoSolution("Not a CGSHOP2023 solution file")
-    if "id" in data and "instance" not in data:
-        data["instance"] = data["id"]
-    if "name" in data and "instance" not in data:
-        data["instance"] = data["name"]
-    if not data["instance"] or not isinstance(data["instance"], str):
+    name = data.get("instance", data.get("id", data.get("name")))
+    if not name or not isinstance(name, str):
         raise BadSolutionFile("Missing instance name")
-    data["instance"] = data["instance"].split("/")[-1].split(".")[0]
+    return name.split("/")[-1].split(".")[0]
+
+
+def parse_solution(data):
+    data["instance"] = solution_instance_name(data)
     polygons = data["polygons"]
     if not isinstance(polygons, list):
         raise BadSolutionFile("Solution is not a list.")
-    data["polygons"] = [p for p in data["polygons"] if p]  # remove empty polygons
+    polygons = data["polygons"] = [p for p in polygons if p]  # remove empty polygons
     if not polygons:
         raise BadSolutionFile("At least one polygon must be provided")
     if not all(isinstance(p, list) for p in polygons):
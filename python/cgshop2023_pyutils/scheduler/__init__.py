@@ -0,0 +1,7 @@
+"""
+Scheduling of many verifications on a worker pool, ordered by their predicted
+runtime.
+"""
+# flake8: noqa F401
+from .cost_model import CostModel, extract_features, instance_size
+from .verification_scheduler import VerificationScheduler
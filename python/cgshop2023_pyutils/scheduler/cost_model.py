@@ -0,0 +1,189 @@
+"""
+A simple linear model that predicts the runtime of a verification from cheap
+features of the instance and the parsed solution. The coefficients are learned
+from the observed runtimes via (ridge) least squares.
+"""
+import typing
+
+FEATURE_NAMES = (
+    "intercept",
+    "solution_polygons",
+    "solution_vertices",
+    "solution_vertices_x_bits",
+    "instance_vertices",
+    "instance_holes",
+)
+
+# Rough guesses in seconds, used until enough runtimes have been observed.
+_DEFAULT_COEFFICIENTS = (1e-3, 1e-4, 2e-5, 1e-7, 1e-5, 1e-4)
+
+
+def _bit_length(number_data) -> int:
+    if isinstance(number_data, bool):
+        return 1
+    if isinstance(number_data, int):
+        return abs(number_data).bit_length()
+    if isinstance(number_data, float):
+        return 53
+    if isinstance(number_data, str):
+        return (len(number_data) * 10) // 3  # about 3.3 bits per digit
+    if isinstance(number_data, dict):
+        return sum(_bit_length(v) for v in number_data.values())
+    return 0
+
+
+def instance_size(instance) -> typing.Tuple[int, int]:
+    """
+    Number of vertices and number of holes of an instance.
+    :param instance: The instance as parsed from the json, or anything with an
+                `instance_size()` method, e.g., a `PreparedInstance`.
+    """
+    if isinstance(instance, dict):
+        holes = instance["holes"]
+        vertices = len(instance["outer_boundary"]) + sum(len(h) for h in holes)
+        return vertices, len(holes)
+    return instance.instance_size()
+
+
+def extract_features(
+    instance,
+    solution: typing.Dict,
+    size: typing.Optional[typing.Tuple[int, int]] = None,
+) -> typing.List[float]:
+    """
+    Cheap features of a verification job, as available after `parse_solution`.
+    :param instance: The instance as parsed from the json or a `PreparedInstance`.
+                Can be None if the `size` is given.
+    :param solution: The solution as returned by `parse_solution`.
+    :param size: The `instance_size` of the instance, e.g., from the index of a
+                `SharedInstanceStore`.
+    :return: List of features in the order of `FEATURE_NAMES`.
+    """
+    polygons = solution["polygons"]
+    num_vertices = sum(len(poly) for poly in polygons)
+    max_bits = max(
+        (
+            max(_bit_length(p["x"]), _bit_length(p["y"]))
+            for poly in polygons
+            for p in poly
+        ),
+        default=0,
+    )
+    if size is None:
+        if instance is None:
+            raise ValueError("Either the instance or its size is needed.")
+        size = instance_size(instance)
+    instance_vertices, instance_holes = size
+    return [
+        1.0,
+        float(len(polygons)),
+        float(num_vertices),
+        float(num_vertices * max_bits),
+        float(instance_vertices),
+        float(instance_holes),
+    ]
+
+
+def _solve(matrix, vector):
+    """
+    Solves a small linear system with Gaussian elimination (partial pivoting).
+    """
+    n = len(vector)
+    a = [list(row) + [b] for row, b in zip(matrix, vector)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(a[r][col]))
+        if abs(a[pivot][col]) < 1e-300:
+            raise ValueError("Singular system")
+        a[col], a[pivot] = a[pivot], a[col]
+        for row in range(col + 1, n):
+            factor = a[row][col] / a[col][col]
+            for k in range(col, n + 1):
+                a[row][k] -= factor * a[col][k]
+    x = [0.0] * n
+    for row in reversed(range(n)):
+        x[row] = (a[row][n] - sum(a[row][k] * x[k] for k in range(row + 1, n))) / a[
+            row
+        ][row]
+    return x
+
+
+class CostModel:
+    """
+    Linear runtime model `seconds = coefficients * features`.
+    e.g.,
+    ```
+    model = CostModel()
+    features = extract_features(instance, solution)
+    predicted = model.predict(features)
+    model.observe(features, measured_seconds)
+    ```
+    """
+
+    def __init__(
+        self,
+        coefficients: typing.Optional[typing.Sequence[float]] = None,
+        regularization: float = 1e-6,
+        refit_interval: int = 32,
+    ):
+        """
+        :param coefficients: Initial coefficients, e.g., from `to_dict` of a previous run.
+        :param regularization: Ridge regularization towards the initial coefficients.
+        :param refit_interval: Refit the coefficients after this many observations.
+        """
+        self.coefficients = list(coefficients or _DEFAULT_COEFFICIENTS)
+        if len(self.coefficients) != len(FEATURE_NAMES):
+            raise ValueError(f"Expected {len(FEATURE_NAMES)} coefficients.")
+        self._prior = list(self.coefficients)
+        self._regularization = regularization
+        self._refit_interval = refit_interval
+        n = len(FEATURE_NAMES)
+        self._xtx = [[0.0] * n for _ in range(n)]
+        self._xty = [0.0] * n
+        self.num_observations = 0
+        self.num_fits = 0  # lets users notice that predictions changed
+
+    def predict(self, features: typing.Sequence[float]) -> float:
+        """
+        Predicted runtime in seconds (never negative).
+        """
+        return max(0.0, sum(c * f for c, f in zip(self.coefficients, features)))
+
+    def observe(self, features: typing.Sequence[float], seconds: float):
+        """
+        Adds a measured runtime. The coefficients are refitted regularly.
+        """
+        for i, fi in enumerate(features):
+            self._xty[i] += fi * seconds
+            for j, fj in enumerate(features):
+                self._xtx[i][j] += fi * fj
+        self.num_observations += 1
+        if self.num_observations % self._refit_interval == 0:
+            self.fit()
+
+    def fit(self):
+        """
+        Least squares fit of the coefficients to the observed runtimes. The
+        regularization keeps unobserved directions at their previous values.
+        """
+        if not self.num_observations:
+            return
+        n = len(FEATURE_NAMES)
+        scale = max(self._xtx[i][i] for i in range(n)) or 1.0
+        reg = self._regularization * scale
+        matrix = [
+            [self._xtx[i][j] + (reg if i == j else 0.0) for j in range(n)]
+            for i in range(n)
+        ]
+        vector = [self._xty[i] + reg * self._prior[i] for i in range(n)]
+        try:
+            self.coefficients = _solve(matrix, vector)
+        except ValueError:
+            return  # keep the previous coefficients
+        self.num_fits += 1
+
+    def to_dict(self) -> typing.Dict:
+        return dict(zip(FEATURE_NAMES, self.coefficients))
+
+    @classmethod
+    def from_dict(cls, data: typing.Dict, **kwargs) -> "CostModel":
+        return cls([data[name] for name in FEATURE_NAMES], **kwargs)
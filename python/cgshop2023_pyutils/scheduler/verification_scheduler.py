@@ -0,0 +1,194 @@
+"""
+Dispatches verification jobs to a pool of workers in the order of their predicted
+runtime, such that a single huge submission does not delay many small ones.
+"""
+import heapq
+import itertools
+import os
+import time
+import typing
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+
+from .cost_model import CostModel, extract_features
+
+SHORTEST_FIRST = "shortest_first"
+FAIR_SHARE = "fair_share"
+
+_attached_stores = {}
+
+
+def _timed_verify(instance, solution, store_path=None):
+    """
+    Runs in the worker. Returns the error message and the runtime in seconds.
+    """
+    from ..verifier import verify  # imports the native core
+
+    if store_path is not None:
+        from ..instance_database import SharedInstanceStore
+
+        if store_path not in _attached_stores:
+            _attached_stores[store_path] = SharedInstanceStore.attach(store_path)
+        instance = _attached_stores[store_path][instance]
+    start = time.perf_counter()
+    try:
+        error_msg = verify(instance, solution)
+    except Exception as e:
+        error_msg = f"Could not verify solution: {e}"
+    return error_msg, time.perf_counter() - start
+
+
+class VerificationScheduler:
+    """
+    Collects verification jobs and runs them on a worker pool. The runtime of
+    every job is predicted by a `CostModel`, which is updated with the measured
+    runtimes; whenever the model is refitted, the pending jobs are re-scored.
+    With the policy 'shortest_first', the job with the smallest
+    predicted runtime is dispatched next. With 'fair_share', the next job is the
+    shortest job of the team that has consumed the least verification time so far.
+    e.g.,
+    ```
+    scheduler = VerificationScheduler(workers=8, policy="fair_share")
+    for solution in ZipSolutionIterator()("./myzip.zip"):
+        scheduler.submit(idb[solution["instance"]], solution, team="team_a")
+    for result in scheduler.run():
+        print(result["solution"]["instance"], result["error"])
+    ```
+    """
+
+    def __init__(
+        self,
+        workers: typing.Optional[int] = None,
+        policy: str = SHORTEST_FIRST,
+        cost_model: typing.Optional[CostModel] = None,
+        executor: typing.Optional[Executor] = None,
+        instance_store=None,
+    ):
+        """
+        :param workers: Number of worker processes and maximal number of jobs
+                        in flight. Defaults to the number of CPUs. Pass the
+                        number of workers of your `executor` if you use one.
+        :param policy: 'shortest_first' or 'fair_share'.
+        :param cost_model: Model to predict the runtimes. It is updated during
+                        `run`, so you can reuse it (or its `to_dict`) later.
+        :param executor: Use this executor instead of a new process pool.
+        :param instance_store: Optional `SharedInstanceStore`. If given, jobs
+                        are submitted with the name of the instance and the
+                        workers read the instances from the store.
+        """
+        if policy not in (SHORTEST_FIRST, FAIR_SHARE):
+            raise ValueError(f"Unknown policy '{policy}'.")
+        self.policy = policy
+        self.cost_model = cost_model if cost_model is not None else CostModel()
+        self._workers = workers if workers else (os.cpu_count() or 1)
+        self._executor = executor
+        self._instance_store = instance_store
+        self._queues = {}  # team -> heap of (predicted, job id, job)
+        self._consumed = {}  # team -> measured seconds
+        self._ids = itertools.count()
+        self._num_fits = self.cost_model.num_fits
+
+    def submit(
+        self,
+        instance: typing.Union[typing.Dict, str],
+        solution: typing.Dict,
+        team: typing.Optional[str] = None,
+        tag=None,
+    ) -> int:
+        """
+        Adds a job. It is only dispatched in `run`.
+        :param instance: The instance (dict or `PreparedInstance`), or its name if
+                    the scheduler uses an instance store. Its size is part of the
+                    predicted runtime.
+        :param solution: The solution as returned by `parse_solution`.
+        :param team: The submitting team (used by the 'fair_share' policy).
+        :param tag: Arbitrary data that is passed to the result.
+        :return: The id of the job.
+        """
+        if isinstance(instance, str):
+            if self._instance_store is None:
+                raise ValueError("Instance names need an instance store.")
+            features = extract_features(
+                None, solution, self._instance_store.instance_size(instance)
+            )
+        else:
+            features = extract_features(instance, solution)
+        job = {
+            "id": next(self._ids),
+            "instance": instance,
+            "solution": solution,
+            "team": team,
+            "tag": tag,
+            "features": features,
+            "predicted": self.cost_model.predict(features),
+        }
+        heapq.heappush(
+            self._queues.setdefault(team, []), (job["predicted"], job["id"], job)
+        )
+        self._consumed.setdefault(team, 0.0)
+        return job["id"]
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _rescore(self):
+        """
+        Predicts the pending jobs again after the cost model has been refitted.
+        """
+        for queue in self._queues.values():
+            for i, (_, job_id, job) in enumerate(queue):
+                job["predicted"] = self.cost_model.predict(job["features"])
+                queue[i] = (job["predicted"], job_id, job)
+            heapq.heapify(queue)
+        self._num_fits = self.cost_model.num_fits
+
+    def _pop_next(self) -> typing.Dict:
+        teams = [team for team, queue in self._queues.items() if queue]
+        if self.policy == SHORTEST_FIRST:
+            team = min(teams, key=lambda t: self._queues[t][0][:2])
+        else:
+            team = min(teams, key=lambda t: (self._consumed[t], self._queues[t][0][:2]))
+        return heapq.heappop(self._queues[team])[2]
+
+    def _dispatch(self, executor: Executor, job: typing.Dict):
+        store_path = None
+        if self._instance_store is not None:
+            store_path = self._instance_store.path
+        return executor.submit(
+            _timed_verify, job["instance"], job["solution"], store_path
+        )
+
+    def run(self) -> typing.Iterator[typing.Dict]:
+        """
+        Verifies all submitted jobs and yields the results in the order of
+        completion. Each result is a dict with the entries 'id', 'team', 'tag',
+        'solution', 'error' (empty if valid), 'seconds' and 'predicted'.
+        """
+        executor = self._executor or ProcessPoolExecutor(self._workers)
+        running = {}
+        try:
+            while len(self) or running:
+                if self.cost_model.num_fits != self._num_fits:
+                    self._rescore()
+                while len(self) and len(running) < self._workers:
+                    job = self._pop_next()
+                    running[self._dispatch(executor, job)] = job
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    error_msg, seconds = future.result()
+                    self.cost_model.observe(job["features"], seconds)
+                    self._consumed[job["team"]] += seconds
+                    yield {
+                        "id": job["id"],
+                        "team": job["team"],
+                        "tag": job["tag"],
+                        "solution": job["solution"],
+                        "error": error_msg,
+                        "seconds": seconds,
+                        "predicted": job["predicted"],
+                    }
+        finally:
+            for future in running:
+                future.cancel()
+            if self._executor is None:
+                executor.shutdown()
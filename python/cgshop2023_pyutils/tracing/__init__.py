@@ -0,0 +1,8 @@
+"""
+Optional instrumentation of the pipeline (zip reading, parsing, instance lookup,
+conversion, verification, caching). Activate a `Tracer` to collect the spans
+and counters; without one, the instrumentation does nothing.
+"""
+# flake8: noqa F401
+from .tracer import Tracer, span, count, enabled, enable, disable, use
+from .export import write_json_lines, prometheus_text
@@ -0,0 +1,44 @@
+"""
+Export of the collected spans and counters.
+"""
+import json
+import re
+import typing
+
+
+def write_json_lines(tracer, file: typing.TextIO):
+    for record in list(tracer.spans):
+        file.write(json.dumps({"type": "span", **record}, default=str) + "\n")
+    file.write(json.dumps({"type": "summary", **tracer.summary()}) + "\n")
+
+
+def _metric_name(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(tracer, prefix: str = "cgshop2023") -> str:
+    summary = tracer.summary()
+    lines = [
+        f"# HELP {prefix}_span_seconds Time spent in the stages of the pipeline.",
+        f"# TYPE {prefix}_span_seconds summary",
+    ]
+    for name, stats in sorted(summary["spans"].items()):
+        label = f'{{span="{_escape_label(name)}"}}'
+        lines.append(f"{prefix}_span_seconds_count{label} {stats['count']}")
+        lines.append(f"{prefix}_span_seconds_sum{label} {stats['total_seconds']!r}")
+    lines.append(f"# TYPE {prefix}_span_errors_total counter")
+    for name, stats in sorted(summary["spans"].items()):
+        label = f'{{span="{_escape_label(name)}"}}'
+        lines.append(f"{prefix}_span_errors_total{label} {stats['errors']}")
+    for name, value in sorted(summary["counters"].items()):
+        metric = f"{prefix}_{_metric_name(name)}_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value}")
+    if summary["cache_hit_rate"] is not None:
+        lines.append(f"# TYPE {prefix}_cache_hit_ratio gauge")
+        lines.append(f"{prefix}_cache_hit_ratio {summary['cache_hit_rate']!r}")
+    return "\n".join(lines) + "\n"
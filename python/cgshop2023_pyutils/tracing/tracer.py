@@ -0,0 +1,209 @@
+"""
+A lightweight instrumentation layer. The pipeline reports spans (named, timed
+sections) and counters to the active `Tracer`. Without an active tracer, the
+calls only check a global and return, so the instrumentation costs nearly
+nothing when it is disabled.
+"""
+import collections
+import contextlib
+import threading
+import time
+import typing
+
+_active = None  # the active Tracer or None
+
+
+class Tracer:
+    """
+    Collects spans and counters. Aggregated statistics are kept for all spans,
+    the individual spans only for the most recent `keep_spans`.
+    e.g.,
+    ```
+    tracer = Tracer()
+    with tracing.use(tracer):
+        for solution in ZipSolutionIterator()("./myzip.zip"):
+            verify(idb[solution["instance"]], solution)
+    print(tracer.prometheus_text())
+    ```
+    """
+
+    def __init__(
+        self,
+        keep_spans: int = 10_000,
+        callbacks: typing.Iterable[typing.Callable[[typing.Dict], None]] = (),
+    ):
+        """
+        :param keep_spans: Number of recent spans that are kept for the export.
+        :param callbacks: Functions that are called with every finished span.
+        """
+        self._lock = threading.Lock()
+        self.spans = collections.deque(maxlen=keep_spans)
+        self.span_stats = {}  # name -> [count, total seconds, max seconds, errors]
+        self.counters = collections.Counter()
+        self._callbacks = list(callbacks)
+
+    def add_callback(self, callback: typing.Callable[[typing.Dict], None]):
+        self._callbacks.append(callback)
+
+    def record_span(
+        self, name: str, start: float, duration: float, attributes: typing.Dict
+    ):
+        record = {
+            "name": name,
+            "start": start,
+            "duration": duration,
+            "attributes": attributes,
+        }
+        with self._lock:
+            self.spans.append(record)
+            stats = self.span_stats.setdefault(name, [0, 0.0, 0.0, 0])
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] = max(stats[2], duration)
+            if attributes.get("error"):
+                stats[3] += 1
+        for callback in self._callbacks:
+            callback(record)
+
+    def count(self, name: str, value: float = 1):
+        with self._lock:
+            self.counters[name] += value
+
+    def summary(self) -> typing.Dict:
+        """
+        Aggregated statistics of spans and counters, and the cache hit rate.
+        """
+        with self._lock:
+            spans = {
+                name: {
+                    "count": count,
+                    "total_seconds": total,
+                    "max_seconds": max_duration,
+                    "errors": errors,
+                }
+                for name, (
+                    count,
+                    total,
+                    max_duration,
+                    errors,
+                ) in self.span_stats.items()
+            }
+            counters = dict(self.counters)
+        lookups = counters.get("cache.hits", 0) + counters.get("cache.misses", 0)
+        return {
+            "spans": spans,
+            "counters": counters,
+            "cache_hit_rate": (
+                counters.get("cache.hits", 0) / lookups if lookups else None
+            ),
+        }
+
+    def write_json_lines(self, file: typing.TextIO):
+        """
+        Writes the kept spans as json lines, followed by a line with the summary.
+        """
+        from .export import write_json_lines
+
+        write_json_lines(self, file)
+
+    def prometheus_text(self, prefix: str = "cgshop2023") -> str:
+        """
+        The aggregated statistics in the Prometheus text exposition format.
+        """
+        from .export import prometheus_text
+
+        return prometheus_text(self, prefix)
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_attributes", "_start")
+
+    def __init__(self, tracer: Tracer, name: str, attributes: typing.Dict):
+        self._tracer = tracer
+        self._name = name
+        self._attributes = attributes
+
+    def set(self, **attributes):
+        """
+        Adds attributes to the span, e.g., sizes that are only known inside.
+        """
+        self._attributes.update(attributes)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        duration = time.perf_counter() - self._start
+        if exc_type is not None:
+            self._attributes["error"] = exc_type.__name__
+        self._tracer.record_span(self._name, self._start, duration, self._attributes)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str, **attributes):
+    """
+    Context manager that records the time of a section as span of the active
+    tracer. Does nothing if tracing is disabled.
+    """
+    tracer = _active
+    if tracer is None:
+        return _NO_SPAN
+    return _Span(tracer, name, attributes)
+
+
+def count(name: str, value: float = 1):
+    """
+    Increases a counter of the active tracer. Does nothing if tracing is disabled.
+    """
+    tracer = _active
+    if tracer is not None:
+        tracer.count(name, value)
+
+
+def enabled() -> bool:
+    return _active is not None
+
+
+def enable(tracer: Tracer) -> typing.Optional[Tracer]:
+    """
+    Activates a tracer for the whole process. Returns the previously active one.
+    """
+    global _active
+    previous, _active = _active, tracer
+    return previous
+
+
+def disable() -> typing.Optional[Tracer]:
+    """
+    Deactivates tracing. Returns the previously active tracer.
+    """
+    return enable(None)
+
+
+@contextlib.contextmanager
+def use(tracer: Tracer):
+    """
+    Activates a tracer within a with-block.
+    """
+    previous = enable(tracer)
+    try:
+        yield tracer
+    finally:
+        enable(previous)
@@ -5,39 +5,201 @@ with exact data types and wrapping the C++-code.
 """
 # flake8: noqa F401
 import typing
+from concurrent.futures import ProcessPoolExecutor
 
 from ..core import (
+    CancellationToken,
+    VerificationCancelled,
     NativeInstance,
     NativeSolution,
+    PolygonWithHoles,
     verify as verify_,
+    verify_reduced as _verify_reduced,
+    coverage_defects as _coverage_defects,
     verify_instance as _verify_instance,
+    instance_diagnostics as _instance_diagnostics,
 )
 
-from ._convert_to_native_format import _to_polygon, _to_polygon_with_holes
+from ._convert_to_native_format import (
+    _to_polygon,
+    _to_polygon_with_holes,
+    PointInterner,
+)
+from .verification_cache import VerificationCache, instance_key, solution_key
+from .prepared_instance import PreparedInstance
+from ..tracing import span, count
 
 
-def verify(instance: typing.Dict, solution: typing.Dict):
+def verify(
+    instance: typing.Union[typing.Dict, PreparedInstance],
+    solution: typing.Dict,
+    cache: typing.Optional[VerificationCache] = None,
+    reduce: bool = False,
+    compact: bool = False,
+    cancellation: typing.Optional[CancellationToken] = None,
+    statistics: typing.Optional[typing.Dict] = None,
+):
     """
     Verify a solution for an instance. This function uses C++ code, CGAL, and exact arithmetics
     to obtain exact results within a few seconds.
-    :param instance: The data of the instance as parsed from the json.
+    :param instance: The data of the instance as parsed from the json. If you verify
+            many solutions for the same instance, pass a `PreparedInstance` instead.
     :param solution: The data of the solution as parsed from the json. Use our parser
             to verify the correctness of the format.
+    :param cache: An optional cache of previous results. If the solution has already
+            been verified for this instance, the cached result is returned directly.
+            The cache keeps the key of an instance dict, so do not modify the
+            instance in place between calls.
+    :param reduce: Remove duplicate polygons and polygons contained in another
+            polygon before computing the union. This does not change the result,
+            but can save a lot of time for solutions with many redundant polygons.
+    :param compact: Compute the exact values of the inputs and of the union right
+            away. This needs less memory for large solutions, as the construction
+            history of the numbers is not kept.
+    :param cancellation: A `CancellationToken` that can be cancelled from another
+            thread. The native verifier then raises `VerificationCancelled`.
+    :param statistics: An optional dictionary that is filled with `cached`
+            (whether the result came from the cache) and, if the solution was
+            verified with `reduce`, the number of `removed_polygons`.
+            e.g.,
+            ```
+            statistics = {}
+            err_msg = verify(instance, solution, reduce=True, statistics=statistics)
+            print(statistics["removed_polygons"], "redundant polygons")
+            ```
     :return: An empty string if the solution is valid. Otherwise, an error message.
     """
-    instance_poly = _to_polygon_with_holes(
-        instance["outer_boundary"], instance["holes"]
-    )
-    n_instance = NativeInstance(instance_poly)
-    solution_polys = [_to_polygon(poly) for poly in solution["polygons"]]
+    if statistics is not None:
+        statistics["cached"] = False
+    if cache is None:
+        return _verify(instance, solution, reduce, compact, cancellation, statistics)
+    options = {"reduce": reduce, "compact": compact}
+    if isinstance(instance, PreparedInstance):
+        key = solution_key(instance.key, solution, options)
+    else:
+        key = solution_key(cache.instance_key(instance), solution, options)
+    error_msg = cache.get(key)
+    if error_msg is None:
+        error_msg = _verify(
+            instance, solution, reduce, compact, cancellation, statistics
+        )
+        cache.put(key, error_msg)
+    elif statistics is not None:
+        statistics["cached"] = True
+    return error_msg
+
 
-    n_solution = NativeSolution(solution_polys)
-    if not all(float(p.area()) > 0 for p in solution_polys):
-        return "Solution contains polygons of zero size."
-    error_msg = verify_(n_instance, n_solution)
+def _verify(
+    instance: typing.Union[typing.Dict, PreparedInstance],
+    solution: typing.Dict,
+    reduce: bool = False,
+    compact: bool = False,
+    cancellation: typing.Optional[CancellationToken] = None,
+    statistics: typing.Optional[typing.Dict] = None,
+):
+    with span("verify.convert"):
+        if not isinstance(instance, PreparedInstance):
+            instance = PreparedInstance(instance)
+        n_instance = instance.native
+        interner = PointInterner()
+        solution_polys = [_to_polygon(poly, interner) for poly in solution["polygons"]]
+        n_solution = NativeSolution(solution_polys)
+    count("verify.vertices", interner.occurrences)
+    count("verify.distinct_vertices", interner.distinct)
+    with span("verify.native", polygons=len(solution_polys)) as native_span:
+        if reduce:
+            error_msg, removed = _verify_reduced(
+                n_instance, n_solution, compact=compact, cancellation=cancellation
+            )
+            native_span.set(removed_polygons=removed)
+            if statistics is not None:
+                statistics["removed_polygons"] = removed
+        else:
+            error_msg = verify_(
+                n_instance, n_solution, compact=compact, cancellation=cancellation
+            )
+        native_span.set(valid=not error_msg)
     return error_msg
 
 
+def to_native_solution(solution: typing.Dict) -> NativeSolution:
+    """
+    Converts a solution to the native format. The native solution keeps the
+    union of its polygons once it has been computed, so pass it to several of
+    the functions below to compute the union only once.
+    """
+    return NativeSolution([_to_polygon(poly) for poly in solution["polygons"]])
+
+
+def _to_native(
+    instance: typing.Union[typing.Dict, PreparedInstance],
+    solution: typing.Union[typing.Dict, NativeSolution],
+):
+    if not isinstance(instance, PreparedInstance):
+        instance = PreparedInstance(instance)
+    if not isinstance(solution, NativeSolution):
+        solution = to_native_solution(solution)
+    return instance.native, solution
+
+
+def coverage_defects(
+    instance: typing.Union[typing.Dict, PreparedInstance],
+    solution: typing.Union[typing.Dict, NativeSolution],
+) -> typing.Dict:
+    """
+    Finds all defects of the coverage at once, e.g., for repairing a solution.
+    In contrast to `verify`, which only reports the first uncovered region, the
+    union is computed once and all regions are returned as native
+    `PolygonWithHoles` (use `.area()` for the exact area of a region).
+    e.g.,
+    ```
+    defects = coverage_defects(instance, solution)
+    for region in defects["uncovered"]:
+        print(float(region.area()), region.outer_boundary().boundary())
+    ```
+    :param instance: The data of the instance as parsed from the json or a
+            `PreparedInstance`.
+    :param solution: The data of the solution as parsed from the json, or its
+            `to_native_solution`. The polygons have to be simple and
+            counterclockwise.
+    :return: A dictionary with the lists of `uncovered` regions of the instance
+            and of `excess` regions outside of the instance, and their exact
+            total areas `uncovered_area` and `excess_area`.
+    """
+    n_instance, n_solution = _to_native(instance, solution)
+    return _coverage_defects(n_instance, n_solution)
+
+
+def uncovered_regions(
+    instance: typing.Union[typing.Dict, PreparedInstance],
+    solution: typing.Union[typing.Dict, NativeSolution],
+) -> typing.List[PolygonWithHoles]:
+    """
+    All regions of the instance that are not covered by the solution. Use
+    `coverage_defects` if you also need the excess regions, or pass the same
+    `to_native_solution` to both functions to compute the union only once.
+    e.g.,
+    ```
+    native = to_native_solution(solution)
+    gaps = uncovered_regions(instance, native)
+    outside = excess_regions(instance, native)  # reuses the union
+    ```
+    """
+    return coverage_defects(instance, solution)["uncovered"]
+
+
+def excess_regions(
+    instance: typing.Union[typing.Dict, PreparedInstance],
+    solution: typing.Union[typing.Dict, NativeSolution],
+) -> typing.List[PolygonWithHoles]:
+    """
+    All regions covered by the solution that lie outside of the instance. Use
+    `coverage_defects` if you also need the uncovered regions, see
+    `uncovered_regions`.
+    """
+    return coverage_defects(instance, solution)["excess"]
+
+
 def verify_instance(instance: typing.Dict):
     """
     Verify an instance to be valid.
@@ -49,3 +211,71 @@ def verify_instance(instance: typing.Dict):
     )
     n_instance = NativeInstance(instance_poly)
     return _verify_instance(n_instance)
+
+
+def instance_diagnostics(instance: typing.Dict) -> typing.List[str]:
+    """
+    Verify an instance to be valid and explain the problems if it is not.
+    :param instance: The data of the instance as parsed from the json.
+    :return: An empty list if the instance is valid, otherwise a list of messages.
+    """
+    try:
+        instance_poly = _to_polygon_with_holes(
+            instance["outer_boundary"], instance["holes"]
+        )
+    except ValueError as e:
+        return [str(e)]
+    n_instance = NativeInstance(instance_poly)
+    return _instance_diagnostics(n_instance)
+
+
+def validate_instances(
+    instances: typing.Iterable[typing.Dict],
+    workers: typing.Optional[int] = None,
+    cache: typing.Optional[VerificationCache] = None,
+) -> typing.Iterator[typing.Dict]:
+    """
+    Validate many instances in parallel, using multiple processes.
+    :param instances: The instances as parsed from the json.
+    :param workers: Number of processes. Defaults to the number of CPUs. With a
+            single worker, everything is done in the current process.
+    :param cache: Optional cache for the verdicts. The verdicts are stored by the
+            hash of the instance geometry, so unchanged instances are not validated
+            again.
+    :return: A dictionary with the `name`, the verdict `valid`, the `diagnostics`,
+            and if the result was `cached` for every instance (in the given order).
+    """
+    results = []
+    jobs = []
+    for instance in instances:
+        result = {"name": instance["name"], "valid": None, "diagnostics": []}
+        results.append(result)
+        try:
+            key = "instance:" + instance_key(instance)
+        except ValueError as e:
+            result["diagnostics"], result["cached"] = [str(e)], False
+            continue
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            result["diagnostics"] = cached.split("\n") if cached else []
+        else:
+            jobs.append((result, key, instance))
+        result["cached"] = cached is not None
+    job_instances = [instance for _, _, instance in jobs]
+    if workers == 1 or len(jobs) <= 1:
+        diagnostics = map(instance_diagnostics, job_instances)
+        _store_diagnostics(jobs, diagnostics, cache)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            diagnostics = executor.map(instance_diagnostics, job_instances)
+            _store_diagnostics(jobs, diagnostics, cache)
+    for result in results:
+        result["valid"] = not result["diagnostics"]
+        yield result
+
+
+def _store_diagnostics(jobs, diagnostics, cache):
+    for (result, key, _), messages in zip(jobs, diagnostics):
+        result["diagnostics"] = list(messages)
+        if cache is not None:
+            cache.put(key, "\n".join(result["diagnostics"]))
@@ -1,4 +1,6 @@
 """lossless conversion to native format"""
+import typing
+
 from ..core import (
     FieldNumber,
     Point,
@@ -54,8 +56,69 @@ def _to_coordinate(point_data):
     return Point(x, y)
 
 
-def _to_polygon(points_data):
-    return Polygon([_to_coordinate(p) for p in points_data])
+def _raw_key(number_data):
+    # hashable and type-aware, such that e.g. 1 and "1" are not mixed up.
+    if isinstance(number_data, dict):
+        return (
+            dict,
+            _raw_key(number_data.get("num")),
+            _raw_key(number_data.get("den", 1)),
+        )
+    return (type(number_data), number_data)
+
+
+class PointInterner:
+    """
+    Converts points and returns the same native point for identical coordinates.
+    Neighbouring polygons of a cover share most of their vertices, so this saves
+    the construction of the exact numbers. The native points are reference
+    counted handles, so the shared points also share their memory in C++.
+    e.g.,
+    ```
+    interner = PointInterner()
+    polygons = [_to_polygon(poly, interner) for poly in solution["polygons"]]
+    print(interner.dedup_ratio)
+    ```
+    """
+
+    def __init__(self):
+        self._points = {}
+        self.occurrences = 0
+
+    def __call__(self, point_data) -> Point:
+        if "x" not in point_data or "y" not in point_data:
+            raise ValueError(f"Cannot parse point data '{point_data}'")
+        self.occurrences += 1
+        try:
+            key = (_raw_key(point_data["x"]), _raw_key(point_data["y"]))
+            point = self._points.get(key)
+        except TypeError:  # unhashable, e.g., a list. The conversion will fail.
+            return _to_coordinate(point_data)
+        if point is None:
+            point = _to_coordinate(point_data)
+            self._points[key] = point
+        return point
+
+    @property
+    def distinct(self) -> int:
+        """
+        Number of distinct points.
+        """
+        return len(self._points)
+
+    @property
+    def dedup_ratio(self) -> float:
+        """
+        Number of converted points per distinct point (1.0 without any sharing).
+        """
+        if not self._points:
+            return 1.0
+        return self.occurrences / len(self._points)
+
+
+def _to_polygon(points_data, interner: typing.Optional[PointInterner] = None):
+    to_point = interner if interner is not None else _to_coordinate
+    return Polygon([to_point(p) for p in points_data])
 
 
 def _to_polygon_with_holes(boundary, holes):
@@ -0,0 +1,94 @@
+"""
+An instance that has already been converted to the native format. Use it if many
+solutions are verified for the same instance, as the conversion and all
+instance-only computations are done only once.
+"""
+import typing
+
+from ..core import NativeInstance
+from ._convert_to_native_format import _to_polygon_with_holes
+from .verification_cache import instance_key
+
+
+class PreparedInstance:
+    """
+    Holds the native instance with precomputed data (exact area, bounding box).
+    e.g.,
+    ```
+    instance = PreparedInstance(idb["instance_name"])
+    for solution in solutions:
+        err_msg = verify(instance, solution)
+    ```
+    """
+
+    def __init__(self, instance: typing.Dict):
+        """
+        Converts the instance to the native format.
+        :param instance: The data of the instance as parsed from the json.
+        """
+        instance_poly = _to_polygon_with_holes(
+            instance["outer_boundary"], instance["holes"]
+        )
+        self.name = instance.get("name")
+        self.native = NativeInstance(instance_poly)
+        self._instance = instance
+        self._key = None
+        self._size = None
+
+    @classmethod
+    def from_native(
+        cls,
+        native: NativeInstance,
+        name: typing.Optional[str] = None,
+        key: typing.Optional[str] = None,
+        size: typing.Optional[typing.Tuple[int, int]] = None,
+    ) -> "PreparedInstance":
+        """
+        Wraps an already converted instance, e.g., one decoded via `from_bytes`.
+        :param native: The native instance.
+        :param name: Name of the instance.
+        :param key: The `instance_key` of the instance. Needed for caching.
+        :param size: The `instance_size`, if known.
+        """
+        prepared = cls.__new__(cls)
+        prepared.name = name
+        prepared.native = native
+        prepared._instance = None
+        prepared._key = key
+        prepared._size = tuple(size) if size is not None else None
+        return prepared
+
+    @property
+    def key(self) -> str:
+        """
+        Hash of the instance geometry, as used by the `VerificationCache`.
+        """
+        if self._key is None:
+            if self._instance is None:
+                raise ValueError("The key of the instance is unknown.")
+            self._key = instance_key(self._instance)
+        return self._key
+
+    def area(self) -> float:
+        return float(self.native.area())
+
+    def bbox(self) -> typing.Tuple[float, float, float, float]:
+        """
+        Returns (xmin, ymin, xmax, ymax) of the instance.
+        """
+        return self.native.bbox()
+
+    def instance_size(self) -> typing.Tuple[int, int]:
+        """
+        Returns the number of vertices (including holes) and the number of holes.
+        """
+        if self._size is None:
+            if self._instance is not None:
+                holes = self._instance["holes"]
+                outer = self._instance["outer_boundary"]
+            else:
+                polygon = self.native.polygon()
+                holes = [hole.boundary() for hole in polygon.holes()]
+                outer = polygon.outer_boundary().boundary()
+            self._size = (len(outer) + sum(len(h) for h in holes), len(holes))
+        return self._size
@@ -0,0 +1,202 @@
+"""
+A persistent cache for verification results. Solutions are often uploaded multiple
+times, e.g., as part of a new zip that only contains a few changed solutions.
+Verifying them again with CGAL is expensive, so we store the verdict keyed by a
+canonical hash of the instance geometry and the solution polygons.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import typing
+from collections import OrderedDict
+
+from ..io.binary import to_fraction
+from ..tracing import count
+
+# Number of instance dicts whose `instance_key` is kept by a cache.
+_MAX_INSTANCE_KEYS = 16
+
+
+def _canonical_number(number_data) -> str:
+    """
+    Converts any number representation that is supported by the native conversion
+    (int, float, decimal string, rational string, {"num": .., "den": ..}) into a
+    canonical string of a reduced fraction. Different representations of the same
+    number result in the same string.
+    """
+    return str(to_fraction(number_data))
+
+
+def _canonical_points(points_data) -> typing.List[typing.List[str]]:
+    return [[_canonical_number(p["x"]), _canonical_number(p["y"])] for p in points_data]
+
+
+def instance_key(instance: typing.Dict) -> str:
+    """
+    Computes a hash of the instance geometry that does not depend on the encoding
+    of the numbers or on any meta data (like the name) of the instance.
+    :param instance: The data of the instance as parsed from the json.
+    :return: Hex digest of the geometry.
+    """
+    data = {
+        "outer_boundary": _canonical_points(instance["outer_boundary"]),
+        "holes": [_canonical_points(hole) for hole in instance["holes"]],
+    }
+    encoded = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def solution_key(
+    instance: typing.Union[typing.Dict, str],
+    solution: typing.Dict,
+    options: typing.Optional[typing.Dict] = None,
+) -> str:
+    """
+    Computes a hash of the instance geometry and the solution polygons. The order
+    of the polygons and their vertices is kept, as the error messages refer to them.
+    :param instance: The data of the instance as parsed from the json, or its
+            precomputed `instance_key`.
+    :param solution: The data of the solution as parsed from the json.
+    :param options: The options of the verification (e.g., `reduce`), as they
+            can change the message or the reported statistics.
+    :return: Hex digest of instance, solution and options.
+    """
+    if not isinstance(instance, str):
+        instance = instance_key(instance)
+    data = {
+        "instance": instance,
+        "polygons": [_canonical_points(poly) for poly in solution["polygons"]],
+        "options": options if options else {},
+    }
+    encoded = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class VerificationCache:
+    """
+    Persistent cache of verification results, stored in an SQLite database.
+    The cache holds at most `max_entries` results and evicts the least recently
+    used entries if this limit is exceeded. It can be shared by multiple threads.
+    e.g.,
+    ```
+    cache = VerificationCache("./verification_cache.sqlite")
+    for solution in ZipSolutionIterator()("./myzip.zip"):
+        msg = verify(idb[solution["instance"]], solution, cache=cache)
+    ```
+    """
+
+    def __init__(self, path: str = ":memory:", max_entries: int = 1_000_000):
+        """
+        Open (or create) a cache.
+        :param path: Path to the SQLite file. Use ':memory:' for a non-persistent cache.
+        :param max_entries: Maximal number of cached results before old results are
+                        evicted.
+        """
+        if max_entries <= 0:
+            raise ValueError("The cache needs to allow at least one entry.")
+        self._path = path
+        self._max_entries = max_entries
+        # The connection is used by all threads, serialized by the lock.
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=60.0, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY,"
+                " message TEXT NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_last_access ON results(last_access)"
+            )
+        self.hits = 0
+        self.misses = 0
+        # id -> (instance, key) of recently used instances. The instance is kept
+        # alive, such that its id is not reused by another object.
+        self._instance_keys = OrderedDict()
+
+    def instance_key(self, instance: typing.Dict) -> str:
+        """
+        The `instance_key` of an instance as parsed from the json. The keys of the
+        recently used instance objects are kept, such that verifying many
+        solutions for the same instance (and especially cache hits) does not
+        convert all vertices of the instance again. Do not modify an instance in
+        place after using it with the cache.
+        """
+        with self._lock:
+            entry = self._instance_keys.get(id(instance))
+            if entry is not None and entry[0] is instance:
+                self._instance_keys.move_to_end(id(instance))
+                return entry[1]
+        key = instance_key(instance)
+        with self._lock:
+            self._instance_keys[id(instance)] = (instance, key)
+            self._instance_keys.move_to_end(id(instance))
+            while len(self._instance_keys) > _MAX_INSTANCE_KEYS:
+                self._instance_keys.popitem(last=False)
+        return key
+
+    def get(self, key: str) -> typing.Optional[str]:
+        """
+        Returns the cached message for a key or None if it is not in the cache.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT message FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                count("cache.misses")
+                return None
+            self.hits += 1
+            count("cache.hits")
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE results SET last_access = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+            return row[0]
+
+    def put(self, key: str, message: str):
+        """
+        Stores a message for a key and evicts old entries if the cache is full.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results(key, message, last_access) VALUES (?, ?, ?)",
+                (key, message, time.time()),
+            )
+            self._evict()
+
+    def _evict(self):
+        (size,) = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()
+        if size <= self._max_entries:
+            return
+        self._connection.execute(
+            "DELETE FROM results WHERE key IN ("
+            " SELECT key FROM results ORDER BY last_access ASC LIMIT ?)",
+            (size - self._max_entries,),
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            (size,) = self._connection.execute(
+                "SELECT COUNT(*) FROM results"
+            ).fetchone()
+        return size
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM results")
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
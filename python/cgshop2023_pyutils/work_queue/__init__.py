@@ -0,0 +1,8 @@
+"""
+Verification on many machines: a `Coordinator` splits the submissions into jobs
+of a `WorkQueue` in a shared folder, and any number of `Worker`s claim them.
+"""
+# flake8: noqa F401
+from .work_queue import WorkQueue
+from .coordinator import Coordinator
+from .worker import Worker
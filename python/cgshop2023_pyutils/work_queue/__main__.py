@@ -0,0 +1,111 @@
+"""
+Command line interface of the work queue.
+e.g.,
+```
+python3 -m cgshop2023_pyutils.work_queue submit ./queue ./uploads/team_a.zip
+python3 -m cgshop2023_pyutils.work_queue worker ./queue ./instances.zip
+python3 -m cgshop2023_pyutils.work_queue status ./queue
+```
+"""
+import argparse
+import json
+import logging
+import sys
+
+from .work_queue import WorkQueue
+
+
+def _submit(args):
+    from .coordinator import Coordinator
+
+    with Coordinator(args.queue) as coordinator:
+        for path in args.zips:
+            submission = coordinator.submit(path)
+            print(json.dumps({"id": submission, "path": path}))
+    return 0
+
+
+def _worker(args):
+    from .worker import Worker
+
+    cache = None
+    if args.cache:
+        from ..verifier import VerificationCache
+
+        cache = VerificationCache(args.cache)
+    with Worker(
+        args.queue,
+        args.instances,
+        worker_id=args.id,
+        lease_seconds=args.lease,
+        max_attempts=args.attempts,
+        cache=cache,
+    ) as worker:
+        worker.run(max_jobs=args.max_jobs, exit_when_empty=not args.wait)
+    return 0
+
+
+def _status(args):
+    with WorkQueue(args.queue) as queue:
+        submissions = args.submission if args.submission else queue.submissions()
+        for submission in submissions:
+            results = queue.submission_results(submission)
+            if not args.details:
+                del results["results"]
+            print(json.dumps(results))
+        if args.workers:
+            for worker in queue.workers():
+                print(json.dumps(worker))
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Verify submissions with workers on many machines."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    submit = commands.add_parser("submit", help="Add zips to the queue.")
+    submit.add_argument("queue", help="Folder of the queue.")
+    submit.add_argument("zips", nargs="+", help="Zips with the solutions.")
+    submit.set_defaults(run=_submit)
+
+    worker = commands.add_parser("worker", help="Verify the jobs of the queue.")
+    worker.add_argument("queue", help="Folder of the queue.")
+    worker.add_argument("instances", help="Folder or zipfile with the instances.")
+    worker.add_argument("--id", default=None, help="Unique name of the worker.")
+    worker.add_argument(
+        "--lease", type=float, default=300.0, help="Lease duration in seconds."
+    )
+    worker.add_argument(
+        "--attempts", type=int, default=3, help="Attempts before a job fails."
+    )
+    worker.add_argument(
+        "--max-jobs", type=int, default=None, help="Stop after this many jobs."
+    )
+    worker.add_argument(
+        "--wait", action="store_true", help="Wait for new jobs instead of exiting."
+    )
+    worker.add_argument(
+        "--cache", default=None, help="SQLite file for caching the verdicts."
+    )
+    worker.set_defaults(run=_worker)
+
+    status = commands.add_parser("status", help="Print the aggregated results.")
+    status.add_argument("queue", help="Folder of the queue.")
+    status.add_argument(
+        "submission", type=int, nargs="*", help="Ids of the submissions."
+    )
+    status.add_argument(
+        "--details", action="store_true", help="Include the results of all jobs."
+    )
+    status.add_argument("--workers", action="store_true", help="List the workers.")
+    status.set_defaults(run=_status)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Splits submissions into jobs of a `WorkQueue` and aggregates their results.
+"""
+import itertools
+import os
+import time
+import typing
+
+from ..zip import ZipSolutionIterator, ZipReaderError
+from .work_queue import WorkQueue
+
+
+class Coordinator:
+    """
+    Adds zips to the queue, one job per solution file. The verification is done
+    by `Worker`s, possibly on other machines.
+    e.g.,
+    ```
+    coordinator = Coordinator("./queue")
+    submission = coordinator.submit("./uploads/team_a.zip")
+    # start workers: python3 -m cgshop2023_pyutils.work_queue worker ./queue ./instances
+    print(coordinator.wait(submission))
+    ```
+    """
+
+    def __init__(
+        self,
+        folder: str,
+        zip_iterator: typing.Optional[ZipSolutionIterator] = None,
+        batch_size: int = 100,
+        **queue_args,
+    ):
+        """
+        :param folder: The folder of the queue.
+        :param zip_iterator: Iterator to read the zips, e.g., with other limits.
+        :param batch_size: Number of jobs added per transaction. Smaller batches
+                    let the workers start earlier on large zips.
+        :param queue_args: Further arguments for the `WorkQueue`.
+        """
+        self.queue = WorkQueue(folder, **queue_args)
+        self._zip_iterator = zip_iterator if zip_iterator else ZipSolutionIterator()
+        self._batch_size = batch_size
+
+    def submit(self, path: str, name: typing.Optional[str] = None) -> int:
+        """
+        Reads the zip and adds a job for each of its solutions. If the zip is
+        invalid, the submission is stored with the error instead. Workers may
+        start on the first jobs while the rest of the zip is read; the
+        submission is not done before all jobs have been added.
+        :param path: Path of the zip. The workers do not need access to it.
+        :param name: Name of the submission. Defaults to the file name.
+        :return: The id of the submission.
+        """
+        name = name if name else os.path.basename(path)
+        submission = self.queue.add_submission(name, path)
+        solutions = iter(self._zip_iterator(path))
+        try:
+            while True:
+                batch = list(itertools.islice(solutions, self._batch_size))
+                if not batch:
+                    break
+                self.queue.add_jobs(submission, batch)
+        except ZipReaderError as e:
+            self.queue.fail_submission(submission, str(e))
+            return submission
+        except BaseException as e:
+            self.queue.fail_submission(submission, f"Could not add the jobs: {e}")
+            raise
+        self.queue.finish_submission(submission)
+        return submission
+
+    def results(self, submission: int) -> typing.Dict:
+        """
+        The aggregated results of a submission, see `WorkQueue.submission_results`.
+        """
+        return self.queue.submission_results(submission)
+
+    def wait(
+        self,
+        submission: int,
+        poll_interval: float = 1.0,
+        timeout: typing.Optional[float] = None,
+    ) -> typing.Dict:
+        """
+        Waits until all jobs of the submission are finished.
+        :raises TimeoutError: If the jobs are not finished within the timeout.
+        :return: The aggregated results.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            results = self.results(submission)
+            if results["state"] == "done":
+                return results
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Submission {submission} is not finished.")
+            time.sleep(poll_interval)
+
+    def close(self):
+        self.queue.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,373 @@
+"""
+A work queue in an SQLite file, such that coordinator and workers on different
+machines only need a shared folder. Every job is the verification of a single
+solution file of a submission. Workers lease jobs for a limited time and have to
+renew the lease with heartbeats, so the jobs of crashed workers are retried.
+"""
+import json
+import os
+import socket
+import sqlite3
+import time
+import typing
+import zlib
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    created REAL NOT NULL,
+    error TEXT,
+    complete INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    submission INTEGER NOT NULL REFERENCES submissions(id),
+    instance TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    solution BLOB NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    error TEXT,
+    seconds REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs(state, lease_expires);
+CREATE INDEX IF NOT EXISTS jobs_submission ON jobs(submission);
+CREATE TABLE IF NOT EXISTS workers (
+    id TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    started REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    jobs_done INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    The queue in `QUEUE_FOLDER/queue.sqlite`. Every process (and thread) has to
+    open its own `WorkQueue`, as the connection cannot be shared.
+    Note that SQLite relies on the file locks of the shared filesystem. These
+    work with NFSv4 and most cluster filesystems, but not with all of them.
+    e.g.,
+    ```
+    queue = WorkQueue("./queue")
+    submission = queue.add_submission("team_a.zip", "./uploads/team_a.zip")
+    queue.add_jobs(submission, solutions)
+    queue.finish_submission(submission)
+    ...
+    print(queue.submission_results(submission))
+    ```
+    """
+
+    def __init__(
+        self, folder: str, lease_seconds: float = 300.0, max_attempts: int = 3
+    ):
+        """
+        :param folder: The (shared) folder of the queue. It is created if necessary.
+        :param lease_seconds: Time after which a job of a worker without heartbeat
+                        can be claimed by another worker.
+        :param max_attempts: A job is marked as failed if it could not be finished
+                        within this number of attempts, e.g., because it crashes
+                        the workers.
+        """
+        if max_attempts < 1:
+            raise ValueError("Jobs need at least one attempt.")
+        os.makedirs(folder, exist_ok=True)
+        self.folder = folder
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._connection = sqlite3.connect(
+            os.path.join(folder, "queue.sqlite"), timeout=60.0, isolation_level=None
+        )
+        self._connection.executescript(_SCHEMA)
+
+    def _transaction(self):
+        return _Transaction(self._connection)
+
+    def add_submission(
+        self, name: str, path: str, error: typing.Optional[str] = None
+    ) -> int:
+        """
+        Adds a submission, whose jobs are added by `add_jobs`. Returns its id.
+        The submission is not done before `finish_submission` (or
+        `fail_submission`) is called, even if all jobs added so far are done.
+        If the submission could not be split into jobs (e.g., a broken zip),
+        pass the error and do not add any jobs.
+        """
+        with self._transaction():
+            cursor = self._connection.execute(
+                "INSERT INTO submissions(name, path, created, error, complete)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (name, path, time.time(), error, int(error is not None)),
+            )
+        return cursor.lastrowid
+
+    def add_jobs(self, submission: int, solutions: typing.Iterable[typing.Dict]):
+        """
+        Adds a job for every solution. The solutions are stored compressed in the
+        queue, such that the workers do not need to read the zip again.
+        """
+        rows = (
+            (
+                submission,
+                solution["instance"],
+                solution.get("meta", {}).get("zip_info", {}).get("file_in_zip", ""),
+                zlib.compress(json.dumps(solution).encode("utf-8")),
+                PENDING,
+            )
+            for solution in solutions
+        )
+        with self._transaction():
+            self._connection.executemany(
+                "INSERT INTO jobs(submission, instance, file_name, solution, state)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def finish_submission(self, submission: int):
+        """
+        Marks that all jobs of the submission have been added.
+        """
+        with self._transaction():
+            self._connection.execute(
+                "UPDATE submissions SET complete = 1 WHERE id = ?", (submission,)
+            )
+
+    def fail_submission(self, submission: int, error: str):
+        """
+        Marks a submission as invalid and cancels its open jobs. Workers that
+        hold the lease of a cancelled job lose it, so their result is rejected.
+        """
+        with self._transaction():
+            self._connection.execute(
+                "UPDATE jobs SET state = ?, error = ?, lease_expires = NULL"
+                " WHERE submission = ? AND state IN (?, ?)",
+                (CANCELLED, error, submission, PENDING, LEASED),
+            )
+            self._connection.execute(
+                "UPDATE submissions SET error = ?, complete = 1 WHERE id = ?",
+                (error, submission),
+            )
+
+    def claim(self, worker: str) -> typing.Optional[typing.Dict]:
+        """
+        Leases the next pending job (or a job whose lease expired) to the worker.
+        :return: A dict with 'id', 'instance', 'solution' and 'attempt', or None
+                    if there is nothing to do right now.
+        """
+        now = time.time()
+        with self._transaction():
+            self._fail_exhausted(now)
+            row = self._connection.execute(
+                "SELECT id, instance, solution, attempts FROM jobs"
+                " WHERE state = ? OR (state = ? AND lease_expires < ?)"
+                " ORDER BY id LIMIT 1",
+                (PENDING, LEASED, now),
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, instance, solution, attempts = row
+            self._connection.execute(
+                "UPDATE jobs SET state = ?, worker = ?, lease_expires = ?,"
+                " attempts = attempts + 1 WHERE id = ?",
+                (LEASED, worker, now + self.lease_seconds, job_id),
+            )
+        return {
+            "id": job_id,
+            "instance": instance,
+            "solution": json.loads(zlib.decompress(solution).decode("utf-8")),
+            "attempt": attempts + 1,
+        }
+
+    def _fail_exhausted(self, now: float):
+        # Expired leases of jobs without attempts left, e.g., because they
+        # repeatedly crashed their worker.
+        self._connection.execute(
+            "UPDATE jobs SET state = ?, error = ? WHERE state = ? AND lease_expires < ?"
+            " AND attempts >= ?",
+            (
+                FAILED,
+                "Verification did not finish within the allowed attempts.",
+                LEASED,
+                now,
+                self.max_attempts,
+            ),
+        )
+
+    def heartbeat(self, job_id: int, worker: str) -> bool:
+        """
+        Renews the lease of a job. Returns False if the worker lost the lease,
+        e.g., because it was too slow and the job was claimed by another worker.
+        """
+        now = time.time()
+        with self._transaction():
+            cursor = self._connection.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND worker = ?"
+                " AND state = ?",
+                (now + self.lease_seconds, job_id, worker, LEASED),
+            )
+            self._connection.execute(
+                "UPDATE workers SET last_seen = ? WHERE id = ?", (now, worker)
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker: str, error: str, seconds: float) -> bool:
+        """
+        Stores the result of a job. The result is dropped if the worker does not
+        hold the lease anymore. Returns whether the result was stored.
+        """
+        with self._transaction():
+            cursor = self._connection.execute(
+                "UPDATE jobs SET state = ?, error = ?, seconds = ?, lease_expires = NULL"
+                " WHERE id = ? AND worker = ? AND state = ?",
+                (DONE, error, seconds, job_id, worker, LEASED),
+            )
+            # a dropped result does not count as a job of the worker.
+            self._connection.execute(
+                "UPDATE workers SET jobs_done = jobs_done + ?, last_seen = ?"
+                " WHERE id = ?",
+                (cursor.rowcount, time.time(), worker),
+            )
+        return cursor.rowcount == 1
+
+    def release(self, job_id: int, worker: str, error: str):
+        """
+        Gives a job back after an unexpected exception. It is retried unless it
+        has no attempts left, in which case it fails with the error.
+        """
+        with self._transaction():
+            self._connection.execute(
+                "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END,"
+                " error = ?, lease_expires = NULL WHERE id = ? AND worker = ?"
+                " AND state = ?",
+                (self.max_attempts, FAILED, PENDING, error, job_id, worker, LEASED),
+            )
+
+    def register_worker(self, worker: str):
+        now = time.time()
+        with self._transaction():
+            self._connection.execute(
+                "INSERT OR REPLACE INTO workers(id, host, pid, started, last_seen)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (worker, socket.gethostname(), os.getpid(), now, now),
+            )
+
+    def workers(self) -> typing.List[typing.Dict]:
+        rows = self._connection.execute(
+            "SELECT id, host, pid, started, last_seen, jobs_done FROM workers"
+            " ORDER BY id"
+        ).fetchall()
+        keys = ("id", "host", "pid", "started", "last_seen", "jobs_done")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def count_open_jobs(self) -> int:
+        """
+        Number of jobs that are pending or leased.
+        """
+        (n,) = self._connection.execute(
+            "SELECT COUNT(*) FROM jobs WHERE state IN (?, ?)", (PENDING, LEASED)
+        ).fetchone()
+        return n
+
+    def is_idle(self) -> bool:
+        """
+        True if there are no open jobs and no submission gets further jobs.
+        """
+        (n,) = self._connection.execute(
+            "SELECT COUNT(*) FROM submissions WHERE complete = 0"
+        ).fetchone()
+        return n == 0 and self.count_open_jobs() == 0
+
+    def submissions(self) -> typing.List[int]:
+        return [
+            row[0]
+            for row in self._connection.execute(
+                "SELECT id FROM submissions ORDER BY id"
+            )
+        ]
+
+    def submission_results(self, submission: int) -> typing.Dict:
+        """
+        Aggregates the results of a submission.
+        :return: A dict with the 'state' ('adding' while jobs are still added,
+                    'running' or 'done') and counts of the submission, and a list
+                    of the 'results' of all jobs.
+        """
+        row = self._connection.execute(
+            "SELECT name, path, error, complete FROM submissions WHERE id = ?",
+            (submission,),
+        ).fetchone()
+        if row is None:
+            raise KeyError(submission)
+        name, path, error, complete = row
+        jobs = self._connection.execute(
+            "SELECT instance, file_name, state, attempts, worker, error, seconds"
+            " FROM jobs WHERE submission = ? ORDER BY id",
+            (submission,),
+        ).fetchall()
+        keys = ("instance", "file_name", "state", "attempts", "worker", "error")
+        results = [dict(zip(keys + ("seconds",), job)) for job in jobs]
+        for result in results:
+            result["valid"] = result["state"] == DONE and not result["error"]
+        open_jobs = sum(1 for r in results if r["state"] in (PENDING, LEASED))
+        if not complete:
+            state = "adding"
+        else:
+            state = "running" if open_jobs else "done"
+        return {
+            "id": submission,
+            "name": name,
+            "path": path,
+            "error": error,
+            "state": state,
+            "jobs": len(results),
+            "open": open_jobs,
+            "valid": sum(1 for r in results if r["valid"]),
+            "invalid": sum(1 for r in results if r["state"] == DONE and r["error"]),
+            "failed": sum(1 for r in results if r["state"] == FAILED),
+            "cancelled": sum(1 for r in results if r["state"] == CANCELLED),
+            "results": results,
+        }
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class _Transaction:
+    """
+    Immediate transaction, such that two workers cannot claim the same job.
+    """
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def __enter__(self):
+        self._connection.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self._connection.execute("COMMIT")
+        else:
+            self._connection.execute("ROLLBACK")
+        return False
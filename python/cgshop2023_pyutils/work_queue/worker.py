@@ -0,0 +1,186 @@
+"""
+Worker that claims verification jobs from a `WorkQueue`. Start as many workers as
+you like, on any machine that can access the queue folder and the instances.
+"""
+import logging
+import threading
+import time
+import typing
+
+from .work_queue import WorkQueue, default_worker_id
+
+logger = logging.getLogger(__name__)
+
+
+class _Heartbeat(threading.Thread):
+    """
+    Renews the lease of a job while it is verified. If the lease is lost, the
+    verification is cancelled, as its result would be dropped anyway.
+    """
+
+    def __init__(self, queue_args, job_id, worker, interval, cancellation):
+        super().__init__(daemon=True)
+        self._queue_args = queue_args
+        self._job_id = job_id
+        self._worker = worker
+        self._interval = interval
+        self._cancellation = cancellation
+        self._stopped = threading.Event()
+
+    def run(self):
+        # sqlite connections cannot be shared between threads.
+        with WorkQueue(**self._queue_args) as queue:
+            while not self._stopped.wait(self._interval):
+                if not queue.heartbeat(self._job_id, self._worker):
+                    logger.warning("Lost the lease of job %d.", self._job_id)
+                    self._cancellation.cancel()
+                    return
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+class Worker:
+    """
+    Verifies the jobs of a queue. The instances are converted once per worker and
+    kept for the following jobs.
+    e.g.,
+    ```
+    worker = Worker("./queue", InstanceDatabase("./instances"))
+    worker.run(exit_when_empty=False)
+    ```
+    """
+
+    def __init__(
+        self,
+        folder: str,
+        instances: typing.Union[str, typing.Mapping],
+        worker_id: typing.Optional[str] = None,
+        lease_seconds: float = 300.0,
+        heartbeat_interval: typing.Optional[float] = None,
+        max_attempts: int = 3,
+        cache=None,
+    ):
+        """
+        :param folder: The folder of the queue.
+        :param instances: Path to the instances (folder or zip), or anything that
+                        returns the instance by its name, e.g., an
+                        `InstanceDatabase` or a `SharedInstanceStore`.
+        :param worker_id: Unique name of the worker. Defaults to host and pid.
+        :param lease_seconds: Duration of a lease. Use the same value for all
+                        workers of a queue.
+        :param heartbeat_interval: Interval for renewing the lease. Defaults to a
+                        third of the lease.
+        :param max_attempts: Number of attempts before a job fails.
+        :param cache: Optional `VerificationCache`.
+        """
+        if isinstance(instances, str):
+            from ..instance_database import InstanceDatabase
+
+            instances = InstanceDatabase(instances)
+        self.worker_id = worker_id if worker_id else default_worker_id()
+        self._queue_args = {
+            "folder": folder,
+            "lease_seconds": lease_seconds,
+            "max_attempts": max_attempts,
+        }
+        self._heartbeat_interval = (
+            heartbeat_interval if heartbeat_interval else lease_seconds / 3
+        )
+        self._queue = WorkQueue(**self._queue_args)
+        self._queue.register_worker(self.worker_id)
+        self._instances = instances
+        self._prepared = {}
+        self._cache = cache
+
+    def _get_instance(self, name: str):
+        from ..verifier import PreparedInstance
+
+        if name in self._prepared:
+            return self._prepared[name]
+        instance = self._instances[name]
+        if isinstance(instance, PreparedInstance):
+            return instance  # the source (e.g., a `SharedInstanceStore`) caches.
+        self._prepared[name] = PreparedInstance(instance)
+        return self._prepared[name]
+
+    def _verify(self, job: typing.Dict, cancellation) -> str:
+        from ..verifier import verify
+
+        try:
+            instance = self._get_instance(job["instance"])
+        except KeyError:
+            return f"Unknown instance '{job['instance']}'."
+        return verify(
+            instance, job["solution"], cache=self._cache, cancellation=cancellation
+        )
+
+    def process(self, job: typing.Dict):
+        """
+        Verifies a claimed job and stores its result.
+        """
+        from ..core import CancellationToken, VerificationCancelled
+
+        cancellation = CancellationToken()
+        heartbeat = _Heartbeat(
+            self._queue_args,
+            job["id"],
+            self.worker_id,
+            self._heartbeat_interval,
+            cancellation,
+        )
+        heartbeat.start()
+        start = time.perf_counter()
+        try:
+            error_msg = self._verify(job, cancellation)
+        except VerificationCancelled:
+            return  # another worker has the job now.
+        except Exception as e:
+            logger.exception("Job %d failed.", job["id"])
+            self._queue.release(
+                job["id"], self.worker_id, f"Could not verify solution: {e}"
+            )
+            return
+        finally:
+            heartbeat.stop()
+        seconds = time.perf_counter() - start
+        if not self._queue.complete(job["id"], self.worker_id, error_msg, seconds):
+            logger.warning("Dropped result of job %d, lease was lost.", job["id"])
+
+    def run(
+        self,
+        max_jobs: typing.Optional[int] = None,
+        exit_when_empty: bool = True,
+        poll_interval: float = 1.0,
+    ) -> int:
+        """
+        Processes jobs until the queue is empty (or forever).
+        :param max_jobs: Stop after this number of jobs.
+        :param exit_when_empty: Return if there are no open jobs left and no
+                    submission is being split. Otherwise, wait for new submissions.
+        :param poll_interval: Seconds to wait before asking again for a job.
+        :return: The number of processed jobs.
+        """
+        processed = 0
+        while max_jobs is None or processed < max_jobs:
+            job = self._queue.claim(self.worker_id)
+            if job is None:
+                # Jobs leased by other workers may still come back, and
+                # submissions that are being split get further jobs.
+                if exit_when_empty and self._queue.is_idle():
+                    break
+                time.sleep(poll_interval)
+                continue
+            self.process(job)
+            processed += 1
+        return processed
+
+    def close(self):
+        self._queue.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
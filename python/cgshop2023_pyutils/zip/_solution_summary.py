@@ -0,0 +1,78 @@
+"""
+Cheap summary of a solution file: the top-level fields (type, instance name) and
+the number of polygons, without building the points of the polygons.
+"""
+import json
+import re
+import typing
+from json.decoder import scanstring
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_BRACKETS = re.compile(r"[\[\]]")
+_DECODER = json.JSONDecoder()
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    return _WHITESPACE.match(text, pos).end()
+
+
+def _count_lists(text: str, pos: int) -> typing.Tuple[int, int]:
+    """
+    Counts the non-empty lists in the list starting at `pos` and returns the
+    count and the end of the list. Empty lists are not counted, as the parser
+    drops empty polygons. Only the brackets are visited, the points (objects)
+    between them are skipped by the regex. Brackets within strings are not
+    expected in solutions; if there are any, the count is wrong and the caller
+    falls back to the full parser when the rest of the file does not fit.
+    """
+    depth = 0
+    lists = 0
+    for match in _BRACKETS.finditer(text, pos):
+        if match.group() == "[":
+            depth += 1
+            if depth == 2 and text[_skip_whitespace(text, match.end())] != "]":
+                lists += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return lists, match.end()
+    raise ValueError("Unterminated list.")
+
+
+def json_summary(text: str) -> typing.Optional[typing.Dict]:
+    """
+    Scans the top-level object of a json solution. All values except the
+    polygons are decoded; for the polygons, only their number is determined.
+    :return: The top-level fields with the number of non-empty polygons as
+            'num_polygons' (if there are polygons), or None if the file does not
+            have the expected structure (use the full parser then, which also
+            reports errors).
+    """
+    summary = {}
+    try:
+        pos = _skip_whitespace(text, 0)
+        if text[pos] != "{":
+            return None
+        pos = _skip_whitespace(text, pos + 1)
+        while text[pos] != "}":
+            if text[pos] != '"':
+                return None
+            key, pos = scanstring(text, pos + 1)
+            pos = _skip_whitespace(text, pos)
+            if text[pos] != ":":
+                return None
+            pos = _skip_whitespace(text, pos + 1)
+            if key == "polygons" and text[pos] == "[":
+                summary["num_polygons"], pos = _count_lists(text, pos)
+            else:
+                summary[key], pos = _DECODER.raw_decode(text, pos)
+            pos = _skip_whitespace(text, pos)
+            if text[pos] == ",":
+                pos = _skip_whitespace(text, pos + 1)
+            elif text[pos] != "}":
+                return None
+        if _skip_whitespace(text, pos + 1) != len(text):
+            return None  # trailing data
+    except (ValueError, IndexError):
+        return None
+    return summary
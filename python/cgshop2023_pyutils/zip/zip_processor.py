@@ -3,23 +3,34 @@ This file contains the ZipSolutionIterator which can read a zip and return all s
 in it. It should be reasonably robust and have some basic security features.
 """
 import json
+import logging
 import typing
-from typing import BinaryIO, Union, Iterator
+from typing import BinaryIO, Callable, Union, Iterator
 from os import PathLike
 from zipfile import ZipFile, BadZipFile
 from json import JSONDecodeError
 
-import chardet
-
-from ..io import parse_solution, NoSolution, BadSolutionFile
+from ..io import (
+    parse_solution,
+    solution_instance_name,
+    NoSolution,
+    BadSolutionFile,
+    binary_to_json,
+)
+from ..io.binary import binary_summary
+from ..tracing import span, count, enabled as tracing_enabled
+from ._solution_summary import json_summary
 from .zip_reader_errors import (
     BadZipChecker,
     NoSolutionsError,
     InvalidEncodingError,
     InvalidJSONError,
+    InvalidBinaryError,
     InvalidZipError,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class ZipSolutionIterator:
     """
@@ -37,14 +48,15 @@ class ZipSolutionIterator:
         self,
         file_size_limit: int = 250 * 1_000_000,
         zip_size_limit: int = 2000 * 1_000_000,
-        solution_extensions=("json", "solution"),
+        solution_extensions=("json", "solution", "cgbin"),
     ):
         """
         Set the parameters in the constructor. Use the __call__ to actually iterate
         a zip file.
         :param file_size_limit: Limit the size of a single file within the zip.
         :param zip_size_limit: Limit the overall decompressed size of the zip.
-        :param solution_extensions: What file extensions should be checked?
+        :param solution_extensions: What file extensions should be checked? Files
+                        with the extension 'cgbin' are read in the binary format.
         """
         self._checker = BadZipChecker(
             file_size_limit=file_size_limit, zip_size_limit=zip_size_limit
@@ -52,7 +64,8 @@ class ZipSolutionIterator:
         self._solution_extensions = solution_extensions
 
     def _check_if_bad_zip(self, zipfile):
-        self._checker(zipfile)
+        with span("zip.check"):
+            self._checker(zipfile)
 
     def _is_hidden_folder_name(self, name):
         if len(name) > 1 and name[0] == ".":  # classic hidden unix files.
@@ -90,6 +103,8 @@ class ZipSolutionIterator:
         try:
             return json.loads(str(bytes, encoding="utf-8", errors="strict"))
         except UnicodeDecodeError:
+            import chardet  # only needed for badly encoded files
+
             encoding = chardet.detect(bytes)
             return json.loads(
                 str(bytes, encoding=encoding["encoding"], errors="strict")
@@ -97,7 +112,17 @@ class ZipSolutionIterator:
 
     def _parse_file(self, solution_file, file_name, info):
         # read no more than the claimed file_size bytes (which we checked for limit violations)
+        with span("zip.decode", file=file_name):
+            return self._decode_file(solution_file, file_name, info)
+
+    def _decode_file(self, solution_file, file_name, info):
         b = solution_file.read(info.file_size)
+        count("zip.bytes", len(b))
+        if file_name.lower().endswith(".cgbin"):
+            try:
+                return binary_to_json(b)
+            except (ValueError, UnicodeDecodeError) as e:
+                raise InvalidBinaryError(file_name, f"{e}") from e
         try:
             return self._robust_parse_json_from_bytes(b)
         except UnicodeDecodeError as ude:
@@ -107,11 +132,29 @@ class ZipSolutionIterator:
         except RecursionError as re:
             raise InvalidJSONError(file_name, "Nesting level is too deep") from re
 
-    def _iterate_solution_jsons(self, zip_file):
-        for file_name in self._iterate_solution_filenames(zip_file):
+    def _iterate_solutions(self, zip_file, file_names):
+        for file_name in file_names:
             with zip_file.open(file_name, "r") as sol_file:
                 info = zip_file.getinfo(file_name)
-                yield file_name, self._parse_file(sol_file, file_name, info)
+                solution_json = self._parse_file(sol_file, file_name, info)
+            meta = {
+                "zip_info": {
+                    "zip_file": zip_file.filename,
+                    "file_in_zip": file_name,
+                }
+            }
+            try:
+                with span("solution.parse", file=file_name):
+                    solution = parse_solution(solution_json)
+            except NoSolution:
+                logger.info("Skipping %s, as it is not a solution file.", file_name)
+                count("zip.skipped_files")
+                continue
+            if tracing_enabled():
+                count("solution.polygons", len(solution["polygons"]))
+                count("solution.vertices", sum(map(len, solution["polygons"])))
+            solution["meta"] = meta
+            yield solution
 
     def __call__(
         self, path_or_file: Union[BinaryIO, str, PathLike]
@@ -125,23 +168,119 @@ class ZipSolutionIterator:
         try:
             with ZipFile(path_or_file) as zip_file:
                 self._check_if_bad_zip(zip_file)
-                for file_name, solution_json in self._iterate_solution_jsons(zip_file):
-                    meta = {
-                        "zip_info": {
-                            "zip_file": zip_file.filename,
-                            "file_in_zip": file_name,
-                        }
-                    }
-                    try:
-                        solution = parse_solution(solution_json)
-                        solution["meta"] = meta
-                        yield solution
-                        found_an_instance = True
-                    except NoSolution:
-                        print(f"Skipping {file_name}, as it is not a solution file.")
+                file_names = self._iterate_solution_filenames(zip_file)
+                for solution in self._iterate_solutions(zip_file, file_names):
+                    yield solution
+                    found_an_instance = True
         except BadZipFile as e:
             raise InvalidZipError(f"{e}") from e
         except BadSolutionFile as e:
             raise InvalidZipError(f"Aborted parsing zip due to bad file: {e}") from e
         if not found_an_instance:
             raise NoSolutionsError()
+
+    def _summarize_file(self, zip_file, file_name):
+        """
+        Reads only the top-level fields and the number of polygons of a file.
+        Falls back to the full parser for files that cannot be summarized, such
+        that bad files raise the same errors as in `__call__`.
+        """
+        info = zip_file.getinfo(file_name)
+        with zip_file.open(file_name, "r") as sol_file:
+            b = sol_file.read(info.file_size)
+        summary = None
+        try:
+            if file_name.lower().endswith(".cgbin"):
+                summary = binary_summary(b)
+            else:
+                summary = json_summary(str(b, encoding="utf-8", errors="strict"))
+        except (ValueError, UnicodeDecodeError):
+            pass  # the full parser reports the problem
+        if summary is not None and "num_polygons" in summary:
+            return solution_instance_name(summary), summary["num_polygons"]
+        if summary is not None:
+            solution_instance_name(summary)  # skips files of other types
+        with zip_file.open(file_name, "r") as sol_file:
+            solution = parse_solution(self._parse_file(sol_file, file_name, info))
+        return solution["instance"], len(solution["polygons"])
+
+    def _index_solutions(self, zip_file):
+        """
+        Cheap pass over all solutions that only determines the instance name and
+        the number of polygons of every solution file. The points are not parsed.
+        """
+        index = {}
+        for file_name in self._iterate_solution_filenames(zip_file):
+            with span("zip.index", file=file_name):
+                try:
+                    instance_name, num_polygons = self._summarize_file(
+                        zip_file, file_name
+                    )
+                except NoSolution:
+                    logger.info("Skipping %s, as it is not a solution file.", file_name)
+                    count("zip.skipped_files")
+                    continue
+            candidates = index.setdefault(instance_name, [])
+            candidates.append((num_polygons, len(candidates), file_name))
+        return index
+
+    def iterate_best_first(
+        self,
+        path_or_file: Union[BinaryIO, str, PathLike],
+        verify: Callable[[typing.Dict], str],
+    ) -> Iterator[typing.Dict]:
+        """
+        Only finds the best valid solution for every instance in the zip. Instead
+        of verifying all solutions, the solutions of an instance are verified in
+        ascending number of polygons until the first valid one is found.
+        e.g.,
+        ```
+        zsi = ZipSolutionIterator()
+        for result in zsi.iterate_best_first("./myzip.zip",
+                                             lambda s: verify(idb[s["instance"]], s)):
+            print(result["instance"], result["solution"] is not None)
+        ```
+        :param path_or_file: Zip or file
+        :param verify: Function that returns an empty string if the solution is valid
+                        and an error message otherwise. If it raises an exception,
+                        the solution is counted as invalid.
+        :return: One dictionary per instance with the best valid `solution` (None if
+                    no solution is valid), the `errors` of the solutions that have
+                    been checked before, and the `skipped` files that have not been
+                    verified because a better solution is valid.
+        """
+        try:
+            with ZipFile(path_or_file) as zip_file:
+                self._check_if_bad_zip(zip_file)
+                index = self._index_solutions(zip_file)
+                if not index:
+                    raise NoSolutionsError()
+                for instance_name, candidates in index.items():
+                    candidates.sort()
+                    file_names = [file_name for _, _, file_name in candidates]
+                    result = {
+                        "instance": instance_name,
+                        "solution": None,
+                        "errors": {},
+                        "skipped": [],
+                    }
+                    for i, solution in enumerate(
+                        self._iterate_solutions(zip_file, file_names)
+                    ):
+                        file_name = solution["meta"]["zip_info"]["file_in_zip"]
+                        try:
+                            error_msg = verify(solution)
+                        except Exception as e:
+                            # one broken solution must not abort the whole zip.
+                            logger.exception("Could not verify %s.", file_name)
+                            error_msg = f"Could not verify solution: {e}"
+                        if not error_msg:
+                            result["solution"] = solution
+                            result["skipped"] = file_names[i + 1 :]
+                            break
+                        result["errors"][file_name] = error_msg
+                    yield result
+        except BadZipFile as e:
+            raise InvalidZipError(f"{e}") from e
+        except BadSolutionFile as e:
+            raise InvalidZipError(f"Aborted parsing zip due to bad file: {e}") from e
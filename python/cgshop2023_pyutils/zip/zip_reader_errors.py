@@ -51,6 +51,15 @@ class InvalidJSONError(ZipReaderError):
         )
 
 
+class InvalidBinaryError(ZipReaderError):
+    def __init__(self, file_name, message):
+        self.file_name = file_name
+        super().__init__(
+            f"The ZIP archive contains the file '{file_name}'"
+            f" which is not a valid binary solution file: {message}!"
+        )
+
+
 class InvalidEncodingError(ZipReaderError):
     def __init__(self, file_name):
         self.file_name = file_name
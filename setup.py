@@ -59,7 +59,6 @@ setup(  # https://scikit-build.readthedocs.io/en/latest/usage.html#setup-options
     install_requires=[
         # requirements necessary for basic usage (subset of requirements.txt)
         "chardet>=4.0.0",
-        "networkx>=2.5.1",
         "requests>=2.25.1",
     ],
     # ~~~~~~~~~~~ CRITICAL CMAKE SETUP ~~~~~~~~~~~~~~~~~~~~~
@@ -0,0 +1,96 @@
+#include "cgshop2023_core/connectivity.hpp"
+#include <CGAL/box_intersection_d.h>
+#include <algorithm>
+#include <numeric>
+
+namespace cgshop2023 {
+
+namespace {
+
+class UnionFind {
+public:
+  explicit UnionFind(std::size_t n) : m_parent(n) {
+    std::iota(m_parent.begin(), m_parent.end(), 0);
+  }
+
+  std::size_t find(std::size_t x) {
+    while (m_parent[x] != x) {
+      m_parent[x] = m_parent[m_parent[x]]; // path halving
+      x = m_parent[x];
+    }
+    return x;
+  }
+
+  void unite(std::size_t a, std::size_t b) { m_parent[find(a)] = find(b); }
+
+private:
+  std::vector<std::size_t> m_parent;
+};
+
+// True if the supporting line of an edge of `a` strictly separates `b` from
+// `a`. For convex polygons, such an edge of `a` or `b` exists if and only if
+// they are disjoint.
+bool has_separating_edge(const SimplePolygon &a, const SimplePolygon &b) {
+  const auto orientation = a.orientation();
+  if (orientation == CGAL::COLLINEAR) {
+    return false; // degenerated, do not claim anything.
+  }
+  // the outer side of an edge is right of it for counterclockwise polygons.
+  const auto outer_side = -orientation;
+  for (auto edge = a.edges_begin(); edge != a.edges_end(); ++edge) {
+    const bool separates =
+        std::all_of(b.vertices_begin(), b.vertices_end(), [&](const Point &p) {
+          return CGAL::orientation(edge->source(), edge->target(), p) ==
+                 outer_side;
+        });
+    if (separates) {
+      return true;
+    }
+  }
+  return false;
+}
+
+} // namespace
+
+bool convex_polygons_intersect(const SimplePolygon &a,
+                               const SimplePolygon &b) {
+  return !has_separating_edge(a, b) && !has_separating_edge(b, a);
+}
+
+std::size_t connected_components(const std::vector<SimplePolygon> &polygons,
+                                 std::vector<std::size_t> &out_component) {
+  using Box = CGAL::Box_intersection_d::Box_with_info_d<double, 2, std::size_t>;
+  std::vector<Box> boxes;
+  boxes.reserve(polygons.size());
+  for (std::size_t i = 0; i < polygons.size(); ++i) {
+    // The bounding boxes of the interval approximations are conservative.
+    boxes.emplace_back(polygons[i].bbox(), i);
+  }
+  UnionFind components(polygons.size());
+  auto callback = [&](const Box &a, const Box &b) {
+    const std::size_t i = a.info();
+    const std::size_t j = b.info();
+    if (components.find(i) == components.find(j)) {
+      return; // already connected, the exact test is not needed.
+    }
+    if (convex_polygons_intersect(polygons[i], polygons[j])) {
+      components.unite(i, j);
+    }
+  };
+  // closed boxes, such that touching polygons are candidates.
+  CGAL::box_self_intersection_d(boxes.begin(), boxes.end(), callback);
+
+  out_component.assign(polygons.size(), 0);
+  std::vector<std::size_t> index_of_root(polygons.size(), polygons.size());
+  std::size_t num_components = 0;
+  for (std::size_t i = 0; i < polygons.size(); ++i) {
+    const std::size_t root = components.find(i);
+    if (index_of_root[root] == polygons.size()) {
+      index_of_root[root] = num_components++;
+    }
+    out_component[i] = index_of_root[root];
+  }
+  return num_components;
+}
+
+} // namespace cgshop2023
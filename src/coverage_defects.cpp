@@ -0,0 +1,54 @@
+#include "cgshop2023_core/coverage_defects.hpp"
+#include <CGAL/Polygon_set_2.h>
+#include <fmt/core.h>
+#include <iterator>
+#include <stdexcept>
+
+namespace cgshop2023 {
+
+using PolygonSet = CGAL::Polygon_set_2<Kernel>;
+
+// Moves the regions of positive area into `out` and returns their total area.
+static Kernel::FT collect_regions(const PolygonSet &regions,
+                                  std::vector<Polygon> &out) {
+  std::vector<Polygon> polygons;
+  regions.polygons_with_holes(std::back_inserter(polygons));
+  Kernel::FT total = 0;
+  for (auto &polygon : polygons) {
+    const Kernel::FT region_area = area(polygon);
+    if (region_area > 0) {
+      total += region_area;
+      out.push_back(std::move(polygon));
+    }
+  }
+  return total;
+}
+
+CoverageDefects coverage_defects(const Instance &instance,
+                                 const Solution &solution) {
+  std::size_t idx = 0;
+  for (const SimplePolygon &poly : solution.polygons()) {
+    if (!poly.is_simple() || poly.orientation() != CGAL::COUNTERCLOCKWISE) {
+      throw std::invalid_argument(fmt::format(
+          "polygon {} is not simple and counterclockwise", idx));
+    }
+    ++idx;
+  }
+  // The union (cached in the solution) consists of interior-disjoint
+  // polygons, so they can be inserted without another boolean operation.
+  PolygonSet covered;
+  const auto &coverage = solution.coverage();
+  covered.insert(coverage.begin(), coverage.end());
+
+  CoverageDefects defects;
+  PolygonSet uncovered(instance.polygon());
+  uncovered.difference(covered);
+  defects.uncovered_area = collect_regions(uncovered, defects.uncovered);
+
+  PolygonSet excess(std::move(covered));
+  excess.difference(instance.polygon());
+  defects.excess_area = collect_regions(excess, defects.excess);
+  return defects;
+}
+
+} // namespace cgshop2023
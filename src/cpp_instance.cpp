@@ -1,9 +1,14 @@
 #include "../include/cgshop2023_core/cpp_instance.hpp"
+#include "../include/cgshop2023_core/serialization.hpp"
+#include <algorithm>
+#include <cmath>
+#include <cstdint>
 #include <exception>
 #include <nlohmann/json.hpp>
 #include <stdexcept>
 #include <string>
 #include <type_traits>
+#include <unordered_map>
 
 namespace cgshop2023 {
 
@@ -13,31 +18,86 @@ static void write_kv(std::ostream &output, const K &key, const V &value) {
   if constexpr (std::is_integral_v<V> || std::is_floating_point_v<V>) {
     output << value;
   } else {
-    output << '\"' << value << '\"';
+    output << nlohmann::json(value).dump(); // escaped string
   }
 }
 
-template <typename P>
-static void write_point(std::ostream &output, const P &p) {
-  output << "{\"x\": " << int(std::round(CGAL::to_double(p.x())))
-         << ", \"y\": " << int(std::round(CGAL::to_double(p.y()))) << "}";
+// Integers are written as json numbers if they can be parsed without loss by
+// common json parsers (64 bit), otherwise as strings.
+static void write_integer(std::ostream &output, const std::string &decimal) {
+  const std::size_t digits = decimal.size() - (decimal[0] == '-' ? 1 : 0);
+  if (digits <= 18) {
+    output << decimal;
+  } else {
+    output << '\"' << decimal << '\"';
+  }
+}
+
+void write_number(std::ostream &output, const Kernel::FT &x) {
+  const auto [num, den] = to_rational_strings(x);
+  if (den == "1") {
+    write_integer(output, num);
+    return;
+  }
+  output << "{\"num\": ";
+  write_integer(output, num);
+  output << ", \"den\": ";
+  write_integer(output, den);
+  output << '}';
+}
+
+static void write_point(std::ostream &output, const Point &p) {
+  output << "{\"x\": ";
+  write_number(output, p.x());
+  output << ", \"y\": ";
+  write_number(output, p.y());
+  output << '}';
+}
+
+void write_points(std::ostream &output, const SimplePolygon &polygon) {
+  output << '[';
+  bool first = true;
+  for (const auto &p : polygon.container()) {
+    if (!first) {
+      output << ", ";
+    }
+    first = false;
+    write_point(output, p);
+  }
+  output << ']';
+}
+
+static void write_holes(std::ostream &output, const Polygon &polygon) {
+  output << '[';
+  bool first = true;
+  for (const auto &hole : polygon.holes()) {
+    if (!first) {
+      output << ", ";
+    }
+    first = false;
+    write_points(output, hole);
+  }
+  output << ']';
 }
 
-template <typename PC>
-static void write_point_container(std::ostream &out, const PC &c) {
-  out << '[';
-  auto beg = c.begin();
-  auto last = c.end();
-  --last;
-  for (; beg != last; ++beg) {
-    write_point(out, *beg);
-    out << ", ";
-  }
-  write_point(out, *last);
-  out << ']';
+void write_coverage(std::ostream &output, const std::vector<Polygon> &coverage) {
+  output << '[';
+  bool first = true;
+  for (const auto &polygon : coverage) {
+    if (!first) {
+      output << ", ";
+    }
+    first = false;
+    output << "{\"outer_boundary\": ";
+    write_points(output, polygon.outer_boundary());
+    output << ", \"holes\": ";
+    write_holes(output, polygon);
+    output << '}';
+  }
+  output << ']';
 }
 
-void Instance::write(std::ostream &output, const std::string &name) {
+void Instance::write(std::ostream &output, const std::string &name) const {
   output << '{';
   write_kv(output, "type", "CGSHOP2023_Instance");
   output << ", ";
@@ -45,23 +105,28 @@ void Instance::write(std::ostream &output, const std::string &name) {
   output << ", ";
   write_kv(output, "n", num_vertices());
   output << ", \"outer_boundary\": ";
-  write_point_container(output, m_polygon.outer_boundary().container());
+  write_points(output, m_polygon.outer_boundary());
+  output << ", \"holes\": ";
+  write_holes(output, m_polygon);
+  output << "}\n";
+}
+
+void Solution::write(std::ostream &output,
+                     const std::string &instance_name) const {
+  output << '{';
+  write_kv(output, "type", "CGSHOP2023_Solution");
   output << ", ";
-  const auto &hc = m_polygon.holes();
-  if (!hc.empty()) {
-    output << "\"holes\": [";
-    auto hlast = hc.end();
-    --hlast;
-    for (auto hi = hc.begin(); hi != hlast; ++hi) {
-      write_point_container(output, hi->container());
+  write_kv(output, "instance", instance_name);
+  output << ", \"polygons\": [";
+  bool first = true;
+  for (const auto &polygon : m_polygons) {
+    if (!first) {
       output << ", ";
     }
-    write_point_container(output, hlast->container());
-    output << ']';
-  } else {
-    output << "\"holes\": []";
+    first = false;
+    write_points(output, polygon);
   }
-  output << "}\n";
+  output << "]}\n";
 }
 
 static Kernel::FT int64_to_cgal_exact(std::int64_t v) {
@@ -70,12 +135,127 @@ static Kernel::FT int64_to_cgal_exact(std::int64_t v) {
   return Kernel::FT(lo32) + Kernel::FT(hi32);
 }
 
-static SimplePolygon json_to_points(const nlohmann::json &plist) {
+// Exact conversion of a string with an (optionally signed) integer, a decimal
+// number, or a rational number `a/b` to FT.
+static Kernel::FT string_to_cgal_exact(std::string number) {
+  const auto first = number.find_first_not_of(" \t\n");
+  const auto last = number.find_last_not_of(" \t\n");
+  if (first == std::string::npos) {
+    throw std::runtime_error("Cannot parse empty number!");
+  }
+  number = number.substr(first, last - first + 1);
+  const auto slash_pos = number.find('/');
+  if (slash_pos != std::string::npos) {
+    return string_to_cgal_exact(number.substr(0, slash_pos)) /
+           string_to_cgal_exact(number.substr(slash_pos + 1));
+  }
+  const auto point_pos = number.find('.');
+  if (point_pos != std::string::npos) {
+    const std::string fractional = number.substr(point_pos + 1);
+    Kernel::FT denominator = 1;
+    for (std::size_t i = 0; i < fractional.size(); ++i) {
+      denominator *= 10;
+    }
+    const bool negative = !number.empty() && number[0] == '-';
+    const std::string integral = number.substr(0, point_pos);
+    Kernel::FT value = (integral.empty() || integral == "-")
+                           ? Kernel::FT(0)
+                           : string_to_cgal_exact(integral);
+    const Kernel::FT frac =
+        fractional.empty() ? Kernel::FT(0)
+                           : string_to_cgal_exact(fractional) / denominator;
+    return negative ? value - frac : value + frac;
+  }
+  bool negative = false;
+  std::size_t pos = 0;
+  if (number[0] == '-' || number[0] == '+') {
+    negative = number[0] == '-';
+    pos = 1;
+  }
+  if (pos == number.size()) {
+    throw std::runtime_error("Cannot parse number '" + number + "'!");
+  }
+  // Process chunks of up to 9 digits, which can be represented exactly.
+  Kernel::FT value = 0;
+  while (pos < number.size()) {
+    const std::size_t len = std::min<std::size_t>(9, number.size() - pos);
+    const std::string chunk = number.substr(pos, len);
+    if (chunk.find_first_not_of("0123456789") != std::string::npos) {
+      throw std::runtime_error("Cannot parse number '" + number + "'!");
+    }
+    int factor = 1;
+    for (std::size_t i = 0; i < len; ++i) {
+      factor *= 10;
+    }
+    value = value * Kernel::FT(factor) + Kernel::FT(std::stoi(chunk));
+    pos += len;
+  }
+  return negative ? -value : value;
+}
+
+// Exact conversion of a json value to FT. Supports integers, strings, and
+// objects of the form {"num": ..., "den": ...}.
+static Kernel::FT json_to_cgal_exact(const nlohmann::json &value) {
+  if (value.is_number_unsigned()) {
+    return string_to_cgal_exact(std::to_string(value.get<std::uint64_t>()));
+  }
+  if (value.is_number_integer()) {
+    return int64_to_cgal_exact(value.get<std::int64_t>());
+  }
+  if (value.is_number_float()) {
+    const double d = value.get<double>();
+    if (std::trunc(d) == d) { // integral doubles are exact.
+      return Kernel::FT(d);
+    }
+    // use the shortest decimal representation, similar to Python's str(float).
+    return string_to_cgal_exact(value.dump());
+  }
+  if (value.is_string()) {
+    return string_to_cgal_exact(value.get<std::string>());
+  }
+  if (value.is_object()) {
+    const Kernel::FT num = json_to_cgal_exact(value.at("num"));
+    if (!value.contains("den")) {
+      return num;
+    }
+    return num / json_to_cgal_exact(value.at("den"));
+  }
+  throw std::runtime_error("Don't know how to convert '" + value.dump() + "'!");
+}
+
+// Maps the json of identical coordinates to a single point. The points of
+// the kernel are reference counted handles, so all occurrences share the
+// exact numbers.
+class PointInterner {
+public:
+  const Point &operator()(const nlohmann::json &p) {
+    ++m_statistics.vertices;
+    std::string key = p.at("x").dump();
+    key += ',';
+    key += p.at("y").dump();
+    auto it = m_points.find(key);
+    if (it == m_points.end()) {
+      Point point(json_to_cgal_exact(p.at("x")), json_to_cgal_exact(p.at("y")));
+      CGAL::exact(point); // keep only the exact value, not the parsing steps.
+      it = m_points.emplace(std::move(key), std::move(point)).first;
+      ++m_statistics.distinct_vertices;
+    }
+    return it->second;
+  }
+
+  const ReadStatistics &statistics() const noexcept { return m_statistics; }
+
+private:
+  std::unordered_map<std::string, Point> m_points;
+  ReadStatistics m_statistics;
+};
+
+static SimplePolygon json_to_points(const nlohmann::json &plist,
+                                    PointInterner &interner) {
   std::vector<Point> points;
+  points.reserve(plist.size());
   for (const auto &p : plist) {
-    std::int64_t x = p.at("x").get<std::int64_t>();
-    std::int64_t y = p.at("y").get<std::int64_t>();
-    points.emplace_back(int64_to_cgal_exact(x), int64_to_cgal_exact(y));
+    points.push_back(interner(p));
   }
   return SimplePolygon(points.begin(), points.end());
 }
@@ -90,12 +270,54 @@ Instance Instance::read(std::istream &input, std::string &out_name) {
   const auto &ob = jsdata.at("outer_boundary");
   const auto &holes = jsdata.at("holes");
   std::vector<SimplePolygon> out_holes;
-  SimplePolygon boundary = json_to_points(ob);
+  PointInterner interner;
+  SimplePolygon boundary = json_to_points(ob, interner);
   for (const auto &h : holes) {
-    out_holes.emplace_back(json_to_points(h));
+    out_holes.emplace_back(json_to_points(h, interner));
   }
   return Instance(
       Polygon(std::move(boundary), out_holes.begin(), out_holes.end()));
 }
 
+Solution Solution::read(std::istream &input, std::string &out_instance_name,
+                        ReadStatistics *out_statistics) {
+  nlohmann::json jsdata;
+  input >> jsdata;
+  if (jsdata.at("type") != "CGSHOP2023_Solution") {
+    throw NotASolutionFile();
+  }
+  std::string name;
+  for (const char *key : {"instance", "id", "name"}) {
+    if (jsdata.contains(key)) {
+      name = jsdata.at(key).get<std::string>();
+      break;
+    }
+  }
+  if (name.empty()) {
+    throw std::runtime_error("Missing instance name!");
+  }
+  // same normalization as in the Python parser: strip folders and extensions.
+  name = name.substr(name.find_last_of('/') + 1);
+  out_instance_name = name.substr(0, name.find('.'));
+  std::vector<SimplePolygon> polygons;
+  PointInterner interner;
+  for (const auto &p : jsdata.at("polygons")) {
+    if (p.empty()) { // empty polygons are ignored.
+      continue;
+    }
+    if (p.size() < 3) {
+      throw std::runtime_error(
+          "All polygons need to consist of at least three distinct points!");
+    }
+    polygons.emplace_back(json_to_points(p, interner));
+  }
+  if (polygons.empty()) {
+    throw std::runtime_error("At least one polygon must be provided!");
+  }
+  if (out_statistics != nullptr) {
+    *out_statistics = interner.statistics();
+  }
+  return Solution(std::move(polygons));
+}
+
 } // namespace cgshop2023
@@ -0,0 +1,93 @@
+#include "cgshop2023_core/cpp_instance.hpp"
+#include "cgshop2023_core/serialization.hpp"
+
+namespace cgshop2023 {
+
+void compact(const SimplePolygon &polygon) {
+  for (const auto &p : polygon.container()) {
+    CGAL::exact(p);
+  }
+}
+
+void compact(const Polygon &polygon) {
+  compact(polygon.outer_boundary());
+  for (const auto &hole : polygon.holes()) {
+    compact(hole);
+  }
+}
+
+// Bytes of the GMP limbs of numerator and denominator.
+static std::size_t limb_bytes(const ExactNumber &x) {
+  mpq_srcptr q = as_mpq(x);
+  return (mpz_size(mpq_numref(q)) + mpz_size(mpq_denref(q))) *
+         sizeof(mp_limb_t);
+}
+
+void MemoryEstimator::add(const Point &point) {
+  // the points are handles, copies share their representation.
+  const void *rep = static_cast<const void *>(point.ptr());
+  m_bytes += sizeof(Point);
+  if (!m_seen.insert(rep).second) {
+    return;
+  }
+  // approximation plus reference count and pointers.
+  using ApproxPoint = Kernel::Approximate_kernel::Point_2;
+  using ExactPoint = Kernel::Exact_kernel::Point_2;
+  m_bytes += sizeof(ApproxPoint) + 3 * sizeof(void *);
+  if (point.ptr()->is_lazy()) {
+    // Only the construction is stored. Computing the exact value here would
+    // compact the point, so it is left out of the estimate.
+    ++m_lazy_points;
+    return;
+  }
+  // `CGAL::exact` does not change a point whose exact value is known.
+  const ExactPoint &exact = CGAL::exact(point);
+  m_bytes += sizeof(ExactPoint) + limb_bytes(exact.x()) + limb_bytes(exact.y());
+}
+
+void MemoryEstimator::add(const SimplePolygon &polygon) {
+  m_bytes += sizeof(SimplePolygon);
+  for (const auto &p : polygon.container()) {
+    add(p);
+  }
+}
+
+void MemoryEstimator::add(const Polygon &polygon) {
+  m_bytes += sizeof(Polygon);
+  add(polygon.outer_boundary());
+  for (const auto &hole : polygon.holes()) {
+    add(hole);
+  }
+}
+
+std::size_t Instance::memory_usage() const {
+  MemoryEstimator estimator;
+  estimator.add(m_polygon);
+  return sizeof(Instance) + estimator.bytes();
+}
+
+void Solution::compact() const {
+  for (const auto &polygon : m_polygons) {
+    cgshop2023::compact(polygon);
+  }
+  if (const auto *coverage = computed_coverage()) {
+    for (const auto &polygon : *coverage) {
+      cgshop2023::compact(polygon);
+    }
+  }
+}
+
+std::size_t Solution::memory_usage() const {
+  MemoryEstimator estimator;
+  for (const auto &polygon : m_polygons) {
+    estimator.add(polygon);
+  }
+  if (const auto *coverage = computed_coverage()) {
+    for (const auto &polygon : *coverage) {
+      estimator.add(polygon);
+    }
+  }
+  return sizeof(Solution) + estimator.bytes();
+}
+
+} // namespace cgshop2023
@@ -0,0 +1,108 @@
+#include "cgshop2023_core/reduction.hpp"
+#include <CGAL/box_intersection_d.h>
+#include <algorithm>
+#include <functional>
+#include <unordered_map>
+
+namespace cgshop2023 {
+
+namespace {
+
+// The vertices counterclockwise, starting at the lexicographically smallest.
+std::vector<Point> canonical_vertices(const SimplePolygon &polygon) {
+  std::vector<Point> points(polygon.vertices_begin(), polygon.vertices_end());
+  if (polygon.orientation() == CGAL::CLOCKWISE) {
+    std::reverse(points.begin(), points.end());
+  }
+  auto smallest = std::min_element(points.begin(), points.end());
+  std::rotate(points.begin(), smallest, points.end());
+  return points;
+}
+
+// Hash of the double approximation. Equal points have equal approximations
+// and the exact comparison resolves collisions.
+std::size_t approximate_hash(const std::vector<Point> &points) {
+  std::size_t seed = points.size();
+  auto combine = [&seed](double value) {
+    seed ^= std::hash<double>()(value) + 0x9e3779b9 + (seed << 6) + (seed >> 2);
+  };
+  for (const auto &p : points) {
+    combine(CGAL::to_double(p.x()));
+    combine(CGAL::to_double(p.y()));
+  }
+  return seed;
+}
+
+} // namespace
+
+bool contained_in_convex(const SimplePolygon &inner,
+                         const SimplePolygon &outer) {
+  const auto orientation = outer.orientation();
+  if (orientation == CGAL::COLLINEAR) {
+    return false;
+  }
+  // a point is outside if it is strictly on the outer side of an edge.
+  const auto outer_side = -orientation;
+  return std::none_of(
+      outer.edges_begin(), outer.edges_end(), [&](const auto &edge) {
+        return std::any_of(
+            inner.vertices_begin(), inner.vertices_end(), [&](const Point &p) {
+              return CGAL::orientation(edge.source(), edge.target(), p) ==
+                     outer_side;
+            });
+      });
+}
+
+std::vector<SimplePolygon>
+remove_redundant_polygons(const std::vector<SimplePolygon> &polygons) {
+  std::vector<bool> removed(polygons.size(), false);
+
+  // duplicates
+  std::unordered_map<std::size_t, std::vector<std::size_t>> buckets;
+  std::vector<std::vector<Point>> canonical;
+  canonical.reserve(polygons.size());
+  for (std::size_t i = 0; i < polygons.size(); ++i) {
+    canonical.push_back(canonical_vertices(polygons[i]));
+    auto &bucket = buckets[approximate_hash(canonical[i])];
+    removed[i] = std::any_of(bucket.begin(), bucket.end(), [&](std::size_t j) {
+      return canonical[j] == canonical[i];
+    });
+    if (!removed[i]) {
+      bucket.push_back(i);
+    }
+  }
+
+  // polygons contained in another polygon
+  using Box = CGAL::Box_intersection_d::Box_with_info_d<double, 2, std::size_t>;
+  std::vector<Box> boxes;
+  for (std::size_t i = 0; i < polygons.size(); ++i) {
+    if (!removed[i]) {
+      boxes.emplace_back(polygons[i].bbox(), i);
+    }
+  }
+  auto callback = [&](const Box &a, const Box &b) {
+    const std::size_t i = a.info();
+    const std::size_t j = b.info();
+    if (removed[i] || removed[j]) {
+      // contained in a removed polygon implies contained in the polygon that
+      // contains the removed one, so nothing is lost by skipping.
+      return;
+    }
+    if (contained_in_convex(polygons[i], polygons[j])) {
+      removed[i] = true;
+    } else if (contained_in_convex(polygons[j], polygons[i])) {
+      removed[j] = true;
+    }
+  };
+  CGAL::box_self_intersection_d(boxes.begin(), boxes.end(), callback);
+
+  std::vector<SimplePolygon> remaining;
+  for (std::size_t i = 0; i < polygons.size(); ++i) {
+    if (!removed[i]) {
+      remaining.push_back(polygons[i]);
+    }
+  }
+  return remaining;
+}
+
+} // namespace cgshop2023
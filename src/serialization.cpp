@@ -0,0 +1,279 @@
+#include "cgshop2023_core/serialization.hpp"
+#include <CGAL/Fraction_traits.h>
+#include <CGAL/Gmpq.h>
+#include <algorithm>
+#include <cstdint>
+#include <gmp.h>
+#include <limits>
+#include <sstream>
+#include <stdexcept>
+#include <type_traits>
+#include <vector>
+
+namespace cgshop2023 {
+
+std::pair<std::string, std::string> to_rational_strings(const Kernel::FT &x) {
+  using Traits = CGAL::Fraction_traits<ExactNumber>;
+  typename Traits::Numerator_type num;
+  typename Traits::Denominator_type den;
+  typename Traits::Decompose()(CGAL::exact(x), num, den);
+  std::ostringstream num_str;
+  std::ostringstream den_str;
+  num_str << num;
+  den_str << den;
+  return {num_str.str(), den_str.str()};
+}
+
+Kernel::FT from_rational_strings(const std::string &num,
+                                 const std::string &den) {
+  const ExactNumber n(num);
+  const ExactNumber d(den);
+  if (d == 0) {
+    throw std::runtime_error("Denominator must not be zero!");
+  }
+  return Kernel::FT(ExactNumber(n / d));
+}
+
+static mpq_srcptr mpq_of(const CGAL::Gmpq &x) { return x.mpq(); }
+#ifdef CGAL_USE_GMPXX
+static mpq_srcptr mpq_of(const mpq_class &x) { return x.get_mpq_t(); }
+#endif
+
+mpq_srcptr as_mpq(const ExactNumber &x) { return mpq_of(x); }
+
+namespace {
+// RAII for a temporary mpq_t.
+struct Rational {
+  Rational() { mpq_init(value); }
+  Rational(const Rational &) = delete;
+  Rational &operator=(const Rational &) = delete;
+  ~Rational() { mpq_clear(value); }
+  mpq_t value;
+};
+} // namespace
+
+static void write_varint(std::string &out, std::size_t value) {
+  while (value >= 0x80) {
+    out.push_back(static_cast<char>((value & 0x7f) | 0x80));
+    value >>= 7;
+  }
+  out.push_back(static_cast<char>(value));
+}
+
+// Writes the absolute value as length-prefixed big-endian bytes. Zero has no
+// bytes.
+static void write_magnitude(std::string &out, mpz_srcptr value) {
+  const std::size_t len =
+      mpz_sgn(value) == 0 ? 0 : (mpz_sizeinbase(value, 2) + 7) / 8;
+  write_varint(out, len);
+  const std::size_t begin = out.size();
+  out.resize(begin + len);
+  std::size_t written = 0;
+  mpz_export(&out[begin], &written, 1, 1, 1, 0, value);
+  out.resize(begin + written);
+}
+
+void write_binary(std::string &out, const Kernel::FT &x) {
+  // GMP keeps rationals canonical: reduced with a positive denominator.
+  mpq_srcptr q = as_mpq(CGAL::exact(x));
+  out.push_back(mpq_sgn(q) < 0 ? 1 : 0);
+  write_magnitude(out, mpq_numref(q));
+  write_magnitude(out, mpq_denref(q));
+}
+
+void write_binary(std::string &out, const Point &p) {
+  write_binary(out, p.x());
+  write_binary(out, p.y());
+}
+
+void write_binary(std::string &out, const SimplePolygon &polygon) {
+  write_varint(out, polygon.size());
+  for (const auto &p : polygon.container()) {
+    write_binary(out, p);
+  }
+}
+
+void write_binary(std::string &out, const Polygon &polygon) {
+  write_binary(out, polygon.outer_boundary());
+  write_varint(out, polygon.number_of_holes());
+  for (const auto &hole : polygon.holes()) {
+    write_binary(out, hole);
+  }
+}
+
+void write_binary(std::string &out, const Instance &instance) {
+  write_binary(out, instance.polygon());
+}
+
+void write_binary(std::string &out, const Solution &solution) {
+  write_varint(out, solution.size());
+  for (const auto &polygon : solution.polygons()) {
+    write_binary(out, polygon);
+  }
+}
+
+std::size_t BinaryReader::read_varint() {
+  std::uint64_t value = 0;
+  for (unsigned shift = 0; shift < 64; shift += 7) {
+    if (m_pos >= m_size) {
+      throw std::runtime_error("Unexpected end of binary data!");
+    }
+    const auto byte = static_cast<unsigned char>(m_data[m_pos++]);
+    // The tenth byte only has room for the highest bit and must be the last.
+    if (shift == 63 && byte > 1) {
+      throw std::runtime_error("Varint too long in binary data!");
+    }
+    value |= static_cast<std::uint64_t>(byte & 0x7f) << shift;
+    if (!(byte & 0x80)) {
+      if (value > std::numeric_limits<std::size_t>::max()) {
+        throw std::runtime_error("Varint too large in binary data!");
+      }
+      return static_cast<std::size_t>(value);
+    }
+  }
+  throw std::runtime_error("Varint too long in binary data!");
+}
+
+void BinaryReader::read_magnitude(mpz_ptr out) {
+  const std::size_t len = read_varint();
+  if (len > m_size - m_pos) {
+    throw std::runtime_error("Unexpected end of binary data!");
+  }
+  // imports straight from the buffer.
+  mpz_import(out, len, 1, 1, 1, 0, m_data + m_pos);
+  m_pos += len;
+}
+
+Kernel::FT BinaryReader::read_number() {
+  if (m_pos >= m_size) {
+    throw std::runtime_error("Unexpected end of binary data!");
+  }
+  const bool negative = m_data[m_pos++] != 0;
+  Rational q;
+  read_magnitude(mpq_numref(q.value));
+  read_magnitude(mpq_denref(q.value));
+  if (mpz_sgn(mpq_denref(q.value)) == 0) {
+    throw std::runtime_error("Denominator must not be zero!");
+  }
+  if (negative) {
+    mpz_neg(mpq_numref(q.value), mpq_numref(q.value));
+  }
+  mpq_canonicalize(q.value);
+  return Kernel::FT(ExactNumber(q.value));
+}
+
+Point BinaryReader::read_point() {
+  auto x = read_number();
+  auto y = read_number();
+  return {x, y};
+}
+
+SimplePolygon BinaryReader::read_simple_polygon() {
+  const std::size_t n = read_varint();
+  std::vector<Point> points;
+  points.reserve(std::min<std::size_t>(n, m_size - m_pos));
+  for (std::size_t i = 0; i < n; ++i) {
+    points.push_back(read_point());
+  }
+  return SimplePolygon(points.begin(), points.end());
+}
+
+Polygon BinaryReader::read_polygon() {
+  SimplePolygon outer = read_simple_polygon();
+  const std::size_t num_holes = read_varint();
+  std::vector<SimplePolygon> holes;
+  for (std::size_t i = 0; i < num_holes; ++i) {
+    holes.push_back(read_simple_polygon());
+  }
+  return Polygon(std::move(outer), holes.begin(), holes.end());
+}
+
+Instance BinaryReader::read_instance() { return Instance(read_polygon()); }
+
+Solution BinaryReader::read_solution() {
+  const std::size_t n = read_varint();
+  std::vector<SimplePolygon> polygons;
+  for (std::size_t i = 0; i < n; ++i) {
+    polygons.push_back(read_simple_polygon());
+  }
+  return Solution(std::move(polygons));
+}
+
+void BinaryReader::seek(std::size_t pos) {
+  if (pos > m_size) {
+    throw std::runtime_error("Unexpected end of binary data!");
+  }
+  m_pos = pos;
+}
+
+// Unsigned LEB128 varint of any length (up to the limit) into `out`.
+void BinaryReader::read_long_varint(mpz_ptr out) {
+  const std::size_t begin = m_pos;
+  for (;;) {
+    if (m_pos >= m_size) {
+      throw std::runtime_error("Unexpected end of binary data!");
+    }
+    if (m_pos - begin == max_cgbin_varint_bytes) {
+      throw std::runtime_error("Varint too long in binary data!");
+    }
+    if (!(static_cast<unsigned char>(m_data[m_pos++]) & 0x80)) {
+      break;
+    }
+  }
+  // packs the 7-bit groups into little-endian bytes for the import.
+  std::vector<unsigned char> bytes(((m_pos - begin) * 7 + 7) / 8);
+  std::uint32_t bits = 0;
+  unsigned num_bits = 0;
+  std::size_t out_pos = 0;
+  for (std::size_t i = begin; i < m_pos; ++i) {
+    const auto byte = static_cast<unsigned char>(m_data[i]);
+    bits |= static_cast<std::uint32_t>(byte & 0x7f) << num_bits;
+    num_bits += 7;
+    while (num_bits >= 8) {
+      bytes[out_pos++] = static_cast<unsigned char>(bits & 0xff);
+      bits >>= 8;
+      num_bits -= 8;
+    }
+  }
+  if (num_bits > 0) {
+    bytes[out_pos++] = static_cast<unsigned char>(bits);
+  }
+  mpz_import(out, out_pos, -1, 1, 0, 0, bytes.data());
+}
+
+ExactNumber BinaryReader::read_cgbin_number(bool with_denominators) {
+  Rational q;
+  mpz_ptr num = mpq_numref(q.value);
+  read_long_varint(num);
+  // zigzag: even values are non-negative, odd values negative.
+  const bool negative = mpz_odd_p(num);
+  mpz_fdiv_q_2exp(num, num, 1);
+  if (negative) {
+    mpz_add_ui(num, num, 1);
+    mpz_neg(num, num);
+  }
+  if (with_denominators) {
+    read_long_varint(mpq_denref(q.value));
+    if (mpz_sgn(mpq_denref(q.value)) == 0) {
+      throw std::runtime_error("Denominator must not be zero!");
+    }
+    mpq_canonicalize(q.value);
+  }
+  return ExactNumber(q.value);
+}
+
+std::vector<CgbinPoint>
+BinaryReader::read_cgbin_polygon(bool with_denominators) {
+  const std::size_t n = read_varint();
+  std::vector<CgbinPoint> points;
+  // every point takes at least two bytes, the count is not trusted.
+  points.reserve(std::min<std::size_t>(n, (m_size - m_pos) / 2));
+  for (std::size_t i = 0; i < n; ++i) {
+    auto x = read_cgbin_number(with_denominators);
+    auto y = read_cgbin_number(with_denominators);
+    points.emplace_back(std::move(x), std::move(y));
+  }
+  return points;
+}
+
+} // namespace cgshop2023
@@ -1,4 +1,6 @@
 #include "cgshop2023_core/verify.hpp"
+#include "cgshop2023_core/connectivity.hpp"
+#include "cgshop2023_core/reduction.hpp"
 #include "./fmt_point.h"
 #include <CGAL/Boolean_set_operations_2.h>
 #include <fmt/core.h>
@@ -9,6 +11,19 @@
 
 namespace cgshop2023 {
 
+// Polygons of zero area (and clockwise polygons, whose area is negative) are
+// rejected before any other check, with the same message as the Python parser
+// used to produce.
+bool SolutionVerifier::p_verify_positive_area() {
+  auto positive = [](const SimplePolygon &poly) { return poly.area() > 0; };
+  if (!std::all_of(solution().polygons().begin(), solution().polygons().end(),
+                   positive)) {
+    m_error = "Solution contains polygons of zero size.";
+    return false;
+  }
+  return true;
+}
+
 // check that all polygons of the solution are convex
 bool SolutionVerifier::p_verify_convexity() {
   std::size_t idx = 0;
@@ -33,8 +48,28 @@ bool SolutionVerifier::p_verify_convexity() {
   return true;
 }
 
+// Rejects solutions whose polygons do not form a single connected component
+// before computing the (expensive) union. This is only a prefilter: polygons
+// that merely touch are considered connected here, the union decides.
+bool SolutionVerifier::p_verify_connectivity() {
+  std::vector<std::size_t> components;
+  if (connected_components(union_input().polygons(), components) > 1) {
+    m_error = fmt::format("polygons have disconnected union");
+    return false;
+  }
+  return true;
+}
+
+void SolutionVerifier::p_reduce() {
+  auto remaining = remove_redundant_polygons(solution().polygons());
+  m_num_removed = solution().size() - remaining.size();
+  if (m_num_removed > 0) {
+    m_reduced.emplace(std::move(remaining));
+  }
+}
+
 std::optional<Polygon> SolutionVerifier::compute_coverage() {
-  auto union_results = solution().coverage();
+  auto union_results = union_input().coverage();
   if (union_results.empty()) {
     m_error = fmt::format("polygons have empty union");
     return {};
@@ -75,15 +110,31 @@ bool SolutionVerifier::p_verify_coverage(const Polygon &coverage) {
 }
 
 bool SolutionVerifier::verify() {
+  p_check_cancelled();
+  if (m_options.compact) {
+    instance().compact(); // at most once, also if shared by threads
+    solution().compact();
+  }
+  if (!p_verify_positive_area())
+    return false;
   if (!p_verify_convexity())
     return false;
+  p_check_cancelled();
+  if (m_options.reduce)
+    p_reduce();
+  if (!p_verify_connectivity())
+    return false;
+  p_check_cancelled();
   auto coverage = compute_coverage();
   if (coverage) {
+    p_check_cancelled();
+    if (m_options.compact)
+      cgshop2023::compact(*coverage);
     if (!check_coverage_area_size(*coverage))
       return false;
     if (!p_verify_coverage(*coverage))
       return false;
-    if (area(*coverage) != area(instance().polygon())) {
+    if (area(*coverage) != instance().area()) {
       m_error = "The area doesn't fit, but somehow no rule has been triggered";
       return false;
     }
@@ -93,8 +144,7 @@ bool SolutionVerifier::verify() {
 }
 
 bool SolutionVerifier::check_coverage_area_size(const Polygon &coverage) {
-  const Polygon &ipoly = instance().polygon();
-  if (area(coverage) > area(ipoly)) {
+  if (area(coverage) > instance().area()) {
     m_error = fmt::format("the solution covers more area than the instance.");
     return false;
   }
@@ -3,6 +3,91 @@
 //
 #define DOCTEST_CONFIG_IMPLEMENT_WITH_MAIN
 
+#include "cgshop2023_core/connectivity.hpp"
+#include "cgshop2023_core/coverage_defects.hpp"
+#include "cgshop2023_core/reduction.hpp"
+#include "cgshop2023_core/serialization.hpp"
 #include <doctest/doctest.h>
 
+using namespace cgshop2023;
+
 TEST_CASE("foobar") { CHECK(5 == 5); }
+
+static SimplePolygon square(int x0, int y0) {
+  std::vector<Point> points = {{x0, y0}, {x0 + 1, y0}, {x0 + 1, y0 + 1},
+                               {x0, y0 + 1}};
+  return SimplePolygon(points.begin(), points.end());
+}
+
+TEST_CASE("convex polygons intersect") {
+  CHECK(convex_polygons_intersect(square(0, 0), square(0, 0)));
+  CHECK(convex_polygons_intersect(square(0, 0), square(1, 0)));  // edge
+  CHECK(convex_polygons_intersect(square(0, 0), square(1, 1)));  // corner
+  CHECK(!convex_polygons_intersect(square(0, 0), square(2, 0)));
+  auto reversed = square(1, 0);
+  reversed.reverse_orientation();
+  CHECK(convex_polygons_intersect(square(0, 0), reversed));
+  // diagonal gap, the boxes intersect.
+  std::vector<Point> a = {{0, 0}, {2, 0}, {0, 2}};
+  std::vector<Point> b = {{2, 1}, {2, 2}, {1, 2}};
+  CHECK(!convex_polygons_intersect(SimplePolygon(a.begin(), a.end()),
+                                   SimplePolygon(b.begin(), b.end())));
+}
+
+TEST_CASE("connected components") {
+  std::vector<SimplePolygon> polygons = {square(0, 0), square(5, 0),
+                                         square(1, 0), square(6, 1)};
+  std::vector<std::size_t> components;
+  CHECK(connected_components(polygons, components) == 2);
+  CHECK(components[0] == components[2]);
+  CHECK(components[1] == components[3]);
+  CHECK(components[0] != components[1]);
+}
+
+TEST_CASE("remove redundant polygons") {
+  auto rotated = square(0, 0);
+  rotated.push_back(*rotated.vertices_begin());
+  rotated.erase(rotated.vertices_begin());
+  auto reversed = square(0, 0);
+  reversed.reverse_orientation();
+  std::vector<Point> inner = {{0, 0}, {1, 0}, {0, 1}};
+  std::vector<SimplePolygon> polygons = {
+      square(0, 0), rotated, square(1, 0), reversed,
+      SimplePolygon(inner.begin(), inner.end())};
+  auto remaining = remove_redundant_polygons(polygons);
+  CHECK(remaining.size() == 2);
+  CHECK(remaining[0] == square(0, 0));
+  CHECK(remaining[1] == square(1, 0));
+}
+
+TEST_CASE("coverage defects") {
+  std::vector<Point> outer = {{0, 0}, {3, 0}, {3, 1}, {0, 1}};
+  const Instance instance(Polygon(SimplePolygon(outer.begin(), outer.end())));
+  // gap [1, 2] x [0, 1] and the excess area [2, 3] x [1, 2].
+  const Solution solution = {square(0, 0), square(2, 0), square(2, 1)};
+  auto defects = coverage_defects(instance, solution);
+  CHECK(defects.uncovered.size() == 1);
+  CHECK(defects.uncovered_area == 1);
+  CHECK(defects.excess.size() == 1);
+  CHECK(defects.excess_area == 1);
+  auto reversed = square(0, 0);
+  reversed.reverse_orientation();
+  CHECK_THROWS_AS(coverage_defects(instance, Solution{reversed}),
+                  std::invalid_argument);
+}
+
+TEST_CASE("binary varints fit into 64 bits") {
+  const Kernel::FT x = Kernel::FT(-7) / Kernel::FT(3);
+  BinaryReader reader(to_binary(x));
+  CHECK(reader.read_number() == x);
+  CHECK(reader.at_end());
+  // sign byte, then a length varint whose tenth byte overflows
+  const std::string overflow =
+      std::string(1, '\0') + std::string(9, '\xff') + std::string(1, '\x02');
+  CHECK_THROWS_WITH_AS(BinaryReader(overflow).read_number(),
+                       "Varint too long in binary data!", std::runtime_error);
+  const std::string too_long =
+      std::string(1, '\0') + std::string(10, '\xff') + std::string(1, '\0');
+  CHECK_THROWS_WITH_AS(BinaryReader(too_long).read_number(),
+                       "Varint too long in binary data!", std::runtime_error);
+}
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import threading
+import time
+import zipfile
+
+import pytest
+
+from cgshop2023_pyutils.aio import (
+    AsyncInstanceDatabase,
+    AsyncVerifier,
+    iterate_solutions,
+)
+from cgshop2023_pyutils.core import CancellationToken, VerificationCancelled
+from cgshop2023_pyutils.verifier import verify
+
+
+def _square(size):
+    coords = ((0, 0), (size, 0), (size, size), (0, size))
+    return [{"x": x, "y": y} for x, y in coords]
+
+
+def _instance(name):
+    return {
+        "type": "CGSHOP2023_Instance",
+        "name": name,
+        "outer_boundary": _square(2),
+        "holes": [],
+    }
+
+
+def _solution(name, size):
+    return {
+        "type": "CGSHOP2023_Solution",
+        "instance": name,
+        "polygons": [_square(size)],
+    }
+
+
+def test_cancelled_verification():
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(VerificationCancelled):
+        verify(_instance("a"), _solution("a", 2), cancellation=token)
+
+
+def test_cancelling_the_task_cancels_the_verification(monkeypatch):
+    from cgshop2023_pyutils import verifier
+
+    started = threading.Event()
+    tokens = []
+    stopped = []
+
+    def slow_verify(instance, solution, cancellation=None, **kwargs):
+        # checks the token between its stages, as the native verifier does.
+        tokens.append(cancellation)
+        started.set()
+        for _ in range(1000):
+            if cancellation.cancelled():
+                stopped.append(True)
+                raise VerificationCancelled("verification cancelled")
+            time.sleep(0.01)
+        return ""
+
+    monkeypatch.setattr(verifier, "verify", slow_verify)
+
+    async def run():
+        async with AsyncVerifier(max_workers=1) as async_verifier:
+            task = asyncio.create_task(
+                async_verifier.verify(_instance("a"), _solution("a", 2))
+            )
+            loop = asyncio.get_running_loop()
+            assert await loop.run_in_executor(None, started.wait, 10)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            # the task only ends after the thread has stopped
+            assert stopped == [True]
+
+    asyncio.run(run())
+    assert len(tokens) == 1 and tokens[0].cancelled()
+
+
+def test_async_api(tmp_path):
+    with zipfile.ZipFile(tmp_path / "solutions.zip", "w") as zip_file:
+        for i in range(10):
+            solution = _solution(f"instance_{i}", 2 if i % 2 else 1)
+            zip_file.writestr(f"solution_{i}.json", json.dumps(solution))
+    for i in range(10):
+        with open(tmp_path / f"instance_{i}.instance.json", "w") as f:
+            json.dump(_instance(f"instance_{i}"), f)
+
+    async def run():
+        idb = AsyncInstanceDatabase(str(tmp_path))
+        results = []
+        async with AsyncVerifier(max_workers=2) as verifier:
+            async for solution in iterate_solutions(
+                str(tmp_path / "solutions.zip"), max_pending=1
+            ):
+                instance = await idb.get(solution["instance"])
+                results.append(
+                    (solution["instance"], await verifier.verify(instance, solution))
+                )
+            # stopping early must not block the reading thread
+            async for _ in iterate_solutions(
+                str(tmp_path / "solutions.zip"), max_pending=1
+            ):
+                break
+        names = sorted([instance["name"] async for instance in idb])
+        await idb.close()
+        return results, names
+
+    results, names = asyncio.run(run())
+    assert [name for name, _ in results] == [f"instance_{i}" for i in range(10)]
+    assert [msg == "" for _, msg in results] == [i % 2 == 1 for i in range(10)]
+    assert names == sorted(f"instance_{i}" for i in range(10))
+
+
+def test_async_verifier_with_cache(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from cgshop2023_pyutils import VerificationCache
+
+    async def run(cache):
+        executor = ThreadPoolExecutor(max_workers=2)
+        with pytest.raises(ValueError):
+            AsyncVerifier(executor=executor)
+        verifier = AsyncVerifier(executor=executor, max_concurrency=2)
+        solutions = [_solution("a", 2 if i % 2 else 1) for i in range(6)]
+        messages = await asyncio.gather(
+            *(verifier.verify(_instance("a"), s, cache=cache) for s in solutions)
+        )
+        executor.shutdown()
+        return messages
+
+    # the cache is created in this thread and used by the worker threads.
+    with VerificationCache(str(tmp_path / "cache.sqlite")) as cache:
+        messages = asyncio.run(run(cache))
+        assert [msg == "" for msg in messages] == [i % 2 == 1 for i in range(6)]
+        assert len(cache) == 2 and cache.hits + cache.misses == 6
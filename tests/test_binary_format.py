@@ -0,0 +1,107 @@
+import json
+import sys
+import zipfile
+
+import pytest
+
+from cgshop2023_pyutils import InstanceDatabase
+from cgshop2023_pyutils.io import (
+    binary_to_json,
+    convert_file,
+    json_to_binary,
+    read_instance,
+    read_solution,
+    write_binary,
+)
+from cgshop2023_pyutils.io.binary import read_polygon
+from cgshop2023_pyutils.zip import ZipSolutionIterator
+
+
+def _points(*coords):
+    return [{"x": x, "y": y} for x, y in coords]
+
+
+INSTANCE = {
+    "type": "CGSHOP2023_Instance",
+    "name": "square",
+    "n": 8,
+    "outer_boundary": _points((0, 0), (10, 0), (10, 10), (0, 10)),
+    "holes": [_points((2, 2), (2, 3), (3, 3), (3, 2))],
+}
+
+SOLUTION = {
+    "type": "CGSHOP2023_Solution",
+    "instance": "square",
+    "meta": {"solver": "test"},
+    "polygons": [
+        _points((0, 0), ({"num": 1, "den": 3}, -5), (2**80, 7)),
+        _points((0, 0), (1, 0), (-(2**70), {"num": 22, "den": 7})),
+    ],
+}
+
+
+def test_roundtrip():
+    assert binary_to_json(json_to_binary(INSTANCE)) == INSTANCE
+    assert binary_to_json(json_to_binary(SOLUTION)) == SOLUTION
+    encoded = json_to_binary(SOLUTION)
+    assert len(encoded) < len(json.dumps(SOLUTION))
+    assert read_polygon(encoded, 1) == SOLUTION["polygons"][1]
+    # other representations are converted to reduced fractions
+    data = dict(SOLUTION, polygons=[_points(("0.5", "4/2"), (1.25, {"num": 2}))])
+    assert binary_to_json(json_to_binary(data))["polygons"] == [
+        _points(({"num": 1, "den": 2}, 2), ({"num": 5, "den": 4}, 2))
+    ]
+    with pytest.raises(ValueError):
+        binary_to_json(b"not a binary file")
+
+
+def test_readers(tmp_path):
+    write_binary(INSTANCE, tmp_path / "square.instance.cgbin")
+    assert read_instance(str(tmp_path / "square.instance.cgbin")) == INSTANCE
+    with open(tmp_path / "solution.json", "w") as f:
+        json.dump(SOLUTION, f)
+    convert_file(str(tmp_path / "solution.json"), str(tmp_path / "solution.cgbin"))
+    assert read_solution(str(tmp_path / "solution.cgbin")) == read_solution(
+        str(tmp_path / "solution.json")
+    )
+    idb = InstanceDatabase(str(tmp_path))
+    assert idb["square"] == INSTANCE
+
+
+def test_zip(tmp_path):
+    path = tmp_path / "solutions.zip"
+    with zipfile.ZipFile(path, "w") as zip_file:
+        zip_file.writestr("solution.cgbin", json_to_binary(SOLUTION))
+        zip_file.writestr("square.instance.cgbin", json_to_binary(INSTANCE))
+    solutions = list(ZipSolutionIterator()(str(path)))
+    assert len(solutions) == 1
+    assert solutions[0]["polygons"] == SOLUTION["polygons"]
+    assert InstanceDatabase(str(path))["square"] == INSTANCE
+
+
+def test_long_varints_are_rejected():
+    huge = dict(SOLUTION, polygons=[_points((2**8000, 0), (0, 0), (1, 1))])
+    with pytest.raises(ValueError, match="too large"):
+        json_to_binary(huge)
+    # crafted files: a varint in the polygon data and the length of the name
+    encoded = json_to_binary(dict(SOLUTION, polygons=[_points((0, 0))]))
+    assert encoded.endswith(b"\x01\x00\x00")
+    crafted = encoded[:-2] + b"\x80" * 5000 + b"\x00\x00"
+    with pytest.raises(ValueError, match="too long"):
+        binary_to_json(crafted)
+    prefix = len(b"CGSHOPB\x01") + 2
+    crafted = encoded[:prefix] + b"\x80" * 5000 + encoded[prefix:]
+    with pytest.raises(ValueError, match="too long"):
+        binary_to_json(crafted)
+
+
+def test_decoding_without_native_core(monkeypatch):
+    encoded = json_to_binary(SOLUTION)
+    crafted = json_to_binary(dict(SOLUTION, polygons=[_points((0, 0))]))
+    crafted = crafted[:-2] + b"\x80" * 5000 + b"\x00\x00"
+    # the pure Python decoder is used if the native core cannot be imported
+    monkeypatch.setitem(sys.modules, "cgshop2023_pyutils.core", None)
+    assert binary_to_json(encoded) == SOLUTION
+    assert read_polygon(encoded, 1) == SOLUTION["polygons"][1]
+    with pytest.raises(ValueError, match="too long"):
+        binary_to_json(crafted)
@@ -0,0 +1,45 @@
+import json
+import os
+import subprocess
+import sys
+
+# Generous budget for a cold `import cgshop2023_pyutils`, which should only
+# load a few small modules of the standard library.
+IMPORT_TIME_BUDGET = 0.5  # seconds
+
+_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import cgshop2023_pyutils
+duration = time.perf_counter() - start
+heavy = ["networkx", "chardet", "cgshop2023_pyutils.core._cgshop2023_core"]
+print(json.dumps({"duration": duration, "loaded": [m for m in heavy if m in sys.modules]}))
+"""
+
+
+def _run(script):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_import_is_lazy():
+    result = _run(_SCRIPT)
+    assert result["loaded"] == []
+    assert result["duration"] < IMPORT_TIME_BUDGET
+
+
+def test_lazy_exports():
+    import cgshop2023_pyutils
+
+    assert "verify" in dir(cgshop2023_pyutils)
+    from cgshop2023_pyutils import InstanceDatabase, verify
+
+    assert callable(verify) and InstanceDatabase is not None
+    assert cgshop2023_pyutils.verify is verify
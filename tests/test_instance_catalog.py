@@ -0,0 +1,69 @@
+import json
+import os
+import zipfile
+
+import pytest
+
+from cgshop2023_pyutils import InstanceDatabase
+
+
+def _instance(name, size, holes=0):
+    coords = ((0, 0), (size, 0), (size, size), (0, size))
+    hole = [{"x": x, "y": y} for x, y in ((1, 1), (1, 2), ("3/2", 2))]
+    return {
+        "type": "CGSHOP2023_Instance",
+        "name": name,
+        "n": 4 + 3 * holes,
+        "outer_boundary": [{"x": x, "y": y} for x, y in coords],
+        "holes": [hole] * holes,
+    }
+
+
+INSTANCES = [_instance("a", 4), _instance("b", 10, holes=1), _instance("c", -3)]
+
+
+def test_catalog_of_folder(tmp_path):
+    for instance in INSTANCES:
+        with open(tmp_path / f"{instance['name']}.instance.json", "w") as f:
+            json.dump(instance, f)
+    idb = InstanceDatabase(str(tmp_path))
+    assert [e["name"] for e in idb.select()] == ["a", "c", "b"]
+    assert [e["name"] for e in idb.select(min_n=5)] == ["b"]
+    assert [e["name"] for e in idb.select(max_holes=0, min_magnitude=4)] == ["a"]
+    entry_mtime = os.stat(tmp_path / "a.instance.json").st_mtime_ns
+    entry = idb.catalog()["b"]
+    assert entry["path"] == "b.instance.json"
+    assert entry["holes"] == 1 and entry["outer_vertices"] == 4
+    assert entry["bbox"] == [0.0, 0.0, 10.0, 10.0]
+    assert idb.catalog()["c"]["magnitude"] == 3.0
+    assert os.path.exists(tmp_path / ".instance_catalog.json")
+
+    # the stored catalog is used without reading the instances
+    size = os.stat(tmp_path / "a.instance.json").st_size
+    (tmp_path / "a.instance.json").write_text("x" * size)  # same size and time
+    os.utime(tmp_path / "a.instance.json", ns=(0, entry_mtime))
+    assert len(InstanceDatabase(str(tmp_path)).select()) == 3
+
+    # and rebuilt if the instances change
+    os.remove(tmp_path / "a.instance.json")
+    with open(tmp_path / "d.instance.json", "w") as f:
+        json.dump(_instance("d", 2), f)
+    catalog = InstanceDatabase(str(tmp_path)).catalog()
+    assert "d" in catalog and "a" not in catalog
+
+
+def test_catalog_of_zip(tmp_path):
+    path = tmp_path / "instances.zip"
+    with zipfile.ZipFile(path, "w") as zip_file:
+        for instance in INSTANCES:
+            zip_file.writestr(
+                f"instances/{instance['name']}.instance.json", json.dumps(instance)
+            )
+    idb = InstanceDatabase(str(path))
+    selected = idb.select(min_n=4, max_n=4, max_outer_vertices=4)
+    assert [e["name"] for e in selected] == ["a", "c"]
+    assert selected[0]["path"] == "instances/a.instance.json"
+    assert len(selected[0]["sha256"]) == 64
+    assert os.path.exists(str(path) + ".catalog.json")
+    with pytest.raises(TypeError):
+        idb.select(min_area=3)
@@ -0,0 +1,31 @@
+import json
+
+from cgshop2023_pyutils import InstanceDatabase, VerificationCache
+
+
+def _write_instance(folder, name, outer_boundary):
+    instance = {
+        "type": "CGSHOP2023_Instance",
+        "name": name,
+        "n": len(outer_boundary),
+        "outer_boundary": [{"x": x, "y": y} for x, y in outer_boundary],
+        "holes": [],
+    }
+    with open(folder / f"{name}.instance.json", "w") as f:
+        json.dump(instance, f)
+
+
+def test_validate_all(tmp_path):
+    folder = tmp_path / "instances"
+    folder.mkdir()
+    _write_instance(folder, "square", ((0, 0), (1, 0), (1, 1), (0, 1)))
+    _write_instance(folder, "bowtie", ((0, 0), (1, 1), (1, 0), (0, 1)))
+    idb = InstanceDatabase(str(folder))
+    cache = VerificationCache(str(tmp_path / "cache.sqlite"))
+    results = {r["name"]: r for r in idb.validate_all(workers=2, cache=cache)}
+    assert results["square"]["valid"] and not results["square"]["diagnostics"]
+    assert not results["bowtie"]["valid"] and results["bowtie"]["diagnostics"]
+    assert not any(r["cached"] for r in results.values())
+    again = {r["name"]: r for r in idb.validate_all(workers=2, cache=cache)}
+    assert all(r["cached"] for r in again.values())
+    assert again["bowtie"]["diagnostics"] == results["bowtie"]["diagnostics"]
@@ -1,4 +1,6 @@
+import json
 import os
+import zipfile
 
 from cgshop2023_pyutils.zip import ZipSolutionIterator
 
@@ -11,3 +13,112 @@ def test_iterator():
     for solution in isi(path):
         assert "." not in solution["instance"]
         print(solution["instance"])
+
+
+def _write_solution_zip(path, solutions):
+    with zipfile.ZipFile(path, "w") as zip_file:
+        for file_name, solution in solutions.items():
+            zip_file.writestr(file_name, json.dumps(solution))
+
+
+def _solution(instance, num_polygons):
+    triangle = [{"x": 0, "y": 0}, {"x": 1, "y": 0}, {"x": 0, "y": 1}]
+    return {
+        "type": "CGSHOP2023_Solution",
+        "instance": instance,
+        "polygons": [triangle] * num_polygons,
+    }
+
+
+def test_best_first(tmp_path):
+    path = str(tmp_path / "solutions.zip")
+    _write_solution_zip(
+        path,
+        {
+            "a_5.json": _solution("a", 5),
+            "a_1.json": _solution("a", 1),
+            "a_3.json": _solution("a", 3),
+            "a_4.json": _solution("a", 4),
+            "b_1.json": _solution("b", 1),
+        },
+    )
+    verified = []
+
+    def verify(solution):
+        verified.append(solution["meta"]["zip_info"]["file_in_zip"])
+        return "" if len(solution["polygons"]) >= 3 else "too few polygons"
+
+    results = {
+        r["instance"]: r for r in ZipSolutionIterator().iterate_best_first(path, verify)
+    }
+    assert verified == ["a_1.json", "a_3.json", "b_1.json"]
+    assert len(results["a"]["solution"]["polygons"]) == 3
+    assert results["a"]["errors"] == {"a_1.json": "too few polygons"}
+    assert results["a"]["skipped"] == ["a_4.json", "a_5.json"]
+    assert results["b"]["solution"] is None
+
+
+def test_best_first_ignores_empty_polygons(tmp_path):
+    from cgshop2023_pyutils.io.binary import json_to_binary
+
+    padded = _solution("a", 2)
+    padded["polygons"] += [[]] * 5
+    path = str(tmp_path / "solutions.zip")
+    with zipfile.ZipFile(path, "w") as zip_file:
+        zip_file.writestr("padded.json", json.dumps(padded))
+        zip_file.writestr("worse.json", json.dumps(_solution("a", 4)))
+        zip_file.writestr("b_padded.cgbin", json_to_binary({**padded, "instance": "b"}))
+        zip_file.writestr("b_worse.json", json.dumps(_solution("b", 3)))
+    results = {
+        r["instance"]: r
+        for r in ZipSolutionIterator().iterate_best_first(path, lambda s: "")
+    }
+    assert len(results["a"]["solution"]["polygons"]) == 2
+    assert results["a"]["skipped"] == ["worse.json"]
+    assert len(results["b"]["solution"]["polygons"]) == 2
+    assert results["b"]["skipped"] == ["b_worse.json"]
+
+
+def test_best_first_index_does_not_parse_points(tmp_path, monkeypatch):
+    from cgshop2023_pyutils.zip import zip_processor
+
+    path = str(tmp_path / "solutions.zip")
+    solutions = {f"a_{i}.json": _solution("a", i) for i in range(1, 6)}
+    solutions["c.json"] = {**_solution("ignored", 2), "instance": "dir/c.instance"}
+    solutions["instance.json"] = {"type": "CGSHOP2023_Instance"}
+    _write_solution_zip(path, solutions)
+    parsed = []
+    parse_solution = zip_processor.parse_solution
+    monkeypatch.setattr(
+        zip_processor, "parse_solution", lambda s: parsed.append(s) or parse_solution(s)
+    )
+
+    def verify(solution):
+        if solution["instance"] == "c":
+            raise RuntimeError("broken")
+        return "" if len(solution["polygons"]) >= 2 else "too few polygons"
+
+    results = {
+        r["instance"]: r for r in ZipSolutionIterator().iterate_best_first(path, verify)
+    }
+    assert len(parsed) == 3  # a_1, a_2 and c
+    assert results["a"]["skipped"] == ["a_3.json", "a_4.json", "a_5.json"]
+    assert results["c"]["solution"] is None
+    assert "broken" in results["c"]["errors"]["c.json"]
+
+
+def test_json_summary():
+    from cgshop2023_pyutils.zip._solution_summary import json_summary
+
+    text = json.dumps({**_solution("a", 3), "meta": {"x": [[1], "]"]}})
+    assert json_summary(text) == {
+        "type": "CGSHOP2023_Solution",
+        "instance": "a",
+        "num_polygons": 3,
+        "meta": {"x": [[1], "]"]},
+    }
+    assert json_summary('{"polygons": [[], [{"x": 1}], [ ]]  }')["num_polygons"] == 1
+    assert json_summary('{"polygons": [[]') is None
+    assert json_summary('{"polygons": []} {"polygons": []}') is None
+    assert json_summary("[1, 2]") is None
+    assert json_summary('{"instance": "a"}') == {"instance": "a"}
@@ -1,8 +1,12 @@
+import pickle
+
 from cgshop2023_pyutils.core import (
     FieldNumber,
     Point,
     Polygon,
     PolygonWithHoles,
+    NativeInstance,
+    NativeSolution,
 )
 import pytest
 
@@ -81,3 +85,79 @@ def test_polygon_with_holes():
     polygon = Polygon(points)
     poly_with_holes = PolygonWithHoles(polygon, [])
     assert len(poly_with_holes.holes()) == 0
+
+
+def test_pickle():
+    numbers = [
+        FieldNumber(0),
+        FieldNumber(-7),
+        FieldNumber("123456789012345678901234567890") / FieldNumber(7),
+        FieldNumber("1/3") + FieldNumber(-2),
+    ]
+    for x in numbers:
+        assert pickle.loads(pickle.dumps(x)) == x
+        assert FieldNumber.from_bytes(x.to_bytes()) == x
+    points = [Point(x, y) for x, y in zip(numbers, numbers[1:] + numbers[:1])]
+    assert all(pickle.loads(pickle.dumps(p)) == p for p in points)
+    square = Polygon(
+        [
+            Point(FieldNumber(x), FieldNumber(y))
+            for x, y in ((0, 0), (1, 0), (1, 1), (0, 1))
+        ]
+    )
+    hole = Polygon(
+        [
+            Point(FieldNumber(x) / FieldNumber(4), FieldNumber(y) / FieldNumber(4))
+            for x, y in ((1, 1), (1, 3), (3, 3), (3, 1))
+        ]
+    )
+    copy = pickle.loads(pickle.dumps(square))
+    assert copy.boundary() == square.boundary()
+    instance = NativeInstance(PolygonWithHoles(square, [hole]))
+    copy = NativeInstance.from_bytes(memoryview(instance.to_bytes()))
+    assert copy.area() == FieldNumber(3) / FieldNumber(4)
+    assert len(copy.polygon().holes()) == 1
+    solution = pickle.loads(pickle.dumps(NativeSolution([square, square])))
+    assert len(solution.polygons()) == 2
+
+
+def test_memory_usage():
+    def square(size):
+        coords = ((0, 0), (size, 0), (size, size), (0, size))
+        return Polygon([Point(FieldNumber(x), FieldNumber(y)) for x, y in coords])
+
+    instance = NativeInstance(PolygonWithHoles(square(1), []))
+    instance.compact()
+    small = instance.memory_usage()
+    assert small > 0
+    large = NativeInstance(PolygonWithHoles(square(10**60), []))
+    lazy = large.memory_usage()
+    assert large.memory_usage() == lazy  # the estimate does not compact
+    large.compact()
+    assert large.memory_usage() > small and large.memory_usage() > lazy
+    solution = NativeSolution([square(1), square(1)])
+    solution.compact()
+    assert solution.memory_usage() > instance.memory_usage()
+
+
+def test_json_writer(tmp_path):
+    import json
+
+    from cgshop2023_pyutils.io import read_solution
+    from cgshop2023_pyutils.verifier.verification_cache import _canonical_number
+
+    coords = ((0, 0), ("1/3", 0), (1, "2/7"), ("123456789012345678901234567890", 1))
+    polygon = Polygon([Point(FieldNumber(x), FieldNumber(y)) for x, y in coords])
+    solution = NativeSolution([polygon])
+    data = json.loads(solution.to_json("my_instance"))
+    assert data["type"] == "CGSHOP2023_Solution"
+    assert data["instance"] == "my_instance"
+    assert data["polygons"][0][1]["x"] == {"num": 1, "den": 3}
+    assert data["polygons"][0][3]["x"] == "123456789012345678901234567890"
+    assert [
+        (_canonical_number(p["x"]), _canonical_number(p["y"]))
+        for p in data["polygons"][0]
+    ] == [(str(x), str(y)) for x, y in coords]
+    path = str(tmp_path / "solution.json")
+    solution.write_json(path, "my_instance")
+    assert read_solution(path)["polygons"] == data["polygons"]
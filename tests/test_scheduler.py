@@ -0,0 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from cgshop2023_pyutils.scheduler import (
+    CostModel,
+    VerificationScheduler,
+    extract_features,
+)
+
+
+def _square(size):
+    coords = ((0, 0), (size, 0), (size, size), (0, size))
+    return [{"x": x, "y": y} for x, y in coords]
+
+
+INSTANCE = {"outer_boundary": _square(4), "holes": []}
+
+
+def test_cost_model_learns_coefficients():
+    model = CostModel(refit_interval=1000)
+    for polygons in range(1, 50):
+        for vertices in (3, 10, 40):
+            features = [1.0, polygons, polygons * vertices, 0.0, 4.0, 0.0]
+            model.observe(features, 0.01 + 0.002 * polygons * vertices)
+    model.fit()
+    assert abs(model.predict([1.0, 10, 100, 0.0, 4.0, 0.0]) - 0.21) < 1e-3
+    restored = CostModel.from_dict(model.to_dict())
+    assert restored.coefficients == model.coefficients
+
+
+def test_scheduler_orders_by_predicted_runtime():
+    small = {"polygons": [_square(4)]}
+    large = {"polygons": [_square(1)] * 200}
+    assert extract_features(INSTANCE, large)[2] > extract_features(INSTANCE, small)[2]
+    scheduler = VerificationScheduler(
+        workers=1, executor=ThreadPoolExecutor(max_workers=1)
+    )
+    scheduler.submit(INSTANCE, large, tag="large")
+    scheduler.submit(INSTANCE, small, tag="small")
+    results = list(scheduler.run())
+    assert [r["tag"] for r in results] == ["small", "large"]
+    assert results[0]["error"] == ""
+    assert results[1]["error"] != ""
+    assert scheduler.cost_model.num_observations == 2
+
+
+def test_fair_share():
+    scheduler = VerificationScheduler(
+        workers=1,
+        policy="fair_share",
+        executor=ThreadPoolExecutor(max_workers=1),
+    )
+    for i in range(3):
+        scheduler.submit(INSTANCE, {"polygons": [_square(4)]}, team="a", tag=i)
+    scheduler.submit(INSTANCE, {"polygons": [_square(4)] * 20}, team="b", tag=3)
+    tags = [r["tag"] for r in scheduler.run()]
+    # team b gets its turn before team a has used up its share.
+    assert tags.index(3) < 3
+
+
+def test_pending_jobs_are_rescored_after_refit():
+    # The default model predicts the many polygons to be slow; after the refit,
+    # the polygon count costs nothing and the large instance dominates.
+    model = CostModel(refit_interval=1)
+    scheduler = VerificationScheduler(
+        workers=1, cost_model=model, executor=ThreadPoolExecutor(max_workers=1)
+    )
+    large_instance = {"outer_boundary": _square(4) * 100, "holes": []}
+    scheduler.submit(INSTANCE, {"polygons": [_square(4)]}, tag="first")
+    scheduler.submit(INSTANCE, {"polygons": [_square(4)] * 50}, tag="polygons")
+    scheduler.submit(large_instance, {"polygons": [_square(4)]}, tag="instance")
+    model._prior = [0.0, 0.0, 0.0, 0.0, 1.0, 0.0]  # refit towards instance size
+    model._regularization = 1e6
+    results = scheduler.run()
+    first = next(results)
+    assert first["tag"] == "first" and model.num_fits == 1
+    rest = list(results)
+    assert [r["tag"] for r in rest] == ["polygons", "instance"]
+    assert rest[1]["predicted"] > rest[0]["predicted"]
+
+
+def test_features_of_prepared_and_stored_instances(tmp_path):
+    from cgshop2023_pyutils.instance_database import SharedInstanceStore
+    from cgshop2023_pyutils.verifier import PreparedInstance
+
+    instance = {
+        "name": "with_hole",
+        "outer_boundary": _square(10),
+        "holes": [list(reversed(_square(1)))],
+    }
+    solution = {"polygons": [_square(4)]}
+    expected = extract_features(instance, solution)
+    assert expected[4:] == [8.0, 1.0]
+    assert extract_features(PreparedInstance(instance), solution) == expected
+    with SharedInstanceStore.create([instance], str(tmp_path / "store")) as store:
+        assert store.instance_size("with_hole") == (8, 1)
+        assert store["with_hole"].instance_size() == (8, 1)
+        scheduler = VerificationScheduler(workers=1, instance_store=store)
+        job = scheduler.submit("with_hole", solution)
+        assert scheduler._queues[None][0][2]["features"] == expected
+        assert job == 0
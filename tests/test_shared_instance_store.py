@@ -0,0 +1,63 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from cgshop2023_pyutils import InstanceDatabase, verify
+from cgshop2023_pyutils.instance_database import SharedInstanceStore
+
+
+def _write_square(folder, name, size):
+    coords = ((0, 0), (size, 0), (size, size), (0, size))
+    instance = {
+        "type": "CGSHOP2023_Instance",
+        "name": name,
+        "n": 4,
+        "outer_boundary": [{"x": x, "y": y} for x, y in coords],
+        "holes": [],
+    }
+    with open(folder / f"{name}.instance.json", "w") as f:
+        json.dump(instance, f)
+    return instance
+
+
+def _verify_in_worker(path, name, solution):
+    store = SharedInstanceStore.attach(path)
+    try:
+        return verify(store[name], solution)
+    finally:
+        store.close()
+
+
+def test_shared_instance_store(tmp_path):
+    for i in range(1, 4):
+        _write_square(tmp_path, f"square_{i}", i)
+    idb = InstanceDatabase(str(tmp_path))
+    with idb.publish_shared(str(tmp_path / "store.bin")) as store:
+        assert len(store) == 3 and "square_2" in store
+        assert store["square_3"].area() == 9
+        solution = {"polygons": [idb["square_2"]["outer_boundary"]]}
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = executor.map(
+                _verify_in_worker,
+                [store.path] * 3,
+                ["square_1", "square_2", "square_3"],
+                [solution] * 3,
+            )
+            assert [msg == "" for msg in results] == [False, True, False]
+    assert not (tmp_path / "store.bin").exists()
+
+
+def test_shared_instance_store_cache_is_bounded(tmp_path):
+    for i in range(1, 6):
+        _write_square(tmp_path, f"square_{i}", i)
+    idb = InstanceDatabase(str(tmp_path))
+    with idb.publish_shared(str(tmp_path / "store.bin"), max_cached=2) as store:
+        for name in store:
+            assert store[name].area() > 0
+            assert len(store._instances) <= 2
+        store["square_4"]  # most recently used is kept
+        store["square_1"]
+        assert list(store._instances) == ["square_4", "square_1"]
+        assert store["square_4"] is store["square_4"]
+        with SharedInstanceStore.attach(store.path, max_cached=0) as attached:
+            assert attached["square_3"].area() == 9
+            assert len(attached._instances) == 0
@@ -0,0 +1,61 @@
+import io
+import json
+
+from cgshop2023_pyutils import tracing
+from cgshop2023_pyutils.verifier import VerificationCache
+
+
+def test_disabled_tracing_does_nothing():
+    assert not tracing.enabled()
+    with tracing.span("test") as s:
+        s.set(size=1)
+    tracing.count("test")
+
+
+def test_spans_and_counters():
+    tracer = tracing.Tracer()
+    with tracing.use(tracer):
+        assert tracing.enabled()
+        with tracing.span("stage", file="a.json") as s:
+            s.set(size=3)
+        try:
+            with tracing.span("stage"):
+                raise ValueError()
+        except ValueError:
+            pass
+        tracing.count("vertices", 10)
+        tracing.count("vertices", 5)
+    assert not tracing.enabled()
+    summary = tracer.summary()
+    assert summary["spans"]["stage"]["count"] == 2
+    assert summary["spans"]["stage"]["errors"] == 1
+    assert summary["counters"]["vertices"] == 15
+    assert tracer.spans[0]["attributes"] == {"file": "a.json", "size": 3}
+    assert tracer.spans[1]["attributes"]["error"] == "ValueError"
+
+
+def test_cache_hit_rate():
+    tracer = tracing.Tracer()
+    with tracing.use(tracer), VerificationCache() as cache:
+        cache.put("a", "")
+        cache.get("a")
+        cache.get("b")
+        cache.get("a")
+    assert abs(tracer.summary()["cache_hit_rate"] - 2 / 3) < 1e-9
+
+
+def test_export():
+    tracer = tracing.Tracer()
+    with tracing.use(tracer):
+        with tracing.span("verify.native"):
+            pass
+        tracing.count("cache.hits")
+    file = io.StringIO()
+    tracer.write_json_lines(file)
+    lines = [json.loads(line) for line in file.getvalue().splitlines()]
+    assert lines[0]["type"] == "span" and lines[0]["name"] == "verify.native"
+    assert lines[-1]["type"] == "summary"
+    text = tracer.prometheus_text()
+    assert 'cgshop2023_span_seconds_count{span="verify.native"} 1' in text
+    assert "cgshop2023_cache_hits_total 1" in text
+    assert "cgshop2023_cache_hit_ratio 1.0" in text
@@ -12,7 +12,7 @@ from cgshop2023_pyutils.core import (
 from cgshop2023_pyutils.io.read import read_solution
 from cgshop2023_pyutils.verifier import verify as verify_
 from cgshop2023_pyutils import InstanceDatabase
-from cgshop2023_pyutils import verify as pyverify
+from cgshop2023_pyutils import verify as pyverify, PreparedInstance
 
 
 def test_verify():
@@ -190,3 +190,127 @@ def test_bad_example():
     msg = pyverify(instance, solution)
     assert msg != ""
     print(msg)
+
+
+def test_prepared_instance():
+    instance = {
+        "outer_boundary": [
+            {"x": 0, "y": 0},
+            {"x": 2, "y": 0},
+            {"x": 2, "y": 2},
+            {"x": 0, "y": 2},
+        ],
+        "holes": [],
+    }
+    prepared = PreparedInstance(instance)
+    assert prepared.area() == 4
+    assert prepared.bbox() == (0, 0, 2, 2)
+    valid = {"polygons": [instance["outer_boundary"]]}
+    invalid = {"polygons": [instance["outer_boundary"][:3]]}
+    for _ in range(3):
+        assert pyverify(prepared, valid) == ""
+        assert pyverify(prepared, invalid) != ""
+
+
+def test_compact_prepared_instance_in_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    square = [{"x": x, "y": y} for x, y in ((0, 0), (2, 0), (2, 2), (0, 2))]
+    prepared = PreparedInstance({"outer_boundary": square, "holes": []})
+    # every verification compacts the shared instance, which happens only once
+    solutions = [{"polygons": [square]}, {"polygons": [square[:3]]}] * 8
+    with ThreadPoolExecutor(4) as executor:
+        messages = list(
+            executor.map(lambda s: pyverify(prepared, s, compact=True), solutions)
+        )
+    assert [msg == "" for msg in messages] == [True, False] * 8
+
+
+def test_connectivity_prefilter():
+    instance = {
+        "outer_boundary": [
+            {"x": x, "y": y} for x, y in ((0, 0), (3, 0), (3, 1), (0, 1))
+        ],
+        "holes": [],
+    }
+
+    def square(x0):
+        coords = [(x0, 0), (x0 + 1, 0), (x0 + 1, 1), (x0, 1)]
+        return [{"x": x, "y": y} for x, y in coords]
+
+    disconnected = {"polygons": [square(0), square(2)]}
+    assert verify_(instance, disconnected) == "polygons have disconnected union"
+    # touching along edges
+    connected = {"polygons": [square(0), square(1), square(2)]}
+    assert verify_(instance, connected) == ""
+
+
+def test_reduce():
+    instance = {
+        "outer_boundary": [
+            {"x": x, "y": y} for x, y in ((0, 0), (2, 0), (2, 1), (0, 1))
+        ],
+        "holes": [],
+    }
+    left = [{"x": x, "y": y} for x, y in ((0, 0), (1, 0), (1, 1), (0, 1))]
+    right = [{"x": x, "y": y} for x, y in ((1, 0), (2, 0), (2, 1), (1, 1))]
+    inner = [
+        {"x": x, "y": y} for x, y in (("1/4", "1/4"), ("3/4", "1/4"), ("1/2", "3/4"))
+    ]
+    polygons = [left, right, left[2:] + left[:2], inner, right]
+    solution = {"polygons": polygons}
+    statistics = {}
+    assert pyverify(instance, solution, reduce=True, statistics=statistics) == ""
+    # the duplicates of left and right and the contained triangle.
+    assert statistics == {"cached": False, "removed_polygons": 3}
+    assert pyverify(instance, solution) == ""
+    assert verify_(instance, {"polygons": [left, inner]}, reduce=True) != ""
+
+
+def test_point_interner():
+    from cgshop2023_pyutils.verifier import PointInterner
+
+    interner = PointInterner()
+    first = interner({"x": 1, "y": {"num": 1, "den": 2}})
+    assert interner({"x": 1, "y": {"num": 1, "den": 2}}) is first
+    assert interner({"x": "1", "y": {"num": 1, "den": 2}}) is not first
+    assert interner.occurrences == 3 and interner.distinct == 2
+    assert interner.dedup_ratio == 1.5
+
+
+def test_coverage_defects():
+    from cgshop2023_pyutils.verifier import coverage_defects
+
+    def rect(x0, y0, x1, y1):
+        coords = ((x0, y0), (x1, y0), (x1, y1), (x0, y1))
+        return [{"x": x, "y": y} for x, y in coords]
+
+    instance = {"outer_boundary": rect(0, 0, 4, 1), "holes": []}
+    # gaps [1, 2] and [3, 4], and area 1 outside of the instance.
+    solution = {"polygons": [rect(0, 0, 1, 1), rect(2, 0, 3, 2)]}
+    defects = coverage_defects(instance, solution)
+    assert len(defects["uncovered"]) == 2
+    assert float(defects["uncovered_area"]) == 2
+    assert [float(region.area()) for region in defects["uncovered"]] == [1, 1]
+    assert len(defects["excess"]) == 1 and float(defects["excess_area"]) == 1
+    valid = coverage_defects(instance, {"polygons": [rect(0, 0, 4, 1)]})
+    assert not valid["uncovered"] and not valid["excess"]
+    # both functions share the union of a native solution
+    from cgshop2023_pyutils.verifier import (
+        excess_regions,
+        to_native_solution,
+        uncovered_regions,
+    )
+
+    native = to_native_solution(solution)
+    assert len(uncovered_regions(instance, native)) == 2
+    assert float(excess_regions(instance, native)[0].area()) == 1
+    # threads share a native solution whose union has not been computed yet
+    from concurrent.futures import ThreadPoolExecutor
+
+    native = to_native_solution(solution)
+    with ThreadPoolExecutor(4) as executor:
+        results = list(
+            executor.map(lambda _: coverage_defects(instance, native), range(8))
+        )
+    assert [len(r["uncovered"]) for r in results] == [2] * 8
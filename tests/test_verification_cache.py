@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from cgshop2023_pyutils import VerificationCache, verify
+from cgshop2023_pyutils.verifier import verification_cache
+from cgshop2023_pyutils.verifier.verification_cache import instance_key, solution_key
+
+
+def _square(*coords):
+    return [{"x": x, "y": y} for x, y in coords]
+
+
+INSTANCE = {
+    "outer_boundary": _square((0, 0), (1, 0), (1, 1), (0, 1)),
+    "holes": [],
+}
+
+
+def test_key_is_independent_of_number_encoding():
+    other = {
+        "outer_boundary": _square(
+            (0, {"num": 0}), ("1/1", 0), ("1.0", {"num": 2, "den": "2"}), (0, 1)
+        ),
+        "holes": [],
+    }
+    assert instance_key(INSTANCE) == instance_key(other)
+    solution = {"polygons": [INSTANCE["outer_boundary"]]}
+    assert solution_key(INSTANCE, solution) == solution_key(other, solution)
+    reordered = {"polygons": [INSTANCE["outer_boundary"][::-1]]}
+    assert solution_key(INSTANCE, solution) != solution_key(INSTANCE, reordered)
+
+
+def test_eviction():
+    cache = VerificationCache(max_entries=3)
+    for i in range(5):
+        cache.put(str(i), f"message {i}")
+    assert len(cache) == 3
+    assert cache.get("0") is None
+    assert cache.get("4") == "message 4"
+
+
+def test_verify_with_cache(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    solution = {"polygons": [_square((0, 0), (1, 0), (1, 1))]}
+    with VerificationCache(path) as cache:
+        msg = verify(INSTANCE, solution, cache=cache)
+        assert msg != ""
+        assert verify(INSTANCE, solution, cache=cache) == msg
+        assert cache.hits == 1
+    with VerificationCache(path) as cache:
+        assert verify(INSTANCE, solution, cache=cache) == msg
+        assert cache.hits == 1 and cache.misses == 0
+
+
+def test_options_are_part_of_the_key():
+    solution = {"polygons": [INSTANCE["outer_boundary"]]}
+    assert solution_key(INSTANCE, solution, {"reduce": True}) != solution_key(
+        INSTANCE, solution, {"reduce": False}
+    )
+    with VerificationCache() as cache:
+        verify(INSTANCE, solution, cache=cache)
+        verify(INSTANCE, solution, cache=cache, reduce=True)
+        assert cache.misses == 2 and len(cache) == 2
+        statistics = {}
+        verify(INSTANCE, solution, cache=cache, reduce=True, statistics=statistics)
+        assert statistics == {"cached": True}  # nothing was removed this time
+
+
+def test_cache_is_shared_by_threads():
+    solution = {"polygons": [INSTANCE["outer_boundary"]]}
+    with VerificationCache() as cache, ThreadPoolExecutor(4) as executor:
+        results = list(
+            executor.map(lambda _: verify(INSTANCE, solution, cache=cache), range(8))
+        )
+        assert results == [""] * 8 and cache.hits + cache.misses == 8
+
+
+def test_cache_hits_do_not_recompute_the_instance_key(monkeypatch):
+    keyed = []
+
+    def counting_instance_key(instance):
+        keyed.append(instance)
+        return instance_key(instance)
+
+    monkeypatch.setattr(verification_cache, "instance_key", counting_instance_key)
+    solution = {"polygons": [INSTANCE["outer_boundary"]]}
+    with VerificationCache() as cache:
+        for _ in range(3):
+            assert verify(INSTANCE, solution, cache=cache) == ""
+        assert cache.hits == 2 and len(keyed) == 1
+        # an equal instance is another object, its key is computed once
+        copy = dict(INSTANCE)
+        verify(copy, solution, cache=cache)
+        verify(copy, solution, cache=cache)
+        assert cache.hits == 4 and keyed == [INSTANCE, copy]
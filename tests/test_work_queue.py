@@ -0,0 +1,124 @@
+import json
+import subprocess
+import sys
+import time
+import zipfile
+
+from cgshop2023_pyutils.work_queue import Coordinator, WorkQueue, Worker
+
+
+def _square(size):
+    coords = ((0, 0), (size, 0), (size, size), (0, size))
+    return [{"x": x, "y": y} for x, y in coords]
+
+
+def _write_instances(folder):
+    folder.mkdir()
+    for size in (1, 2):
+        instance = {
+            "type": "CGSHOP2023_Instance",
+            "name": f"square_{size}",
+            "n": 4,
+            "outer_boundary": _square(size),
+            "holes": [],
+        }
+        with open(folder / f"square_{size}.instance.json", "w") as f:
+            json.dump(instance, f)
+
+
+def _write_zip(path, polygon_sizes):
+    with zipfile.ZipFile(path, "w") as zip_file:
+        for i, (instance_size, size) in enumerate(polygon_sizes):
+            solution = {
+                "type": "CGSHOP2023_Solution",
+                "instance": f"square_{instance_size}",
+                "polygons": [_square(size)],
+            }
+            zip_file.writestr(f"solution_{i}.json", json.dumps(solution))
+
+
+def test_local_workers(tmp_path):
+    _write_instances(tmp_path / "instances")
+    _write_zip(tmp_path / "a.zip", [(1, 1), (2, 2), (2, 1)] * 4)
+    _write_zip(tmp_path / "b.zip", [(1, 1)])
+    (tmp_path / "broken.zip").write_bytes(b"not a zip")
+    with Coordinator(str(tmp_path / "queue"), batch_size=5) as coordinator:
+        a = coordinator.submit(str(tmp_path / "a.zip"))
+        b = coordinator.submit(str(tmp_path / "b.zip"), name="team_b")
+        broken = coordinator.submit(str(tmp_path / "broken.zip"))
+        workers = [
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "cgshop2023_pyutils.work_queue",
+                    "worker",
+                    str(tmp_path / "queue"),
+                    str(tmp_path / "instances"),
+                ]
+            )
+            for _ in range(3)
+        ]
+        for worker in workers:
+            assert worker.wait(timeout=60) == 0
+        results = coordinator.wait(a, timeout=1)
+        assert results["jobs"] == 12 and results["open"] == 0
+        assert results["valid"] == 8 and results["invalid"] == 4
+        assert {r["file_name"] for r in results["results"]} == {
+            f"solution_{i}.json" for i in range(12)
+        }
+        assert coordinator.results(b)["name"] == "team_b"
+        assert coordinator.results(b)["valid"] == 1
+        assert coordinator.results(broken)["error"]
+        assert coordinator.results(broken)["state"] == "done"
+        assert len(coordinator.queue.workers()) == 3
+
+
+def test_expired_leases_are_retried(tmp_path):
+    _write_instances(tmp_path / "instances")
+    _write_zip(tmp_path / "a.zip", [(1, 1), (2, 2)])
+    queue_folder = str(tmp_path / "queue")
+    with Coordinator(queue_folder) as coordinator:
+        submission = coordinator.submit(str(tmp_path / "a.zip"))
+    with WorkQueue(queue_folder, lease_seconds=0.01, max_attempts=2) as queue:
+        # a crashed worker that never sends a heartbeat.
+        queue.register_worker("crashed")
+        first = queue.claim("crashed")
+        time.sleep(0.05)
+        second = queue.claim("slow")
+        assert first["id"] == second["id"] and second["attempt"] == 2
+        assert not queue.heartbeat(first["id"], "crashed")
+        assert not queue.complete(first["id"], "crashed", "", 0.0)
+        assert [w["jobs_done"] for w in queue.workers()] == [0]
+        time.sleep(0.05)
+        queue.claim("other")  # no attempts left for the first job
+        results = queue.submission_results(submission)
+        assert [r["state"] for r in results["results"]] == ["failed", "leased"]
+    with Worker(queue_folder, str(tmp_path / "instances"), lease_seconds=60) as worker:
+        assert worker.run() == 1
+    results = WorkQueue(queue_folder).submission_results(submission)
+    assert results["failed"] == 1 and results["valid"] == 1
+
+
+def test_submission_is_not_done_before_all_jobs_are_added(tmp_path):
+    solution = {"instance": "square_1", "polygons": [_square(1)]}
+    with WorkQueue(str(tmp_path / "queue")) as queue:
+        submission = queue.add_submission("a.zip", "a.zip")
+        assert queue.submission_results(submission)["state"] == "adding"
+        assert not queue.is_idle()  # workers keep waiting for the jobs
+        queue.add_jobs(submission, [solution])
+        job = queue.claim("worker")
+        assert queue.complete(job["id"], "worker", "", 0.1)
+        assert queue.submission_results(submission)["state"] == "adding"
+        queue.add_jobs(submission, [solution, solution])
+        queue.finish_submission(submission)
+        assert queue.submission_results(submission)["state"] == "running"
+        # the zip turns out to be broken: the open jobs are cancelled
+        leased = queue.claim("worker")
+        queue.fail_submission(submission, "Broken zip.")
+        assert not queue.heartbeat(leased["id"], "worker")
+        assert not queue.complete(leased["id"], "worker", "", 0.1)
+        results = queue.submission_results(submission)
+        assert results["state"] == "done" and results["error"] == "Broken zip."
+        assert results["valid"] == 1 and results["cancelled"] == 2
+        assert queue.is_idle() and queue.claim("worker") is None